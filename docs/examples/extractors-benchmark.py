@@ -1,38 +1,301 @@
-from moviebox_api.extractor import JsonDetailsExtractor, TagDetailsExtractor
+"""Offline benchmark suite for the item-page extractors.
 
+Measures every stage of turning a bundled item page into modelled details:
 
-def read_content(name: str = "avatar.page") -> str:
-    with open(f"assets/data/{name}") as fh:
+- `html_parse` : Souping the whole page.
+- `json_decode` : Decoding the embedded json-formatted script text.
+- `json_extract` : `JsonDetailsExtractor.extract` (locate + decode + resolve).
+- `json_extract_bytes` : Same as `json_extract` but straight from the raw page bytes.
+- `model_validation` : Validating extracted details into `ItemJsonDetailsModel`.
+- `model_validation_trusted` : Same as `model_validation` but in trusted mode (urls not validated).
+- `json_model` : End-to-end `JsonDetailsExtractorModel` construction.
+- `json_model_bytes` : Same as `json_model` but straight from the raw page bytes.
+- `tag_extract` : `TagDetailsExtractor.extract_all` for comparison.
+- `search_item` / `search_item_trusted` : Building a single `SearchResultsItem` from the page subject.
+- `downloads` / `downloads_trusted` : Building `DownloadableFilesMetadata` with 4 media files & 30 captions.
+
+Results (percentiles & peak memory) are saved under the installed package version
+in `assets/data/extractors_benchmark.json` and compared against a stored baseline.
+
+Usage:
+    $ python docs/examples/extractors-benchmark.py --rounds 50
+    $ python docs/examples/extractors-benchmark.py --baseline 0.3.4 --fail-on-regression
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from moviebox_api import __version__
+from moviebox_api.extractor import (
+    JsonDetailsExtractor,
+    JsonDetailsExtractorModel,
+    TagDetailsExtractor,
+)
+from moviebox_api.extractor.helpers import souper
+from moviebox_api.extractor.models.json import ItemJsonDetailsModel
+from moviebox_api.models import DownloadableFilesMetadata, SearchResultsItem, build_model
+
+project_dir = Path(__file__).parent.parent.parent
+
+data_dir = project_dir / "assets/data"
+
+PAGES = ("avatar.page", "shannara-chronicles.page")
+
+DEFAULT_RESULTS_PATH = data_dir / "extractors_benchmark.json"
+
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+"""Relative slow-down (or memory growth) beyond which a stage is flagged"""
+
+
+def read_content(name: str) -> str:
+    with open(data_dir / name, encoding="utf-8") as fh:
         return fh.read()
 
 
-content = read_content("avatar.page")
+def make_search_item(subject: dict) -> dict:
+    """Shapes page subject like an item of search results response"""
+    return subject | {
+        "genre": ",".join(subject["genre"]) if isinstance(subject["genre"], list) else subject["genre"],
+        "subtitles": subject.get("subtitles") or "English,French",
+        "ops": json.dumps({"rid": "3fa85f64-5717-4562-b3fc-2c963f66afa6", "trace_id": "benchmark"}),
+        "hasResource": True,
+        "trailer": None,
+        "appointmentCnt": subject.get("appointmentCnt") or 0,
+        "appointmentDate": subject.get("appointmentDate") or "",
+        "corner": subject.get("corner") or "",
+    }
+
+
+def make_downloads(subject_id: str) -> dict:
+    """Downloadable files response with 4 media files and 30 captions"""
+    return {
+        "downloads": [
+            {
+                "id": f"{subject_id}{resolution}",
+                "url": f"https://bcdn.hakunaymatata.com/resource/{subject_id}-{resolution}.mp4?auth_key=0-0-0-x",
+                "resolution": resolution,
+                "size": resolution * 1_000_000,
+            }
+            for resolution in (360, 480, 720, 1080)
+        ],
+        "captions": [
+            {
+                "id": f"{subject_id}{index}",
+                "lan": f"l{index}",
+                "lanName": f"Language {index}",
+                "url": f"https://cacdn.hakunaymatata.com/subtitle/{subject_id}-{index}.srt?auth_key=0-0-0-x",
+                "size": 40_000,
+                "delay": 0,
+            }
+            for index in range(30)
+        ],
+        "limited": False,
+        "limitedCode": "",
+        "hasResource": True,
+    }
+
+
+def prepare_inputs(content: str) -> dict:
+    """Precomputes the inputs each stage starts from so that only that stage is timed"""
+    extracted = JsonDetailsExtractor.extract(content)
+    subject = extracted["resData"]["subject"]
+    return {
+        "content": content,
+        "content_bytes": content.encode("utf-8"),
+        "script": souper(content).find("script", {"type": "application/json"}).text,
+        "extracted": extracted,
+        "search_item": make_search_item(subject),
+        "downloads": make_downloads(subject["subjectId"]),
+    }
+
+
+STAGES = {
+    "html_parse": lambda inputs: souper(inputs["content"]),
+    "json_decode": lambda inputs: json.loads(inputs["script"]),
+    "json_extract": lambda inputs: JsonDetailsExtractor.extract(inputs["content"]),
+    "json_extract_bytes": lambda inputs: JsonDetailsExtractor.extract(inputs["content_bytes"]),
+    "model_validation": lambda inputs: ItemJsonDetailsModel(**inputs["extracted"]),
+    "model_validation_trusted": lambda inputs: build_model(ItemJsonDetailsModel, inputs["extracted"], True),
+    "json_model": lambda inputs: JsonDetailsExtractorModel(inputs["content"]),
+    "json_model_bytes": lambda inputs: JsonDetailsExtractorModel(inputs["content_bytes"]),
+    "tag_extract": lambda inputs: TagDetailsExtractor(inputs["content"]).extract_all(),
+    "search_item": lambda inputs: build_model(SearchResultsItem, inputs["search_item"]),
+    "search_item_trusted": lambda inputs: build_model(SearchResultsItem, inputs["search_item"], True),
+    "downloads": lambda inputs: build_model(DownloadableFilesMetadata, inputs["downloads"]),
+    "downloads_trusted": lambda inputs: build_model(DownloadableFilesMetadata, inputs["downloads"], True),
+}
+"""Stage name mapped to a callable accepting the prepared inputs"""
+
+
+def percentile(sorted_samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    index = max(0, min(len(sorted_samples) - 1, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def measure_stage(stage: callable, inputs: dict, rounds: int, warmup: int) -> dict:
+    """Times a stage `rounds` times and records its peak traced memory once
+
+    Returns:
+        dict: Timings in milliseconds and peak memory in kilobytes
+    """
+    for _ in range(warmup):
+        stage(inputs)
+
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            stage(inputs)
+            samples.append((time.perf_counter() - start) * 1_000)
+    finally:
+        gc.enable()
+
+    # Memory is measured separately since tracing slows the stage down
+    tracemalloc.start()
+    stage(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        "rounds": rounds,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "min_ms": round(samples[0], 4),
+        "p50_ms": round(percentile(samples, 0.50), 4),
+        "p90_ms": round(percentile(samples, 0.90), 4),
+        "p99_ms": round(percentile(samples, 0.99), 4),
+        "max_ms": round(samples[-1], 4),
+        "peak_memory_kb": round(peak / 1_024, 2),
+    }
+
+
+def run_suite(
+    pages: tuple[str] = PAGES, stages: tuple[str] = tuple(STAGES), rounds: int = 30, warmup: int = 3
+) -> dict[str, dict[str, dict]]:
+    """Benchmarks each stage against each page
+
+    Returns:
+        dict[str, dict[str, dict]]: Page name mapped to stage name and its measurements
+    """
+    results = {}
+    for page in pages:
+        inputs = prepare_inputs(read_content(page))
+        results[page] = {}
+        for stage_name in stages:
+            results[page][stage_name] = measure_stage(STAGES[stage_name], inputs, rounds, warmup)
+            print(
+                f"{page:<28} {stage_name:<26} "
+                f"p50={results[page][stage_name]['p50_ms']:>9.3f}ms "
+                f"p99={results[page][stage_name]['p99_ms']:>9.3f}ms "
+                f"peak={results[page][stage_name]['peak_memory_kb']:>10.1f}KB"
+            )
+    return results
+
+
+def load_results(path: Path) -> dict:
+    """Loads stored results keyed by version, ignoring files in the legacy format"""
+    if not path.exists():
+        return {}
+
+    with open(path) as fh:
+        stored = json.load(fh)
+
+    return {
+        version: details
+        for version, details in stored.items()
+        if isinstance(details, dict) and "results" in details
+    }
+
+
+def find_regressions(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Compares the median time and peak memory of each stage against the baseline
+
+    Returns:
+        list[str]: Human readable regression reports
+    """
+    regressions = []
+    for page, stages in current.items():
+        for stage_name, measurement in stages.items():
+            previous = baseline.get(page, {}).get(stage_name)
+            if previous is None:
+                continue
+
+            for key in ("p50_ms", "peak_memory_kb"):
+                if previous[key] and measurement[key] > previous[key] * (1 + threshold):
+                    change = (measurement[key] / previous[key] - 1) * 100
+                    regressions.append(
+                        f"{page} / {stage_name} : {key} {previous[key]} -> {measurement[key]} "
+                        f"(+{change:.1f}%)"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark item-page extractors offline")
+    parser.add_argument("-r", "--rounds", type=int, default=30, help="Timed runs per stage")
+    parser.add_argument("-w", "--warmup", type=int, default=3, help="Untimed runs per stage")
+    parser.add_argument("-s", "--stage", action="append", choices=list(STAGES), help="Stages to run")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_RESULTS_PATH, help="Results path")
+    parser.add_argument(
+        "-b", "--baseline", help="Version to compare against. Defaults to the latest other one"
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Relative change beyond which a stage is flagged",
+    )
+    parser.add_argument("-n", "--no-save", action="store_true", help="Do not store the results")
+    parser.add_argument(
+        "-f", "--fail-on-regression", action="store_true", help="Exit with non-zero status on regression"
+    )
+    args = parser.parse_args()
+
+    results = run_suite(stages=tuple(args.stage or STAGES), rounds=args.rounds, warmup=args.warmup)
+
+    stored = load_results(args.output)
+    baseline_version = args.baseline or next(
+        (version for version in reversed(list(stored)) if version != __version__), None
+    )
+    regressions = []
 
+    if baseline_version is not None:
+        if baseline_version not in stored:
+            sys.exit(f"No stored results for baseline version {baseline_version} - {args.output}")
 
-def tag_extractor():
-    extractor = TagDetailsExtractor(content)
-    extractor.extract_all()
+        regressions = find_regressions(results, stored[baseline_version]["results"], args.threshold)
+        print(f"\nCompared against version {baseline_version} : {len(regressions)} regression(s)")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
 
-    # print(extractor)
+    if not args.no_save:
+        stored.pop(__version__, None)  # Keep the latest run of a version last
+        stored[__version__] = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, "w") as fh:
+            json.dump(stored, fh, indent=4)
 
+        print(f"Results for version {__version__} saved to {args.output}")
 
-def json_extractor():
-    JsonDetailsExtractor.extract(content)
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    import json
-    from timeit import timeit
-
-    exec_details = {}
-    for execution_times in range(0, 100, 10):
-        details = {}
-        for extractor in [tag_extractor, json_extractor]:
-            exec_time = timeit(tag_extractor, number=execution_times)
-            extractor_name = extractor.__name__
-            details[extractor_name] = exec_time
-        exec_details[execution_times] = details
-        print(execution_times, details, sep=" : ")
-
-    with open("extractors_benchmark.json", "w") as fh:
-        json.dump(exec_details, fh, indent=4)
+    main()
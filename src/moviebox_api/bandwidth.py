@@ -0,0 +1,320 @@
+"""Process-wide bandwidth shaping.
+
+Every downloaded chunk - of media files, captions, through part files or merge-free -
+takes tokens from one token bucket before it is handed over, so that all downloads of the
+process stay under a common rate. Bytes go out by priority first, then in proportion to
+the weights of the competing shares (start-time fair queueing). The rate may follow a
+time-of-day schedule and can be changed at any moment, taking effect on running downloads.
+"""
+
+import asyncio
+import heapq
+import itertools
+import re
+import time
+import typing as t
+from dataclasses import dataclass, field
+from datetime import datetime, time as day_time
+
+import httpx
+
+__all__ = [
+    "BandwidthGovernor",
+    "BandwidthShare",
+    "RateWindow",
+    "get_bandwidth_governor",
+    "governed_client_kwargs",
+    "parse_rate",
+]
+
+RATE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*$", re.IGNORECASE)
+
+RATE_UNITS = {"": 1, "k": 1_024, "m": 1_024**2, "g": 1_024**3}
+
+
+def parse_rate(rate: str) -> float:
+    """Bytes per second from a human readable rate e.g `500K`, `2M` or `1.5GB`"""
+    match = RATE_PATTERN.match(rate)
+    if match is None:
+        raise ValueError(f"Invalid rate {rate!r}. Use a number of bytes with optional K, M or G suffix")
+
+    value, unit = match.groups()
+    return float(value) * RATE_UNITS[unit.lower()]
+
+
+@dataclass(frozen=True)
+class RateWindow:
+    """Rate applying daily between two times of the day. Windows may span midnight."""
+
+    start: day_time
+    end: day_time
+    rate: float | None
+    """Bytes per second. None means unlimited and 0 pauses downloads."""
+
+    @classmethod
+    def parse(cls, window: str) -> "RateWindow":
+        """Window from text like `09:00-17:00=1M` or `22:00-06:00=unlimited`"""
+        try:
+            period, rate = window.split("=")
+            start, end = (day_time.fromisoformat(value.strip()) for value in period.split("-"))
+
+        except ValueError as e:
+            raise ValueError(f"Invalid rate window {window!r}. Use the format HH:MM-HH:MM=RATE") from e
+
+        return cls(start, end, None if rate.strip().lower() == "unlimited" else parse_rate(rate))
+
+    def contains(self, moment: day_time) -> bool:
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+
+@dataclass(eq=False)
+class BandwidthShare:
+    """Claim of a download job on the bandwidth.
+
+    - Shares of higher priority are served first as long as they are waiting.
+    - Shares of the same priority get bytes in proportion to their weights.
+    """
+
+    weight: float = 1.0
+    priority: int = 0
+    governor: "BandwidthGovernor | None" = None
+    """Defaults to the process-wide governor"""
+    consumed: int = 0
+    """Bytes taken so far"""
+    _finish_time: float = field(default=0.0, repr=False)
+    """Virtual time by which the last claimed bytes are served"""
+
+    def __post_init__(self):
+        assert self.weight > 0, f"Value for weight should be greater than 0 not {self.weight}"
+
+    async def acquire(self, size: int) -> None:
+        """Waits until size bytes may be downloaded"""
+        governor = get_bandwidth_governor() if self.governor is None else self.governor
+        await governor.acquire(size, self)
+
+
+class BandwidthGovernor:
+    """Token bucket over bytes shared by all downloads using it.
+
+    For instance:
+
+    ```python
+    governor = get_bandwidth_governor()
+    governor.rate = parse_rate("2M")
+    governor.schedule = [RateWindow.parse("09:00-17:00=500K")]
+    movie_downloader = MediaFileDownloader(bandwidth_share=BandwidthShare(weight=3))
+    caption_downloader = CaptionFileDownloader(bandwidth_share=BandwidthShare(priority=1))
+    ```
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        schedule: t.Iterable[RateWindow] = (),
+        burst: int | None = None,
+    ):
+        """Constructor for `BandwidthGovernor`
+
+        Args:
+            rate (float | None, optional): Bytes per second outside the schedule windows. Defaults to None (unlimited).
+            schedule (t.Iterable[RateWindow], optional): Rates for certain times of the day. The first matching window wins. Defaults to ().
+            burst (int | None, optional): Most bytes granted at once after being idle. Defaults to None (one second worth of rate).
+        """  # noqa: E501
+        self._rate = rate
+        self._schedule = list(schedule)
+        self.burst = burst
+        self._tokens = 0.0
+        self._refilled_at = time.monotonic()
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+        self._waiters: list[tuple[int, float, int, int, BandwidthShare, asyncio.Future]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} rate={self.current_rate()} "
+            f"windows={len(self._schedule)} waiting={len(self._waiters)}>"
+        )
+
+    @property
+    def rate(self) -> float | None:
+        """Bytes per second outside the schedule windows. Changes apply to running downloads."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, value: float | None) -> None:
+        assert value is None or value >= 0, f"Value for rate should be atleast 0 not {value}"
+        self._rate = value
+        self._notify()
+
+    @property
+    def schedule(self) -> list[RateWindow]:
+        return list(self._schedule)
+
+    @schedule.setter
+    def schedule(self, windows: t.Iterable[RateWindow]) -> None:
+        self._schedule = list(windows)
+        self._notify()
+
+    def current_rate(self, moment: datetime | None = None) -> float | None:
+        """Rate in effect at moment. Defaults to now."""
+        moment = (moment or datetime.now()).time()
+        for window in self._schedule:
+            if window.contains(moment):
+                return window.rate
+        return self._rate
+
+    def _notify(self) -> None:
+        if self._wakeup is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _capacity(self, rate: float) -> float:
+        return float(self.burst) if self.burst is not None else rate
+
+    def _refill(self, rate: float) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity(rate), self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+
+    def _grant(self, size: int, share: BandwidthShare) -> None:
+        self._tokens -= size
+        share.consumed += size
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Waiters of a previous event loop can never be served
+            self._loop = loop
+            self._waiters.clear()
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+
+    async def acquire(self, size: int, share: BandwidthShare) -> None:
+        """Waits until size bytes may be downloaded on behalf of share"""
+        rate = self.current_rate()
+        if rate is None and not self._waiters:
+            share.consumed += size
+            return
+
+        self._bind_loop()
+        if rate is not None:
+            self._refill(rate)
+            if not self._waiters and self._tokens >= min(size, self._capacity(rate)) and rate:
+                self._grant(size, share)
+                return
+
+        start_time = max(share._finish_time, self._virtual_time)
+        share._finish_time = start_time + size / share.weight
+        future = self._loop.create_future()
+        heapq.heappush(
+            self._waiters, (-share.priority, start_time, next(self._sequence), size, share, future)
+        )
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        await future
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            _, start_time, _, size, share, future = self._waiters[0]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+
+            rate = self.current_rate()
+            if rate is not None:
+                self._refill(rate)
+
+            if rate is None or (rate and self._tokens >= min(size, self._capacity(rate))):
+                heapq.heappop(self._waiters)
+                self._virtual_time = max(self._virtual_time, start_time)
+                self._grant(size, share)
+                future.set_result(None)
+                continue
+
+            # Rate 0 pauses until the rate or schedule changes
+            delay = (min(size, self._capacity(rate)) - self._tokens) / rate if rate else 1.0
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, 1.0))
+            except asyncio.TimeoutError:
+                pass
+
+
+_bandwidth_governor = BandwidthGovernor()
+
+
+def get_bandwidth_governor() -> BandwidthGovernor:
+    """Process-wide governor used by downloads unless their share names another one"""
+    return _bandwidth_governor
+
+
+class GovernedStream(httpx.AsyncByteStream):
+    """Response body yielding each chunk only once the bandwidth allows it"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, share: BandwidthShare):
+        self.stream = stream
+        self.share = share
+
+    async def __aiter__(self) -> t.AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            await self.share.acquire(len(chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+
+
+class GovernedTransport(httpx.AsyncBaseTransport):
+    """Transport whose response bodies are subject to a bandwidth share"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, share: BandwidthShare):
+        self.transport = transport
+        self.share = share
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        response.stream = GovernedStream(response.stream, self.share)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def governed_client_kwargs(httpx_kwargs: dict[str, t.Any], share: BandwidthShare) -> dict[str, t.Any]:
+    """Keyword arguments for `httpx.AsyncClient` whose response bodies are subject to the share.
+
+    A `transport` and `mounts` given are wrapped. Otherwise the client builds its transports
+    from the proxy, limits and other settings as usual and its responses are governed by an
+    event hook, so that nothing about how it connects changes.
+
+    Args:
+        httpx_kwargs (dict[str, t.Any]): Keyword arguments for `httpx.AsyncClient`.
+        share (BandwidthShare): Bandwidth share of the client.
+
+    Returns:
+        dict[str, t.Any]: httpx_kwargs with governed `transport` and `mounts` or response hook.
+    """
+    httpx_kwargs = dict(httpx_kwargs)
+
+    if httpx_kwargs.get("transport") is not None:
+        httpx_kwargs["transport"] = GovernedTransport(httpx_kwargs["transport"], share)
+        httpx_kwargs["mounts"] = {
+            pattern: None if mount is None else GovernedTransport(mount, share)
+            for pattern, mount in (httpx_kwargs.get("mounts") or {}).items()
+        }
+        return httpx_kwargs
+
+    async def govern_response(response: httpx.Response) -> None:
+        response.stream = GovernedStream(response.stream, share)
+
+    event_hooks = dict(httpx_kwargs.get("event_hooks") or {})
+    event_hooks["response"] = [*event_hooks.get("response", []), govern_response]
+    httpx_kwargs["event_hooks"] = event_hooks
+    return httpx_kwargs
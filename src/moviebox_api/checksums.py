@@ -0,0 +1,297 @@
+"""Checksums computed while downloading.
+
+Downloaded bytes are hashed as they are written, in fixed-size blocks, so that
+verifying a file does not take another full read of it. Ranges are written by
+several connections at once, hence each block is hashed by whichever connection
+writes it from start to end. The few blocks shared by two connections, or written
+by an earlier resumed download, are read back from disk once the download completes.
+
+Block digests are combined into the file digest - the digest of the concatenated
+block digests - and kept in a sidecar next to the file.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import typing as t
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from moviebox_api.constants import DEFAULT_CHECKSUM_ALGORITHM, DEFAULT_CHECKSUM_BLOCK_SIZE
+from moviebox_api.exceptions import DownloadIntegrityError
+from moviebox_api.helpers import write_file_atomically
+
+__all__ = [
+    "BlockHasher",
+    "FileChecksums",
+    "compute_checksums",
+    "file_block_reader",
+    "verify_checksums",
+]
+
+BlockReaderType: t.TypeAlias = t.Callable[[int, int], t.Awaitable[bytes]]
+"""Accepts offset and size and returns those bytes of the written file"""
+
+
+def combine_digests(algorithm: str, blocks: list[str]) -> str:
+    """Digest of the concatenated block digests"""
+    return hashlib.new(algorithm, b"".join(bytes.fromhex(block) for block in blocks)).hexdigest()
+
+
+@dataclass
+class FileChecksums:
+    """Sidecar file recording block digests of a downloaded file"""
+
+    path: Path
+    algorithm: str
+    block_size: int
+    size: int
+    blocks: list[str] = field(default_factory=list)
+    """Hex digest of each block in order"""
+
+    suffix: t.ClassVar[str] = ".checksums.json"
+
+    @property
+    def digest(self) -> str:
+        """Combined digest of the file"""
+        return combine_digests(self.algorithm, self.blocks)
+
+    @classmethod
+    def path_for(cls, saved_to: Path) -> Path:
+        """Checksums path of a downloaded file"""
+        return saved_to.with_name(saved_to.name + cls.suffix)
+
+    @classmethod
+    def load(cls, path: Path) -> "FileChecksums | None":
+        """Reads checksums from path. Returns None incase it's missing or unreadable."""
+        try:
+            with open(path) as fh:
+                details = json.load(fh)
+            return cls(
+                path=path,
+                algorithm=details["algorithm"],
+                block_size=details["block_size"],
+                size=details["size"],
+                blocks=details["blocks"],
+            )
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self) -> None:
+        write_file_atomically(
+            self.path,
+            json.dumps(
+                {
+                    "algorithm": self.algorithm,
+                    "block_size": self.block_size,
+                    "size": self.size,
+                    "digest": self.digest,
+                    "blocks": self.blocks,
+                },
+                indent=2,
+            ).encode(),
+        )
+
+    def remove(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
+@dataclass
+class _BlockStream:
+    """Hash of a block being written sequentially by one connection"""
+
+    index: int
+    hasher: t.Any
+    """None when the block was not written from its start by this connection"""
+
+
+class BlockHasher:
+    """Hashes bytes written in any order, block by block.
+
+    For instance:
+
+    ```python
+    block_hasher = BlockHasher(size, algorithm="sha256")
+    block_hasher.update(0, first_chunk)
+    ...
+    checksums = await block_hasher.checksums(FileChecksums.path_for(saved_to), file_block_reader(saved_to))
+    ```
+    """
+
+    def __init__(
+        self,
+        size: int,
+        algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+        block_size: int = DEFAULT_CHECKSUM_BLOCK_SIZE,
+    ):
+        """Constructor for `BlockHasher`
+
+        Args:
+            size (int): Total size of the file.
+            algorithm (str, optional): Hashlib algorithm e.g `md5`. Defaults to DEFAULT_CHECKSUM_ALGORITHM.
+            block_size (int, optional): Bytes covered by each block digest. Defaults to DEFAULT_CHECKSUM_BLOCK_SIZE.
+        """  # noqa: E501
+        if not hashlib.new(algorithm).digest_size:
+            raise ValueError(f"Hash algorithm {algorithm} has no fixed digest size")
+        assert block_size > 0, f"Value for block_size should be atleast 1 not {block_size}"
+        self.size = size
+        self.algorithm = algorithm
+        self.block_size = block_size
+        self.blocks: dict[int, str] = {}
+        """Digests of blocks hashed while being written"""
+        self._streams: dict[int, _BlockStream] = {}
+        """Blocks being hashed, keyed by offset of the next byte their connection writes"""
+
+    def __repr__(self) -> str:
+        return (
+            f'<{self.__module__}.{self.__class__.__name__} algorithm="{self.algorithm}" '
+            f"block_size={self.block_size} hashed_blocks={len(self.blocks)}/{self.blocks_count}>"
+        )
+
+    @property
+    def blocks_count(self) -> int:
+        return -(-self.size // self.block_size)
+
+    def update(self, offset: int, data: bytes) -> None:
+        """Hashes data written at offset"""
+        stream = self._streams.pop(offset, None)
+        position = 0
+
+        while position < len(data):
+            index, block_offset = divmod(offset + position, self.block_size)
+            if stream is None or stream.index != index:
+                # Only blocks written from their start can be hashed on the fly
+                stream = _BlockStream(index, hashlib.new(self.algorithm) if block_offset == 0 else None)
+
+            block_end = min((index + 1) * self.block_size, self.size)
+            piece = data[position : block_end - offset]
+            if stream.hasher is not None:
+                stream.hasher.update(piece)
+            position += len(piece)
+
+            if offset + position == block_end:
+                if stream.hasher is not None:
+                    self.blocks[index] = stream.hasher.hexdigest()
+                stream = None
+
+        if stream is not None:
+            self._streams[offset + position] = stream
+
+    async def checksums(self, path: Path, read_block: BlockReaderType | None = None) -> FileChecksums:
+        """Block digests of the written file.
+
+        Args:
+            path (Path): Sidecar path of the checksums.
+            read_block (BlockReaderType | None, optional): Reads back blocks that could not be hashed while being written. Defaults to None.
+
+        Raises:
+            ValueError: Some blocks need to be read back but read_block is None.
+
+        Returns:
+            FileChecksums: Checksums of the file. Not saved yet.
+        """  # noqa: E501
+        missing = [index for index in range(self.blocks_count) if index not in self.blocks]
+        if missing and read_block is None:
+            raise ValueError(
+                f"{len(missing)} blocks were not hashed while being written and can't be read back"
+            )
+
+        for index in missing:
+            offset = index * self.block_size
+            data = await read_block(offset, min(self.block_size, self.size - offset))
+            self.blocks[index] = hashlib.new(self.algorithm, data).hexdigest()
+
+        return FileChecksums(
+            path=path,
+            algorithm=self.algorithm,
+            block_size=self.block_size,
+            size=self.size,
+            blocks=[self.blocks[index] for index in range(self.blocks_count)],
+        )
+
+
+def file_block_reader(saved_to: Path) -> BlockReaderType:
+    """Reads blocks of a file in a thread"""
+
+    def read(offset: int, size: int) -> bytes:
+        with open(saved_to, "rb") as fh:
+            fh.seek(offset)
+            return fh.read(size)
+
+    async def read_block(offset: int, size: int) -> bytes:
+        return await asyncio.to_thread(read, offset, size)
+
+    return read_block
+
+
+def compute_checksums(
+    saved_to: Path | str,
+    algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+    block_size: int = DEFAULT_CHECKSUM_BLOCK_SIZE,
+) -> FileChecksums:
+    """Reads the whole file and computes its block digests.
+
+    Args:
+        saved_to (Path | str): Path of the file.
+        algorithm (str, optional): Hashlib algorithm. Defaults to DEFAULT_CHECKSUM_ALGORITHM.
+        block_size (int, optional): Bytes covered by each block digest. Defaults to DEFAULT_CHECKSUM_BLOCK_SIZE.
+
+    Returns:
+        FileChecksums: Checksums of the file. Not saved yet.
+    """  # noqa: E501
+    saved_to = Path(saved_to)
+    blocks = []
+    with open(saved_to, "rb") as fh:
+        while block := fh.read(block_size):
+            blocks.append(hashlib.new(algorithm, block).hexdigest())
+
+    return FileChecksums(
+        path=FileChecksums.path_for(saved_to),
+        algorithm=algorithm,
+        block_size=block_size,
+        size=os.path.getsize(saved_to),
+        blocks=blocks,
+    )
+
+
+def verify_checksums(saved_to: Path | str) -> FileChecksums:
+    """Checks the file against checksums in its sidecar.
+
+    Args:
+        saved_to (Path | str): Path of the downloaded file.
+
+    Raises:
+        FileNotFoundError: The file has no checksums sidecar.
+        DownloadIntegrityError: Size or any block digest differs.
+
+    Returns:
+        FileChecksums: Checksums of the file
+    """
+    saved_to = Path(saved_to)
+    expected = FileChecksums.load(FileChecksums.path_for(saved_to))
+    if expected is None:
+        raise FileNotFoundError(f'There are no checksums for the file "{saved_to}"')
+
+    actual = compute_checksums(saved_to, expected.algorithm, expected.block_size)
+    if actual.size != expected.size:
+        raise DownloadIntegrityError(
+            saved_to, f'Size of "{saved_to}" is {actual.size} bytes instead of {expected.size}'
+        )
+
+    mismatched = [
+        index
+        for index, (block, expected_block) in enumerate(zip(actual.blocks, expected.blocks))
+        if block != expected_block
+    ]
+    if mismatched:
+        raise DownloadIntegrityError(
+            saved_to,
+            f'{len(mismatched)} blocks of "{saved_to}" differ from their checksums starting at byte '
+            f"{mismatched[0] * expected.block_size}",
+        )
+
+    return expected
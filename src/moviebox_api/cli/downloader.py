@@ -1,14 +1,20 @@
 """Gets the work done - downloads media with flexible flow control"""
 
+import asyncio
 import logging
 import tempfile
+import typing as t
+import urllib.request
+from collections.abc import Hashable
 from pathlib import Path
 from typing import Literal
 
 import httpx
 from throttlebuster import DownloadedFile
 from throttlebuster.constants import DOWNLOAD_PART_EXTENSION
+from throttlebuster.helpers import get_filesize_string, sanitize_filename
 
+from moviebox_api.bandwidth import BandwidthShare
 from moviebox_api.cli.helpers import (
     get_caption_file_or_raise,
     media_player_name_func_map,
@@ -18,12 +24,16 @@ from moviebox_api.constants import (
     CURRENT_WORKING_DIR,
     DEFAULT_CAPTION_LANGUAGE,
     DEFAULT_CHUNK_SIZE,
+    DEFAULT_METADATA_CONCURRENCY,
+    DEFAULT_PROBE_CONCURRENCY,
     DEFAULT_TASKS,
     DOWNLOAD_QUALITIES,
+    DownloadMode,
     DownloadQualitiesType,
     SubjectType,
 )
 from moviebox_api.core import Session, TVSeriesDetails
+from moviebox_api.diskspace import get_disk_space_ledger
 from moviebox_api.download import (
     CaptionFileDownloader,
     DownloadableMovieFilesDetail,
@@ -32,11 +42,114 @@ from moviebox_api.download import (
     resolve_media_file_to_be_downloaded,
 )
 from moviebox_api.exceptions import ZeroCaptionFileError
-from moviebox_api.helpers import assert_instance, assert_membership, get_event_loop
-from moviebox_api.models import SearchResultsItem
+from moviebox_api.helpers import assert_instance, assert_membership, get_event_loop, run_alongside
+from moviebox_api.jobs import JobStatus, JobStore
+from moviebox_api.library import LibraryEntry, LibraryIndex
+from moviebox_api.models import (
+    CaptionFileMetadata,
+    DownloadableFilesMetadata,
+    MediaFileMetadata,
+    SearchResultsItem,
+    build_model,
+)
+from moviebox_api.planner import DownloadPlan, EpisodesDownloadPlanner
+from moviebox_api.probe import AvailabilityProber, ItemAvailability, ProbeTarget
+from moviebox_api.quality import QualityPolicy
+from moviebox_api.ranged import ChunkConsumerType, OrderedStreamSink, RangeManifest
+from moviebox_api.scheduler import EpisodesDownloadScheduler, EpisodesMetadataPrefetcher
 
 __all__ = ["Downloader"]
 
+FileDownloaderType = t.TypeVar("FileDownloaderType", MediaFileDownloader, CaptionFileDownloader)
+
+UNRECORDED_JOB_OPTIONS = (
+    "self",
+    "title",
+    "year",
+    "yes",
+    "season",
+    "episode",
+    "limit",
+    "auto_mode",
+    "episodes",
+    "quality",
+    "search_function",
+    "job_store",
+    "job_id",
+    "bandwidth_share",
+    "stream_to",
+    "plan",
+    "library",
+)
+"""Download arguments not kept in job options since they are set afresh when resuming"""
+
+
+def make_job_options(arguments: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Picks json serializable download arguments to be kept along with a job
+
+    Args:
+        arguments (dict[str, t.Any]): Download method arguments including `run_kwargs`.
+
+    Returns:
+        dict[str, t.Any]: Download options
+    """
+    arguments = {**arguments, **arguments.get("run_kwargs", {})}
+    job_options = {}
+
+    for name, value in arguments.items():
+        if name in UNRECORDED_JOB_OPTIONS or name == "run_kwargs" or callable(value):
+            continue
+
+        job_options[name] = str(value) if isinstance(value, Path) else value
+
+    return job_options
+
+
+def make_options_key(options: dict[str, t.Any]) -> tuple:
+    """Hashable key of options. Bandwidth shares and unhashable values are told apart by identity."""
+    return tuple(
+        (name, id(value) if name == "bandwidth_share" or not isinstance(value, Hashable) else value)
+        for name, value in sorted(options.items())
+    )
+
+
+async def close_transports(transports: list[httpx.AsyncBaseTransport]) -> None:
+    """Closes connection pools shared by file downloaders"""
+    for transport in transports:
+        await transport.aclose()
+
+
+CONNECTION_OPTIONS = ("proxy", "verify", "cert", "trust_env", "http1", "http2", "limits")
+"""Keyword arguments of `httpx.AsyncClient` for building its transport"""
+
+
+def has_environment_proxies() -> bool:
+    """Whether environment variables e.g HTTPS_PROXY set proxies for httpx clients to use"""
+    proxies = urllib.request.getproxies()
+    return any(proxies.get(scheme) for scheme in ("http", "https", "all"))
+
+
+def make_caption_run_kwargs(run_kwargs: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Leaves out `MediaFileDownloader.run` options that caption file downloads reject"""
+    return {
+        key: value
+        for key, value in run_kwargs.items()
+        if key not in CaptionFileDownloader.unsupported_run_options
+    }
+
+
+async def download_captions_alongside(
+    caption_download: t.Awaitable[list[DownloadedFile]],
+) -> list[DownloadedFile]:
+    """Awaits captions downloaded alongside a media file. Their failure is logged instead of
+    cancelling the media file download."""
+    try:
+        return await caption_download
+
+    except Exception as e:
+        logging.error(f"Failed to download captions - {e}")
+        return []
+
 
 class Downloader:
     """Controls the movie/series download process"""
@@ -49,6 +162,163 @@ class Downloader:
         """
         self._session = session if session else Session()
         assert_instance(self._session, Session, "session")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._transports: dict[tuple, httpx.AsyncHTTPTransport] = {}
+        """Connection pools shared by the file downloaders, keyed by their connection options"""
+        self._file_downloaders: dict[tuple, MediaFileDownloader | CaptionFileDownloader] = {}
+
+    async def __aenter__(self) -> "Downloader":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes connections of the file downloaders in the event loop they were opened in"""
+        loop, transports = self._loop, list(self._transports.values())
+        self._loop = None
+        self._transports.clear()
+        self._file_downloaders.clear()
+
+        if loop is None or loop is asyncio.get_running_loop():
+            await close_transports(transports)
+
+        elif loop.is_closed():
+            # Only the garbage collector can close sockets of a closed loop
+            logging.debug("Dropping connections of a closed event loop")
+
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(close_transports(transports), loop))
+
+        else:
+            await asyncio.to_thread(loop.run_until_complete, close_transports(transports))
+
+    async def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Connections opened in a previous event loop cannot be reused
+            await self.close()
+            self._loop = loop
+
+    async def _get_file_downloader(
+        self, downloader_class: type[FileDownloaderType], **options
+    ) -> FileDownloaderType:
+        """Downloader made with the options, reused by later downloads with the same ones.
+
+        Downloaders with the same connection options e.g proxy and limits share one
+        connection pool so that connections to the hosts stay warm from one file to the next.
+        """
+        await self._bind_loop()
+        key = (downloader_class, *make_options_key(options))
+        file_downloader = self._file_downloaders.get(key)
+
+        if file_downloader is None:
+            connection_options = {name: options[name] for name in CONNECTION_OPTIONS if name in options}
+
+            # Clients given transports or using proxies of the environment build their own
+            shareable = "transport" not in options and "mounts" not in options
+            if shareable and "proxy" not in options and options.get("trust_env", True):
+                shareable = not has_environment_proxies()
+
+            if shareable:
+                transports_key = make_options_key(connection_options)
+                transport = self._transports.get(transports_key)
+
+                if transport is None:
+                    transport = self._transports[transports_key] = httpx.AsyncHTTPTransport(
+                        **connection_options
+                    )
+
+                options = {
+                    name: value
+                    for name, value in options.items()
+                    # trust_env also decides whether the client reads .netrc
+                    if name not in CONNECTION_OPTIONS or name == "trust_env"
+                }
+                options["transport"] = transport
+
+            file_downloader = self._file_downloaders[key] = downloader_class(**options)
+
+        return file_downloader
+
+    @staticmethod
+    def _record_job_item_target(
+        job_store: JobStore,
+        job_id: int,
+        media_file_downloader: MediaFileDownloader,
+        item: SearchResultsItem,
+        media_file: MediaFileMetadata,
+        season: int = 0,
+        episode: int = 0,
+        filename_template: str | None = None,
+    ) -> None:
+        filename, final_dir = media_file_downloader.generate_filename(
+            item, media_file, season, episode, filename_template=filename_template
+        )
+        job_store.update_item(
+            job_id,
+            season,
+            episode,
+            url=str(media_file.url),
+            resolution=media_file.resolution,
+            size=media_file.size,
+            saved_to=str(Path(final_dir).joinpath(sanitize_filename(filename))),
+        )
+
+    @staticmethod
+    async def _run_job_item(
+        job_store: JobStore,
+        job_id: int,
+        season: int,
+        episode: int,
+        download: t.Callable[[], t.Awaitable],
+    ):
+        """Runs download of a job item keeping its status up to date"""
+        if job_store.get_status(job_id) == JobStatus.CANCELLED:
+            logging.info(f"Skipping S{season}E{episode} of cancelled job {job_id}")
+            return
+
+        job_store.update_item(job_id, season, episode, status=JobStatus.RUNNING, error=None)
+
+        try:
+            downloaded = await download()
+
+        except asyncio.CancelledError:
+            job_store.update_item(job_id, season, episode, status=JobStatus.PENDING)
+            raise
+
+        except Exception as e:
+            job_item = job_store.get_item(job_id, season, episode)
+            completed_ranges = []
+
+            if job_item.saved_to is not None:
+                manifest = RangeManifest.load(RangeManifest.path_for(Path(job_item.saved_to)))
+                if manifest is not None:
+                    completed_ranges = manifest.completed
+
+            job_store.update_item(
+                job_id,
+                season,
+                episode,
+                status=JobStatus.FAILED,
+                error=repr(e),
+                completed_ranges=completed_ranges,
+            )
+            raise
+
+        else:
+            job_item = job_store.get_item(job_id, season, episode)
+            job_store.update_item(
+                job_id,
+                season,
+                episode,
+                status=JobStatus.COMPLETED,
+                completed_ranges=[[0, job_item.size]] if job_item.size else [],
+            )
+            return downloaded
+
+        finally:
+            job_store.settle_status(job_id)
 
     async def download_movie(
         self,
@@ -71,6 +341,14 @@ class Downloader:
         part_extension: str = DOWNLOAD_PART_EXTENSION,
         merge_buffer_size: int | None = None,
         ignore_missing_caption: bool = False,
+        multi_source: bool = False,
+        max_file_size: int | None = None,
+        max_bitrate: float | None = None,
+        bandwidth_share: BandwidthShare | None = None,
+        stream_to: ChunkConsumerType | None = None,
+        library: LibraryIndex | None = None,
+        job_store: JobStore | None = None,
+        job_id: int | None = None,
         **run_kwargs,
     ) -> tuple[
         DownloadedFile | httpx.Response | None,
@@ -97,6 +375,14 @@ class Downloader:
             part_dir (Path | str, optional): Directory for temporarily saving the downloaded file-parts to. Defaults to CURRENT_WORKING_DIR.
             part_extension (str, optional): Filename extension for download parts. Defaults to DOWNLOAD_PART_EXTENSION.
             merge_buffer_size (int|None, optional). Buffer size for merging the separated files in kilobytes. Defaults to chunk_size.
+            multi_source (bool, optional): Spread the download across urls of the movie file from all mirror hosts. Defaults to False.
+            max_file_size (int | None, optional): Most bytes of the movie file, falling back to the nearest smaller quality. Defaults to None.
+            max_bitrate (float | None, optional): Most average bits per second of the movie file given its duration. Defaults to None.
+            bandwidth_share (BandwidthShare | None, optional): Weight and priority of the movie and captions on the process-wide bandwidth. Defaults to None (weight 1).
+            stream_to (ChunkConsumerType | None, optional): Hand movie bytes in order to it e.g `file_object_consumer(sys.stdout.buffer)` instead of saving a file. Defaults to None.
+            library (LibraryIndex | None, optional): Skip the movie when present in this index, recording it once downloaded. Defaults to None.
+            job_store (JobStore | None, optional): Keep track of the download in this jobs database. Defaults to None.
+            job_id (int | None, optional): Id of the job being resumed. Defaults to None (record a new job).
 
         run_kwargs: Other keyword arguments for `MediaFileDownloader.run`
 
@@ -104,15 +390,14 @@ class Downloader:
             tuple[DownloadedFile | httpx.Response  | None, list[DownloadedFile | httpx.Response ] | None]: Path to downloaded movie and downloaded caption files.
         """  # noqa: E501
 
+        job_options = make_job_options(locals())
+
         assert_membership(quality, DOWNLOAD_QUALITIES)
 
         assert callable(search_function), (
             f"Value for search_function must be callable not {type(search_function)}"
         )
 
-        MediaFileDownloader.movie_filename_template = movie_filename_tmpl
-        CaptionFileDownloader.movie_filename_template = caption_filename_tmpl
-
         target_movie = await search_function(
             self._session,
             title=title,
@@ -126,42 +411,82 @@ class Downloader:
             f"{SearchResultsItem} not {type(target_movie)}"
         )
 
+        if library is not None and (
+            caption_only or stream_via or stream_to is not None or run_kwargs.get("test")
+        ):
+            # Only saved movie files are indexed
+            library = None
+
+        if library is not None:
+            library_entry = library.find(target_movie.subjectId, quality=quality)
+
+            if library_entry is not None:
+                logging.info(f"Skipping '{target_movie.title}' present in library at {library_entry.path}")
+
+                if job_store is not None and job_id is not None:
+                    job_store.update_item(
+                        job_id,
+                        0,
+                        0,
+                        status=JobStatus.COMPLETED,
+                        resolution=library_entry.resolution,
+                        size=library_entry.size,
+                        saved_to=library_entry.path,
+                    )
+                    job_store.settle_status(job_id)
+
+                if not download_caption:
+                    return (None, None)
+
+                # Captions are still downloaded for the movie in place
+                caption_only = True
+
         downloadable_details_inst = DownloadableMovieFilesDetail(self._session, target_movie)
 
         downloadable_details = await downloadable_details_inst.get_content_model()
 
-        target_media_file = resolve_media_file_to_be_downloaded(quality, downloadable_details)
+        target_media_file = resolve_media_file_to_be_downloaded(
+            QualityPolicy(quality, max_file_size=max_file_size, max_bitrate=max_bitrate),
+            downloadable_details,
+            duration=target_movie.duration,
+        )
 
         subtitle_details_items: list[DownloadedFile] = []
 
         subtitles_dir = tempfile.mkdtemp() if stream_via else caption_dir
 
+        target_caption_files = []
+
         if download_caption or caption_only:
             for lang in language:
                 try:
-                    target_caption_file = get_caption_file_or_raise(downloadable_details, lang)
+                    target_caption_files.append(get_caption_file_or_raise(downloadable_details, lang))
 
                 except (ZeroCaptionFileError, ValueError):
                     if ignore_missing_caption:
                         continue
                     raise
 
-                caption_downloader = CaptionFileDownloader(
-                    dir=subtitles_dir,
-                    chunk_size=chunk_size,
-                    tasks=tasks,
-                    part_dir=part_dir,
-                    part_extension=part_extension,
-                    merge_buffer_size=merge_buffer_size,
-                )
-
-                subtitle_details = await caption_downloader.run(
-                    caption_file=target_caption_file,
-                    filename=target_movie,
-                    **run_kwargs,
-                )
-
-                subtitle_details_items.append(subtitle_details)
+        caption_downloader = await self._get_file_downloader(
+            CaptionFileDownloader,
+            dir=subtitles_dir,
+            chunk_size=chunk_size,
+            tasks=tasks,
+            part_dir=part_dir,
+            part_extension=part_extension,
+            merge_buffer_size=merge_buffer_size,
+            bandwidth_share=bandwidth_share,
+        )
+        caption_run_kwargs = make_caption_run_kwargs(run_kwargs)
+
+        if caption_only or stream_via:
+            # Captions are needed first
+            subtitle_details_items = await caption_downloader.run_many(
+                target_caption_files,
+                filename=target_movie,
+                filename_template=caption_filename_tmpl,
+                **caption_run_kwargs,
+            )
 
             if caption_only and not stream_via:
                 # terminate
@@ -172,19 +497,186 @@ class Downloader:
                 str(target_media_file.url), subtitle_details_items, subtitles_dir
             )
 
-        movie_downloader = MediaFileDownloader(
+        movie_downloader = await self._get_file_downloader(
+            MediaFileDownloader,
             dir=dir,
             chunk_size=chunk_size,
             tasks=tasks,
             part_dir=part_dir,
             part_extension=part_extension,
             merge_buffer_size=merge_buffer_size,
+            bandwidth_share=bandwidth_share,
         )
 
-        movie_details = await movie_downloader.run(
-            media_file=target_media_file, filename=target_movie, **run_kwargs
+        async def download_movie_and_captions():
+            mirror_files = (
+                await downloadable_details_inst.get_mirror_media_files(target_media_file)
+                if multi_source
+                else None
+            )
+            # Captions are downloaded alongside the movie
+            downloaded = await run_alongside(
+                movie_downloader.run(
+                    media_file=target_media_file,
+                    filename=target_movie,
+                    filename_template=movie_filename_tmpl,
+                    refresh_from=downloadable_details_inst,
+                    mirror_files=mirror_files,
+                    sink=None if stream_to is None else OrderedStreamSink(stream_to),
+                    **run_kwargs,
+                ),
+                download_captions_alongside(
+                    caption_downloader.run_many(
+                        target_caption_files,
+                        filename=target_movie,
+                        filename_template=caption_filename_tmpl,
+                        **caption_run_kwargs,
+                    )
+                ),
+            )
+
+            if library is not None and isinstance(downloaded[0], DownloadedFile):
+                library.add(
+                    target_movie.subjectId, downloaded[0], target_media_file.resolution, quality=quality
+                )
+
+            return downloaded
+
+        if job_store is None or stream_to is not None or run_kwargs.get("test"):
+            # Streamed bytes are gone once handed over hence nothing to resume
+            return tuple(await download_movie_and_captions())
+
+        if job_id is None:
+            job_id = job_store.create_job(
+                SubjectType.MOVIES,
+                target_movie.title,
+                target_movie.model_dump(mode="json", by_alias=True),
+                quality,
+                job_options,
+            )
+            logging.info(f"Recorded download job {job_id}")
+
+        self._record_job_item_target(
+            job_store,
+            job_id,
+            movie_downloader,
+            target_movie,
+            target_media_file,
+            filename_template=movie_filename_tmpl,
         )
-        return (movie_details, subtitle_details_items)
+        downloaded = await self._run_job_item(job_store, job_id, 0, 0, download_movie_and_captions)
+        return (None, None) if downloaded is None else tuple(downloaded)
+
+    async def _get_target_episodes(
+        self,
+        target_tv_series: SearchResultsItem,
+        season: int,
+        episode: int,
+        limit: int = 1,
+        auto_mode: bool = False,
+    ) -> list[tuple[int, int]]:
+        """Discovers (season, episode) pairs to download from the offset episode and limit"""
+        core_tv_series_details = TVSeriesDetails(target_tv_series, self._session)
+        tv_series_details_model = await core_tv_series_details.get_json_details_extractor_model()
+        series_resource = tv_series_details_model.resource
+        target_episodes: list[tuple[int, int]] = []
+
+        if auto_mode:
+            if series_resource.total_seasons < season:
+                raise RuntimeError(
+                    f"The target season {season} exceeds the available "
+                    f"tv series seasons {series_resource.total_seasons}."
+                )
+
+            total_episodes = 0
+            downloaded_episodes_count = 0
+
+            target_seasons = series_resource.seasons[season - 1 :]
+
+            for index, series_season in enumerate(target_seasons):
+                new_episodes_count = series_season.maxEp
+
+                if index == 0:
+                    # episode offset
+                    if series_season.maxEp < episode:
+                        raise RuntimeError(
+                            f"The target episode offset {episode} for season {series_season.se}"
+                            f" is greater than the available episodes {series_season.maxEp}"
+                        )
+
+                    else:
+                        new_episodes_count -= episode - 1
+
+                total_episodes += new_episodes_count
+
+            if limit != 1:
+                if limit > total_episodes:
+                    logging.warning(
+                        f"You have set total episodes limit to {limit} but only {total_episodes} "
+                        f"episodes are available starting from the offset ({season=}, {episode=}"
+                        "). The former will be ignored."
+                    )
+                    limit = total_episodes
+
+            else:
+                limit = total_episodes
+
+            logging.info(
+                f"Process overview - Seasons: {len(target_seasons)}, total episodes: {total_episodes}, "
+                f"episodes download limit: {limit} "
+            )
+
+            for index, target_season in enumerate(target_seasons):
+                if index == 0:
+                    first_episode_number = episode  # declared by user
+                    episodes_limit = target_season.maxEp - (episode - 1)  # 1 = index 0
+
+                    if episodes_limit > limit:
+                        episodes_limit = limit
+
+                else:
+                    first_episode_number = 1
+
+                    remaining_episodes_amount = limit - downloaded_episodes_count
+
+                    if target_season.maxEp > remaining_episodes_amount:
+                        episodes_limit = remaining_episodes_amount
+
+                    else:
+                        episodes_limit = target_season.maxEp
+
+                target_episodes.extend(
+                    (target_season.se, first_episode_number + episode_count)
+                    for episode_count in range(episodes_limit)
+                )
+
+                downloaded_episodes_count += episodes_limit
+
+        else:
+            target_season = series_resource.get_season_by_number(season)
+
+            assert episode <= target_season.maxEp, (
+                f"The chosen episode offset {episode} exceeds the available episodes {target_season.maxEp}"
+            )
+
+            available_episodes = target_season.maxEp - (episode - 1)  # offset
+
+            if limit > available_episodes:
+                logging.warning(
+                    f"You have set episodes limit to {limit} but only {available_episodes} "
+                    f"episodes are available for season {season}, starting from the offset {episode}. "
+                    "The former will be ignored."
+                )
+                limit = available_episodes
+
+            logging.info(
+                f"Season {target_season.se} details - Total episodes: {target_season.maxEp}, "
+                f"episodes download limit: {limit}"
+            )
+
+            target_episodes.extend((season, episode + episode_count) for episode_count in range(limit))
+
+        return target_episodes
 
     async def download_tv_series(
         self,
@@ -212,6 +704,18 @@ class Downloader:
         ignore_missing_caption: bool = False,
         auto_mode: bool = False,
         format: Literal["group", "struct"] | None = None,
+        max_connections: int | None = None,
+        prefetch: int = 0,
+        multi_source: bool = False,
+        max_file_size: int | None = None,
+        max_bitrate: float | None = None,
+        season_budget: int | None = None,
+        bandwidth_share: BandwidthShare | None = None,
+        episodes: list[tuple[int, int]] | None = None,
+        plan: DownloadPlan | None = None,
+        library: LibraryIndex | None = None,
+        job_store: JobStore | None = None,
+        job_id: int | None = None,
         **run_kwargs,
     ) -> dict[
         int,
@@ -248,6 +752,18 @@ class Downloader:
             format(Literal["filename", "group", "struct"] | None, optional): Ways of formating filename and saving the episodes. Defaults to None
                 group -> Organize episodes into separate folders based on seasons e.g Merlin/S1/Merlin S1E2.mp4
                 struct -> Save episodes in a hierarchical directory structure e.g Merlin (2009)/S1/E1.mp4
+            max_connections (int | None, optional): Global connections budget shared by episodes downloaded at once, each using `tasks`. Defaults to None (tasks - one episode at a time).
+            prefetch (int, optional): Number of upcoming episodes whose metadata and captions are fetched in the background. Defaults to 0.
+            multi_source (bool, optional): Spread each episode download across urls of the episode file from all mirror hosts. Defaults to False.
+            max_file_size (int | None, optional): Most bytes of each episode file, falling back to the nearest smaller quality. Defaults to None.
+            max_bitrate (float | None, optional): Most average bits per second of each episode file given its duration. Defaults to None.
+            season_budget (int | None, optional): Most bytes of all the target episodes together. Their metadata is fetched upfront to plan qualities. Defaults to None.
+            bandwidth_share (BandwidthShare | None, optional): Weight and priority of the episodes and captions on the process-wide bandwidth. Defaults to None (weight 1).
+            episodes (list[tuple[int, int]] | None, optional): Exact (season, episode) pairs to download instead of discovering them from season, episode and limit. Defaults to None.
+            plan (DownloadPlan | None, optional): Download the episodes and media files of this plan from `plan_tv_series` without searching or fetching their metadata again. Defaults to None.
+            library (LibraryIndex | None, optional): Skip episodes present in this index, recording the ones downloaded. Defaults to None.
+            job_store (JobStore | None, optional): Keep track of the downloads in this jobs database. Defaults to None.
+            job_id (int | None, optional): Id of the job being resumed. Defaults to None (record a new job).
 
         run_kwargs: Other keyword arguments for `MediaFileDownloader.run`
 
@@ -255,15 +771,14 @@ class Downloader:
              dict[int, dict[str, DownloadedFile | httpx.Response  | list[DownloadedFile | httpx.Response ]]]: Episode number and downloaded episode file details and caption files.
         """  # noqa: E501
 
+        job_options = make_job_options(locals())
+
         assert_membership(quality, DOWNLOAD_QUALITIES)
 
         assert callable(search_function), (
             f"Value for search_function must be callable not {type(search_function)}"
         )
 
-        MediaFileDownloader.series_filename_template = episode_filename_tmpl
-        CaptionFileDownloader.series_filename_template = caption_filename_tmpl
-
         group = False
 
         match format:
@@ -271,16 +786,20 @@ class Downloader:
                 group = True
 
             case "struct":
-                MediaFileDownloader.series_filename_template = "E{episode}.{ext}"
-                CaptionFileDownloader.series_filename_template = "E{episode}.{lan}.{ext}"
+                episode_filename_tmpl = "E{episode}.{ext}"
+                caption_filename_tmpl = "E{episode}.{lan}.{ext}"
                 group = True
 
-        target_tv_series = await search_function(
-            self._session,
-            title=title,
-            year=year,
-            subject_type=SubjectType.TV_SERIES,
-            yes=yes,
+        target_tv_series = (
+            plan.item
+            if plan is not None
+            else await search_function(
+                self._session,
+                title=title,
+                year=year,
+                subject_type=SubjectType.TV_SERIES,
+                yes=yes,
+            )
         )
         assert isinstance(target_tv_series, SearchResultsItem), (
             f"Search function {search_function.__name__} must return an instance of "
@@ -288,10 +807,20 @@ class Downloader:
         )
 
         downloadable_files = DownloadableTVSeriesFilesDetail(self._session, target_tv_series)
+        quality_policy = (
+            plan.quality_policy
+            if plan is not None
+            else QualityPolicy(
+                quality, max_file_size=max_file_size, max_bitrate=max_bitrate, season_budget=season_budget
+            )
+        )
+        episodes_metadata: dict[tuple[int, int], DownloadableFilesMetadata] = {}
+        planned_media_files: dict[tuple[int, int], MediaFileMetadata] = {}
 
         subtitles_dir = tempfile.mkdtemp() if stream_via else caption_dir
 
-        caption_downloader = CaptionFileDownloader(
+        caption_downloader = await self._get_file_downloader(
+            CaptionFileDownloader,
             dir=dir if group else subtitles_dir,
             chunk_size=chunk_size,
             tasks=tasks,
@@ -299,9 +828,12 @@ class Downloader:
             part_extension=part_extension,
             merge_buffer_size=merge_buffer_size,
             group_series=group,
+            bandwidth_share=bandwidth_share,
         )
+        caption_run_kwargs = make_caption_run_kwargs(run_kwargs)
 
-        media_file_downloader = MediaFileDownloader(
+        media_file_downloader = await self._get_file_downloader(
+            MediaFileDownloader,
             dir=dir,
             chunk_size=chunk_size,
             tasks=tasks,
@@ -309,182 +841,513 @@ class Downloader:
             part_extension=part_extension,
             merge_buffer_size=merge_buffer_size,
             group_series=group,
+            bandwidth_share=bandwidth_share,
         )
 
-        core_tv_series_details = TVSeriesDetails(target_tv_series, self._session)
+        def select_caption_files(
+            downloadable_files_detail: DownloadableFilesMetadata,
+        ) -> list[CaptionFileMetadata]:
+            target_caption_files = []
 
-        tv_series_details_model = await core_tv_series_details.get_json_details_extractor_model()
-        series_resource = tv_series_details_model.resource
+            if caption_only or download_caption:
+                for lang in language:
+                    try:
+                        target_caption_files.append(
+                            get_caption_file_or_raise(downloadable_files_detail, lang)
+                        )
 
-        async def download_episodes_per_season(
-            season_number: int,
-            first_episode_number: int,
-            episode_limit: int,
-        ):
-            response = {}
-            for episode_count in range(episode_limit):
-                current_episode = first_episode_number + episode_count
+                    except (ZeroCaptionFileError, ValueError):
+                        if ignore_missing_caption:
+                            continue
+                        raise
 
-                downloadable_files_detail = await downloadable_files.get_content_model(
-                    season=season_number, episode=current_episode
-                )
+            return target_caption_files
 
-                current_episode_details = {}
-                caption_details_items: list[DownloadedFile] = []
-
-                if caption_only or download_caption:
-                    for lang in language:
-                        try:
-                            target_caption_file = get_caption_file_or_raise(downloadable_files_detail, lang)
-
-                        except (ZeroCaptionFileError, ValueError):
-                            if ignore_missing_caption:
-                                continue
-                            raise
-
-                        caption_details = await caption_downloader.run(
-                            caption_file=target_caption_file,
-                            filename=target_tv_series,
-                            season=season_number,
-                            episode=current_episode,
-                            **run_kwargs,
-                        )
+        async def download_captions(
+            season_number: int,
+            current_episode: int,
+            downloadable_files_detail: DownloadableFilesMetadata,
+            target_caption_files: list[CaptionFileMetadata] | None = None,
+        ) -> list[DownloadedFile]:
+            if target_caption_files is None:
+                target_caption_files = select_caption_files(downloadable_files_detail)
+
+            return await caption_downloader.run_many(
+                target_caption_files,
+                filename=target_tv_series,
+                season=season_number,
+                episode=current_episode,
+                filename_template=caption_filename_tmpl,
+                **caption_run_kwargs,
+            )
 
-                        caption_details_items.append(caption_details)
+        async def download_episode(season_number: int, current_episode: int):
+            if prefetcher is None:
+                downloadable_files_detail = episodes_metadata.get(
+                    (season_number, current_episode)
+                ) or await downloadable_files.get_content_model(season=season_number, episode=current_episode)
+                caption_details_items = None
 
-                    if caption_only and not stream_via:
-                        # Avoid downloading tv-series
-                        continue
+            else:
+                prefetched_episode = await prefetcher.get(season_number, current_episode)
+                downloadable_files_detail = prefetched_episode.metadata
+                caption_details_items = prefetched_episode.prepared
 
-                # Download or stream series
+            current_episode_details = {}
+
+            if (season_number, current_episode) in present_episodes:
+                # Only captions are downloaded for episodes in place
+                if caption_details_items is None:
+                    caption_details_items = await download_captions(
+                        season_number, current_episode, downloadable_files_detail
+                    )
 
                 current_episode_details["captions"] = caption_details_items
+                current_episode_details["movie"] = None
+                return current_episode_details
+
+            if caption_details_items is None and (caption_only or stream_via):
+                # Captions are needed first
+                caption_details_items = await download_captions(
+                    season_number, current_episode, downloadable_files_detail
+                )
 
-                target_media_file = resolve_media_file_to_be_downloaded(quality, downloadable_files_detail)
+            if caption_only and not stream_via:
+                # Avoid downloading tv-series
+                return
 
-                if stream_via:
-                    media_player_name_func_map[stream_via](
-                        str(target_media_file.url), caption_details_items, subtitles_dir
-                    )
+            # Download or stream series
 
-                    continue
+            target_media_file = planned_media_files.get(
+                (season_number, current_episode)
+            ) or resolve_media_file_to_be_downloaded(
+                quality_policy, downloadable_files_detail, duration=target_tv_series.duration
+            )
 
-                tv_series_details = await media_file_downloader.run(
-                    media_file=target_media_file,
-                    filename=target_tv_series,
-                    season=season_number,
-                    episode=current_episode,
-                    **run_kwargs,
+            if stream_via:
+                media_player_name_func_map[stream_via](
+                    str(target_media_file.url), caption_details_items, subtitles_dir
                 )
 
-                current_episode_details["movie"] = tv_series_details
-                response[current_episode] = current_episode_details
+                return
+
+            if job_id is not None:
+                self._record_job_item_target(
+                    job_store,
+                    job_id,
+                    media_file_downloader,
+                    target_tv_series,
+                    target_media_file,
+                    season_number,
+                    current_episode,
+                    filename_template=episode_filename_tmpl,
+                )
 
-            return response
+            if caption_details_items is None:
+                # Missing captions fail the episode before its download starts
+                target_caption_files = select_caption_files(downloadable_files_detail)
 
-        if auto_mode:
-            if series_resource.total_seasons < season:
-                raise RuntimeError(
-                    f"The target season {season} exceeds the available "
-                    f"tv series seasons {series_resource.total_seasons}."
+            mirror_files = (
+                await downloadable_files.get_mirror_media_files(
+                    target_media_file, season_number, current_episode
                 )
+                if multi_source
+                else None
+            )
+            media_file_download = media_file_downloader.run(
+                media_file=target_media_file,
+                filename=target_tv_series,
+                season=season_number,
+                episode=current_episode,
+                filename_template=episode_filename_tmpl,
+                refresh_from=downloadable_files,
+                mirror_files=mirror_files,
+                # Episodes running alongside release their disk space once done
+                wait_for_space=scheduler.concurrent_episodes > 1,
+                **run_kwargs,
+            )
 
-            total_episodes = 0
-            downloaded_episodes_count = 0
-            response_jar = {}
+            if caption_details_items is None:
+                # Captions are downloaded alongside the episode
+                tv_series_details, caption_details_items = await run_alongside(
+                    media_file_download,
+                    download_captions_alongside(
+                        download_captions(
+                            season_number, current_episode, downloadable_files_detail, target_caption_files
+                        )
+                    ),
+                )
 
-            target_seasons = series_resource.seasons[season - 1 :]
+            else:
+                tv_series_details = await media_file_download
+
+            if library is not None and isinstance(tv_series_details, DownloadedFile):
+                library.add(
+                    target_tv_series.subjectId,
+                    tv_series_details,
+                    target_media_file.resolution,
+                    season_number,
+                    current_episode,
+                    quality_policy.quality,
+                )
 
-            for index, series_season in enumerate(target_seasons):
-                new_episodes_count = series_season.maxEp
+            current_episode_details["captions"] = caption_details_items
+            current_episode_details["movie"] = tv_series_details
+            return current_episode_details
+
+        async def admit_episode(season_number: int, current_episode: int):
+            target_media_file = planned_media_files.get((season_number, current_episode))
+
+            if (
+                target_media_file is None
+                or caption_only
+                or stream_via
+                or run_kwargs.get("test")
+                or run_kwargs.get("check_disk_space") is False
+            ):
+                # Size is only known once the episode metadata is fetched
+                return
+
+            filename, final_dir = media_file_downloader.generate_filename(
+                target_tv_series,
+                target_media_file,
+                season_number,
+                current_episode,
+                filename_template=episode_filename_tmpl,
+            )
+            merge_free = multi_source or any(
+                run_kwargs.get(key) for key in ("merge_free", "auto_tasks", "checksum")
+            )
+            await get_disk_space_ledger().wait(
+                media_file_downloader.space_needs(target_media_file.size, filename, final_dir, merge_free)
+            )
 
-                if index == 0:
-                    # episode offset
-                    if series_season.maxEp < episode:
-                        raise RuntimeError(
-                            f"The target episode offset {episode} for season {series_season.se}"
-                            f" is greater than the available episodes {series_season.maxEp}"
-                        )
+        scheduler = EpisodesDownloadScheduler(
+            # Media players are launched one episode after another
+            max_connections=None if stream_via else max_connections,
+            tasks=tasks,
+            admission=admit_episode,
+        )
+        target_episodes: list[tuple[int, int]] = []
+        present_episodes: dict[tuple[int, int], LibraryEntry] = {}
+        prefetcher: EpisodesMetadataPrefetcher | None = None
 
-                    else:
-                        new_episodes_count -= episode - 1
+        if plan is not None and episodes is None:
+            target_episodes.extend(plan.target_episodes)
 
-                total_episodes += new_episodes_count
+            if download_caption:
+                # Left out of the plan but their captions are still needed
+                target_episodes.extend(plan.present_episodes)
 
-            if limit != 1:
-                if limit > total_episodes:
-                    logging.warning(
-                        f"You have set total episodes limit to {limit} but only {total_episodes} "
-                        f"episodes are available starting from the offset ({season=}, {episode=}"
-                        "). The former will be ignored."
-                    )
-                    limit = total_episodes
+        elif episodes is not None:
+            # Known already e.g when resuming a job
+            target_episodes.extend(episodes)
 
-            else:
-                limit = total_episodes
+        else:
+            target_episodes.extend(
+                await self._get_target_episodes(target_tv_series, season, episode, limit, auto_mode)
+            )
+
+        if library is not None and (caption_only or stream_via or run_kwargs.get("test")):
+            # Only saved episode files are indexed
+            library = None
 
+        if library is not None:
+            present_episodes.update(
+                library.find_many(target_tv_series.subjectId, target_episodes, quality_policy.quality)
+            )
+
+            if present_episodes:
+                skipped = ", ".join(
+                    f"S{season_number}E{current_episode}"
+                    for season_number, current_episode in sorted(present_episodes)
+                )
+                logging.info(f"Skipping episode files present in library - {skipped}")
+
+                if not download_caption:
+                    target_episodes = [
+                        season_episode
+                        for season_episode in target_episodes
+                        if season_episode not in present_episodes
+                    ]
+
+                if job_store is not None and job_id is not None:
+                    for (season_number, current_episode), library_entry in present_episodes.items():
+                        job_store.update_item(
+                            job_id,
+                            season_number,
+                            current_episode,
+                            status=JobStatus.COMPLETED,
+                            resolution=library_entry.resolution,
+                            size=library_entry.size,
+                            saved_to=library_entry.path,
+                        )
+                    job_store.settle_status(job_id)
+
+            if not target_episodes:
+                return {}
+
+        if plan is None and season_budget is not None and not caption_only:
+            plan = await EpisodesDownloadPlanner(downloadable_files, quality_policy).plan(
+                season_episode for season_episode in target_episodes if season_episode not in present_episodes
+            )
             logging.info(
-                f"Process overview - Seasons: {len(target_seasons)}, total episodes: {total_episodes}, "
-                f"episodes download limit: {limit} "
+                f"Planned {len(plan.episodes)} episodes totalling {get_filesize_string(plan.total_size)} "
+                f"within the season budget of {get_filesize_string(season_budget)}"
             )
 
-            for index, target_season in enumerate(target_seasons):
-                if index == 0:
-                    first_episode_number = episode  # declared by user
-                    episodes_limit = target_season.maxEp - (episode - 1)  # 1 = index 0
+        if plan is not None:
+            # Chosen upfront hence not fetched again
+            episodes_metadata.update(plan.episodes_metadata)
+            planned_media_files.update(plan.media_files)
+
+        worker = download_episode
+
+        if job_store is not None and not (stream_via or caption_only or run_kwargs.get("test")):
+            if job_id is None:
+                job_id = job_store.create_job(
+                    SubjectType.TV_SERIES,
+                    target_tv_series.title,
+                    target_tv_series.model_dump(mode="json", by_alias=True),
+                    quality,
+                    job_options,
+                    target_episodes,
+                )
+                logging.info(f"Recorded download job {job_id}")
+
+            async def worker(season_number: int, current_episode: int):
+                return await self._run_job_item(
+                    job_store,
+                    job_id,
+                    season_number,
+                    current_episode,
+                    lambda: download_episode(season_number, current_episode),
+                )
 
-                    if episodes_limit > limit:
-                        episodes_limit = limit
+        else:
+            job_id = None
+
+        if prefetch:
+            prefetcher = EpisodesMetadataPrefetcher(
+                downloadable_files,
+                scheduler.order(target_episodes),
+                lookahead=prefetch,
+                preparer=download_captions,
+            )
 
-                else:
-                    first_episode_number = 1
+        try:
+            return await scheduler.run(worker, target_episodes)
 
-                    remaining_episodes_amount = limit - downloaded_episodes_count
+        finally:
+            if prefetcher is not None:
+                prefetcher.close()
 
-                    if target_season.maxEp > remaining_episodes_amount:
-                        episodes_limit = remaining_episodes_amount
+    async def plan_tv_series(
+        self,
+        title: str,
+        season: int,
+        episode: int,
+        year: int | None = None,
+        yes: bool = False,
+        quality: DownloadQualitiesType = "BEST",
+        language: tuple = (DEFAULT_CAPTION_LANGUAGE,),
+        download_caption: bool = False,
+        limit: int = 1,
+        auto_mode: bool = False,
+        search_function: callable = perform_search_and_get_item,
+        max_file_size: int | None = None,
+        max_bitrate: float | None = None,
+        season_budget: int | None = None,
+        concurrency: int = DEFAULT_METADATA_CONCURRENCY,
+        bandwidth: float | None = None,
+        library: LibraryIndex | None = None,
+    ) -> DownloadPlan:
+        """Search tv-series by name and plan download of its episodes without downloading anything.
+
+        Episodes are targeted and their media files chosen just like `download_tv_series` does
+        for the same arguments. The plan can be passed to `download_tv_series(plan=...)`.
 
-                    else:
-                        episodes_limit = target_season.maxEp
+        Args:
+            title (str): Complete or partial tv-series name.
+            season (int): Target season number of the tv-series.
+            episode (int): Target episode number of the tv-series.
+            year (int|None, optional): `releaseDate.year` filter for the tv-series. Defaults to None.
+            yes (bool, optional): Proceed with the first item in the results instead of prompting confirmation. Defaults to False.
+            quality (DownloadQualitiesType, optional): Episode quality such as `720p` or simply `BEST` etc. Defaults to 'BEST'.
+            language (tuple, optional): Languages of captions to check availability of. Defaults to (DEFAULT_CAPTION_LANGUAGE,).
+            download_caption (bool, optional): Whether captions availability matters. Defaults to False.
+            limit (int, optional): Number of episodes to plan including the offset episode. Defaults to 1.
+            auto_mode (bool, optional). Iterate over seasons as well. When limit is 1 (default), plan entire tv series. Defaults to False.
+            search_function (callable, optional): Accepts `session`, `title`, `year`, `subject_type` & `yes` and returns item.
+            max_file_size (int | None, optional): Most bytes of each episode file. Defaults to None.
+            max_bitrate (float | None, optional): Most average bits per second of each episode file. Defaults to None.
+            season_budget (int | None, optional): Most bytes of all the target episodes together. Defaults to None.
+            concurrency (int, optional): Most metadata requests made at once. Defaults to DEFAULT_METADATA_CONCURRENCY.
+            bandwidth (float | None, optional): Bytes per second for estimating download duration. Defaults to None (measured).
+            library (LibraryIndex | None, optional): Leave out episodes present in this index. Defaults to None.
 
-                downloaded_episodes_details = await download_episodes_per_season(
-                    season_number=target_season.se,
-                    first_episode_number=first_episode_number,
-                    episode_limit=episodes_limit,
-                )
-                response_jar[target_season.se] = downloaded_episodes_details
+        Returns:
+            DownloadPlan: Planned episodes along with sizes and estimated duration.
+        """  # noqa: E501
+        assert_membership(quality, DOWNLOAD_QUALITIES)
 
-                downloaded_episodes_count += episodes_limit
+        target_tv_series = await search_function(
+            self._session,
+            title=title,
+            year=year,
+            subject_type=SubjectType.TV_SERIES,
+            yes=yes,
+        )
+        assert isinstance(target_tv_series, SearchResultsItem), (
+            f"Search function {search_function.__name__} must return an instance of "
+            f"{SearchResultsItem} not {type(target_tv_series)}"
+        )
 
-            return response_jar
+        planner = EpisodesDownloadPlanner(
+            DownloadableTVSeriesFilesDetail(self._session, target_tv_series),
+            QualityPolicy(
+                quality, max_file_size=max_file_size, max_bitrate=max_bitrate, season_budget=season_budget
+            ),
+            languages=language if download_caption else (),
+            concurrency=concurrency,
+            bandwidth=bandwidth,
+            library=library,
+        )
+        return await planner.plan(
+            await self._get_target_episodes(target_tv_series, season, episode, limit, auto_mode)
+        )
 
-        else:
-            target_season = series_resource.get_season_by_number(season)
+    async def check_availability(
+        self,
+        titles: t.Iterable[str],
+        subject_type: SubjectType = SubjectType.MOVIES,
+        year: int | None = None,
+        yes: bool = True,
+        season: int = 1,
+        episode: int = 1,
+        limit: int = 1,
+        auto_mode: bool = False,
+        quality: DownloadQualitiesType = "BEST",
+        language: tuple = (DEFAULT_CAPTION_LANGUAGE,),
+        download_caption: bool = False,
+        max_file_size: int | None = None,
+        max_bitrate: float | None = None,
+        concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+        search_function: callable = perform_search_and_get_item,
+    ) -> list[ItemAvailability]:
+        """Search movies or tv-series by name and check whether their files can be downloaded, all at once.
 
-            assert episode <= target_season.maxEp, (
-                f"The chosen episode offset {episode} exceeds the available episodes {target_season.maxEp}"
+        Args:
+            titles (t.Iterable[str]): Complete or partial names of the movies or tv-series.
+            subject_type (SubjectType, optional): Movies or tv-series. Defaults to SubjectType.MOVIES.
+            year (int|None, optional): `releaseDate.year` filter for the items. Defaults to None.
+            yes (bool, optional): Proceed with the first item in the results instead of prompting confirmation. Defaults to True.
+            season (int, optional): Season number of the offset episode of tv-series. Defaults to 1.
+            episode (int, optional): Offset episode of tv-series. Defaults to 1.
+            limit (int, optional): Number of episodes to check including the offset episode. Defaults to 1.
+            auto_mode (bool, optional). Iterate over seasons as well. When limit is 1 (default), check entire tv series. Defaults to False.
+            quality (DownloadQualitiesType, optional): Media quality such as `720p` or simply `BEST` etc. Defaults to 'BEST'.
+            language (tuple, optional): Languages of captions to check. Defaults to (DEFAULT_CAPTION_LANGUAGE,).
+            download_caption (bool, optional): Whether to check captions as well. Defaults to False.
+            max_file_size (int | None, optional): Most bytes of each media file. Defaults to None.
+            max_bitrate (float | None, optional): Most average bits per second of each media file. Defaults to None.
+            concurrency (int, optional): Most file probes made at once. Defaults to DEFAULT_PROBE_CONCURRENCY.
+            search_function (callable, optional): Accepts `session`, `title`, `year`, `subject_type` & `yes` and returns item.
+
+        Returns:
+            list[ItemAvailability]: Availability of each item in order of titles.
+        """  # noqa: E501
+        assert_membership(quality, DOWNLOAD_QUALITIES)
+        assert_membership(subject_type, (SubjectType.MOVIES, SubjectType.TV_SERIES), "subject_type")
+
+        async def search(title: str) -> SearchResultsItem:
+            return await search_function(
+                self._session, title=title, year=year, subject_type=subject_type, yes=yes
             )
 
-            available_episodes = target_season.maxEp - (episode - 1)  # offset
+        if yes:
+            items = await asyncio.gather(*(search(title) for title in titles))
+        else:
+            # Prompts are answered one after another
+            items = [await search(title) for title in titles]
 
-            if limit > available_episodes:
-                logging.warning(
-                    f"You have set episodes limit to {limit} but only {available_episodes} "
-                    f"episodes are available for season {season}, starting from the offset {episode}. "
-                    "The former will be ignored."
-                )
-                limit = available_episodes
+        if subject_type == SubjectType.MOVIES:
+            targets = [ProbeTarget(DownloadableMovieFilesDetail(self._session, item)) for item in items]
 
-            logging.info(
-                f"Season {target_season.se} details - Total episodes: {target_season.maxEp}, "
-                f"episodes download limit: {limit}"
+        else:
+            items_episodes = await asyncio.gather(
+                *(self._get_target_episodes(item, season, episode, limit, auto_mode) for item in items)
             )
+            targets = [
+                ProbeTarget(DownloadableTVSeriesFilesDetail(self._session, item), tuple(item_episodes))
+                for item, item_episodes in zip(items, items_episodes)
+            ]
 
-            downloaded_tv_series_details = await download_episodes_per_season(
-                season_number=season, first_episode_number=episode, episode_limit=limit
-            )
+        async with AvailabilityProber(
+            QualityPolicy(quality, max_file_size=max_file_size, max_bitrate=max_bitrate),
+            languages=language if download_caption else (),
+            concurrency=concurrency,
+        ) as prober:
+            return await prober.probe(targets)
+
+    async def resume_job(self, job_id: int, job_store: JobStore | None = None, **overrides):
+        """Downloads unfinished items of a recorded job.
 
-            return {season: downloaded_tv_series_details}
+        Finished items are skipped straight from the jobs database - neither the search
+        nor the tv-series details are requested again.
+
+        Args:
+            job_id (int): Id of the job to resume.
+            job_store (JobStore | None, optional): Jobs database. Defaults to JobStore().
+
+        overrides: Download options to use instead of the recorded ones e.g `tasks`
+
+        Returns:
+            Same as `download_movie` or `download_tv_series`. None incase the job was completed already.
+        """
+        job_store = JobStore() if job_store is None else job_store
+        job = job_store.get_job(job_id)
+
+        if job is None:
+            raise ValueError(f"There is no download job with id {job_id}")
+
+        unfinished_items = job.unfinished_items
+
+        if not unfinished_items:
+            logging.info(f"Download job {job_id} is completed already")
+            job_store.settle_status(job_id)
+            return
+
+        target_item = build_model(SearchResultsItem, job.item)
+
+        async def search_function(*args, **kwargs) -> SearchResultsItem:
+            return target_item
+
+        options = job.options | overrides
+
+        if isinstance(options.get("mode"), str):
+            options["mode"] = DownloadMode(options["mode"])
+
+        job_store.reopen(job_id)
+        logging.info(
+            f"Resuming download job {job_id} - {len(unfinished_items)}/{len(job.items)} unfinished items"
+        )
+
+        resume_kwargs = dict(
+            search_function=search_function,
+            quality=job.quality,
+            job_store=job_store,
+            job_id=job_id,
+            **options,
+        )
+
+        if job.subject_type == SubjectType.MOVIES:
+            return await self.download_movie(job.title, **resume_kwargs)
+
+        episodes = [(job_item.season, job_item.episode) for job_item in unfinished_items]
+        return await self.download_tv_series(
+            job.title, season=episodes[0][0], episode=episodes[0][1], episodes=episodes, **resume_kwargs
+        )
 
     def download_movie_sync(
         self,
@@ -507,3 +1370,15 @@ class Downloader:
     ]:
         """Synchronously search tv-series by name and proceed to download or stream its episodes."""
         return get_event_loop().run_until_complete(self.download_tv_series(*args, **kwargs))
+
+    def plan_tv_series_sync(self, *args, **kwargs) -> DownloadPlan:
+        """Synchronously search tv-series by name and plan download of its episodes."""
+        return get_event_loop().run_until_complete(self.plan_tv_series(*args, **kwargs))
+
+    def check_availability_sync(self, *args, **kwargs) -> list[ItemAvailability]:
+        """Synchronously check whether files of several movies or tv-series can be downloaded."""
+        return get_event_loop().run_until_complete(self.check_availability(*args, **kwargs))
+
+    def resume_job_sync(self, *args, **kwargs):
+        """Synchronously download unfinished items of a recorded job."""
+        return get_event_loop().run_until_complete(self.resume_job(*args, **kwargs))
@@ -11,6 +11,7 @@ from pydantic import ValidationError
 from throttlebuster import DownloadedFile, DownloadMode
 
 from moviebox_api import __repo__, logger
+from moviebox_api.bandwidth import RateWindow, get_bandwidth_governor, parse_rate
 from moviebox_api.constants import (
     DOWNLOAD_REQUEST_HEADERS,
     ENVIRONMENT_HOST_KEY,
@@ -189,10 +190,55 @@ def process_download_runner_params(params: dict) -> dict:
         dict: Processed parameters
     """
     params["mode"] = DownloadMode.map().get(params.get("mode").lower())
+    configure_bandwidth(params.pop("limit_rate", None), params.pop("rate_schedule", ()))
 
     return params
 
 
+def configure_bandwidth(limit_rate: float | None, rate_schedule: tuple[RateWindow, ...] = ()) -> None:
+    """Sets rate and schedule of the process-wide bandwidth governor
+
+    Args:
+        limit_rate (float | None): Bytes per second outside the schedule windows. None means unlimited.
+        rate_schedule (tuple[RateWindow, ...], optional): Rates for certain times of the day. Defaults to ().
+    """
+    governor = get_bandwidth_governor()
+    governor.rate = limit_rate
+    governor.schedule = rate_schedule
+
+
+def parse_rate_callback(ctx: click.Context, param: click.Parameter, value: str | None) -> float | None:
+    """Converts `--limit-rate` value to bytes per second"""
+    if value is None:
+        return None
+
+    try:
+        return parse_rate(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def parse_size_callback(ctx: click.Context, param: click.Parameter, value: str | None) -> int | None:
+    """Converts human readable size values such as `--max-size` to bytes"""
+    if value is None:
+        return None
+
+    try:
+        return int(parse_rate(value))
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def parse_rate_schedule_callback(
+    ctx: click.Context, param: click.Parameter, value: tuple[str, ...]
+) -> tuple[RateWindow, ...]:
+    """Converts `--rate-schedule` values to rate windows"""
+    try:
+        return tuple(RateWindow.parse(window) for window in value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
 def show_any_help(exception: Exception, exception_msg: str) -> int:
     """Process exception and suggest solution if exists.
 
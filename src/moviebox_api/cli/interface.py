@@ -1,11 +1,17 @@
 """Contains the actual console commands"""
 
+import hashlib
 import logging
 import os
 import sys
+import typing as t
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import click
+import rich
+from rich.table import Table
+from throttlebuster.helpers import get_filesize_string
 
 from moviebox_api import __version__
 from moviebox_api.cli.downloader import Downloader
@@ -18,6 +24,9 @@ from moviebox_api.cli.extras import (
 from moviebox_api.cli.helpers import (
     command_context_settings,
     media_player_name_func_map,
+    parse_rate_callback,
+    parse_rate_schedule_callback,
+    parse_size_callback,
     prepare_start,
     process_download_runner_params,
     show_any_help,
@@ -26,18 +35,24 @@ from moviebox_api.cli.interactive import run_interactive_menu
 from moviebox_api.constants import (
     CURRENT_WORKING_DIR,
     DEFAULT_CHUNK_SIZE,
+    DEFAULT_PROBE_CONCURRENCY,
     DEFAULT_READ_TIMEOUT_ATTEMPTS,
     DEFAULT_TASKS,
     DEFAULT_TASKS_LIMIT,
     DOWNLOAD_PART_EXTENSION,
     DOWNLOAD_QUALITIES,
     DownloadMode,
+    SubjectType,
 )
 from moviebox_api.download import (
     CaptionFileDownloader,
     MediaFileDownloader,
 )
 from moviebox_api.helpers import get_event_loop
+from moviebox_api.jobs import JobStatus, JobStore
+from moviebox_api.library import LibraryIndex
+from moviebox_api.planner import DownloadPlan
+from moviebox_api.ranged import file_object_consumer
 
 __all__ = [
     "download_movie_command",
@@ -47,6 +62,7 @@ __all__ = [
     "popular_search_command",
     "item_details_command",
     "interactive_menu_command",
+    "jobs_command",
 ]
 
 DEBUG = os.getenv("DEBUG", "0") == "1"
@@ -76,6 +92,19 @@ def moviebox():
     default="BEST",
     show_default=True,
 )
+@click.option(
+    "--max-size",
+    "max_file_size",
+    callback=parse_size_callback,
+    default=None,
+    help="Most bytes of a media file e.g 700M, falling back to the nearest fitting quality",
+)
+@click.option(
+    "--max-bitrate",
+    callback=parse_size_callback,
+    default=None,
+    help="Most average bits per second of a media file given its duration e.g 2M",
+)
 @click.option(
     "-d",
     "--dir",
@@ -168,6 +197,48 @@ def moviebox():
     help="Buffer size for merging the separated files in kilobytes [default : CHUNK_SIZE]",
     show_default=True,
 )
+@click.option(
+    "-W",
+    "--merge-free",
+    is_flag=True,
+    help="Write downloaded ranges straight into the final file - no part files and merging",
+)
+@click.option(
+    "-a",
+    "--auto-tasks",
+    is_flag=True,
+    help="Tune number of tasks to the download throughput, remembering it per host (implies --merge-free)",
+)
+@click.option(
+    "--multi-source",
+    is_flag=True,
+    help="Spread the download across file urls from all mirror hosts (implies --merge-free)",
+)
+@click.option(
+    "--checksum",
+    type=click.Choice(sorted(name for name in hashlib.algorithms_guaranteed if not name.startswith("shake"))),
+    default=None,
+    help="Hash downloaded bytes with this algorithm, saving digests in a sidecar (implies --merge-free)",
+)
+@click.option(
+    "--limit-rate",
+    callback=parse_rate_callback,
+    default=None,
+    help="Most bytes per second downloaded in total e.g 500K, 2M [default : unlimited]",
+)
+@click.option(
+    "--rate-schedule",
+    multiple=True,
+    callback=parse_rate_schedule_callback,
+    help="Rate for a time of the day overriding --limit-rate e.g 09:00-17:00=1M or 22:00-06:00=unlimited",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("wb"),
+    default=None,
+    help="Write the movie in order as it downloads to this file or pipe, - for stdout (implies --yes)",
+)
 @click.option(
     "-X",
     "--stream-via",
@@ -214,6 +285,18 @@ def moviebox():
     default=True,
     show_default=True,
 )
+@click.option(
+    "--job/--no-job",
+    help="Record the download in jobs database so that it can be resumed later",
+    default=True,
+    show_default=True,
+)
+@click.option(
+    "--library/--no-library",
+    help="Skip files present in the local library index and index the downloaded ones",
+    default=True,
+    show_default=True,
+)
 @click.option(
     "-O",
     "--caption-only",
@@ -264,9 +347,13 @@ def download_movie_command(
     caption: bool,
     caption_only: bool,
     ignore_missing_caption,
+    multi_source: bool,
+    job: bool,
+    library: bool,
     verbose: int,
     quiet: bool,
     yes: bool,
+    output: t.BinaryIO | None,
     stream_via: bool = False,
     **download_runner_params,
 ):
@@ -274,12 +361,16 @@ def download_movie_command(
 
     prepare_start(quiet, verbose=verbose)
 
+    if output is not None and download_runner_params.get("checksum"):
+        raise click.UsageError("--checksum cannot be used along with --output")
+
     downloader = Downloader()
     get_event_loop().run_until_complete(
         downloader.download_movie(
             title,
             year=year,
-            yes=yes,
+            # Prompts would end up in the output when it's stdout
+            yes=yes or output is not None,
             dir=dir,
             caption_dir=caption_dir,
             quality=quality.upper(),
@@ -290,6 +381,10 @@ def download_movie_command(
             caption_filename_tmpl=caption_filename_tmpl,
             stream_via=stream_via,
             ignore_missing_caption=ignore_missing_caption,
+            multi_source=multi_source,
+            job_store=JobStore() if job else None,
+            library=LibraryIndex() if library else None,
+            stream_to=None if output is None else file_object_consumer(output),
             **process_download_runner_params(download_runner_params),
         )
     )
@@ -337,6 +432,25 @@ def download_movie_command(
     default="BEST",
     show_default=True,
 )
+@click.option(
+    "--max-size",
+    "max_file_size",
+    callback=parse_size_callback,
+    default=None,
+    help="Most bytes of a media file e.g 700M, falling back to the nearest fitting quality",
+)
+@click.option(
+    "--max-bitrate",
+    callback=parse_size_callback,
+    default=None,
+    help="Most average bits per second of a media file given its duration e.g 2M",
+)
+@click.option(
+    "--season-budget",
+    callback=parse_size_callback,
+    default=None,
+    help="Most bytes of all the target episodes together e.g 20G, lowering quality of the biggest first",
+)
 @click.option(
     "-x",
     "--language",
@@ -391,6 +505,20 @@ def download_movie_command(
     default=DEFAULT_TASKS,
     show_default=True,
 )
+@click.option(
+    "-M",
+    "--max-connections",
+    type=click.IntRange(1),
+    help="Connections budget shared by episodes downloaded at once, each using TASKS [default : TASKS]",
+)
+@click.option(
+    "-K",
+    "--prefetch",
+    type=click.IntRange(0),
+    help="Number of upcoming episodes whose metadata and captions are fetched in the background",
+    default=0,
+    show_default=True,
+)
 @click.option(
     "-P",
     "--part-dir",
@@ -440,6 +568,41 @@ def download_movie_command(
     help="Buffer size for merging the separated files in kilobytes [default : CHUNK_SIZE]",
     show_default=True,
 )
+@click.option(
+    "-W",
+    "--merge-free",
+    is_flag=True,
+    help="Write downloaded ranges straight into the final file - no part files and merging",
+)
+@click.option(
+    "-a",
+    "--auto-tasks",
+    is_flag=True,
+    help="Tune number of tasks to the download throughput, remembering it per host (implies --merge-free)",
+)
+@click.option(
+    "--multi-source",
+    is_flag=True,
+    help="Spread the download across file urls from all mirror hosts (implies --merge-free)",
+)
+@click.option(
+    "--checksum",
+    type=click.Choice(sorted(name for name in hashlib.algorithms_guaranteed if not name.startswith("shake"))),
+    default=None,
+    help="Hash downloaded bytes with this algorithm, saving digests in a sidecar (implies --merge-free)",
+)
+@click.option(
+    "--limit-rate",
+    callback=parse_rate_callback,
+    default=None,
+    help="Most bytes per second downloaded in total e.g 500K, 2M [default : unlimited]",
+)
+@click.option(
+    "--rate-schedule",
+    multiple=True,
+    callback=parse_rate_schedule_callback,
+    help="Rate for a time of the day overriding --limit-rate e.g 09:00-17:00=1M or 22:00-06:00=unlimited",
+)
 @click.option(
     "-X",
     "--stream-via",
@@ -486,6 +649,18 @@ def download_movie_command(
     default=True,
     show_default=True,
 )
+@click.option(
+    "--job/--no-job",
+    help="Record the download in jobs database so that it can be resumed later",
+    default=True,
+    show_default=True,
+)
+@click.option(
+    "--library/--no-library",
+    help="Skip files present in the local library index and index the downloaded ones",
+    default=True,
+    show_default=True,
+)
 @click.option(
     "-O",
     "--caption-only",
@@ -498,6 +673,23 @@ def download_movie_command(
     is_flag=True,
     help="When limit is 1 (default), download entire remaining seasons.",
 )
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show sizes and estimated duration of the targeted episodes without downloading them",
+)
+@click.option(
+    "--save-plan",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Save plan of the targeted episodes to this json file instead of downloading (implies --dry-run)",
+)
+@click.option(
+    "--from-plan",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Download episodes of a plan saved with --save-plan. Title and episode options are ignored.",
+)
 @click.option(
     "-S",
     "--simple",
@@ -546,11 +738,19 @@ def download_tv_series_command(
     format: str | None,
     caption_only: bool,
     ignore_missing_caption: bool,
+    multi_source: bool,
+    job: bool,
+    library: bool,
     verbose: int,
     quiet: bool,
     yes: bool,
     stream_via: str | None,
     auto_mode: bool,
+    max_connections: int | None,
+    prefetch: int,
+    dry_run: bool,
+    save_plan: Path | None,
+    from_plan: Path | None,
     **download_runner_params,
 ):
     """Search and download or stream tv series."""
@@ -558,6 +758,32 @@ def download_tv_series_command(
     prepare_start(quiet, verbose=verbose)
 
     downloader = Downloader()
+    download_runner_params = process_download_runner_params(download_runner_params)
+
+    if dry_run or save_plan:
+        plan = downloader.plan_tv_series_sync(
+            title,
+            year=year,
+            season=season,
+            episode=episode,
+            yes=yes,
+            quality=quality.upper(),
+            language=language,
+            download_caption=caption or caption_only,
+            limit=limit,
+            auto_mode=auto_mode,
+            max_file_size=download_runner_params.get("max_file_size"),
+            max_bitrate=download_runner_params.get("max_bitrate"),
+            season_budget=download_runner_params.get("season_budget"),
+            library=LibraryIndex() if library else None,
+        )
+        show_download_plan(plan)
+
+        if save_plan is not None:
+            plan.save(save_plan)
+            click.echo(f"Saved download plan to {save_plan}")
+        return
+
     get_event_loop().run_until_complete(
         downloader.download_tv_series(
             title,
@@ -578,7 +804,52 @@ def download_tv_series_command(
             ignore_missing_caption=ignore_missing_caption,
             auto_mode=auto_mode,
             format=format,
-            **process_download_runner_params(download_runner_params),
+            max_connections=max_connections,
+            prefetch=prefetch,
+            multi_source=multi_source,
+            job_store=JobStore() if job else None,
+            library=LibraryIndex() if library else None,
+            plan=None if from_plan is None else DownloadPlan.load(from_plan),
+            **download_runner_params,
+        )
+    )
+
+
+def show_download_plan(plan: DownloadPlan) -> None:
+    """Prints sizes of a download plan per season and in total"""
+    table = Table(title=f"Download plan - {plan.item.title}", show_lines=True)
+    table.add_column("Season", style="white", justify="center")
+    table.add_column("Episodes", justify="center")
+    table.add_column("Qualities", style="cyan", justify="center")
+    table.add_column("Missing captions", style="yellow", justify="center")
+    table.add_column("Size", style="green", justify="right")
+
+    for season, season_size in plan.season_sizes.items():
+        season_episodes = [planned for planned in plan.episodes if planned.season == season]
+        table.add_row(
+            str(season),
+            str(len(season_episodes)),
+            ", ".join(
+                f"{resolution}P"
+                for resolution in sorted({planned.media_file.resolution for planned in season_episodes})
+            ),
+            str(sum(bool(planned.missing_captions) for planned in season_episodes)),
+            get_filesize_string(season_size),
+        )
+
+    rich.print(table)
+
+    if plan.present_episodes:
+        rich.print(f"Present in library: {len(plan.present_episodes)} episodes")
+
+    estimated_duration = plan.estimated_duration
+    rich.print(
+        f"Total: {len(plan.episodes)} episodes, {get_filesize_string(plan.total_size)}"
+        + (
+            ""
+            if estimated_duration is None
+            else f", about {timedelta(seconds=round(estimated_duration))} "
+            f"at {get_filesize_string(plan.bandwidth)}/s"
         )
     )
 
@@ -590,6 +861,218 @@ def interactive_menu_command():
     run_interactive_menu()
 
 
+@click.command(context_settings=command_context_settings)
+@click.argument("titles", nargs=-1, required=True)
+@click.option(
+    "-t",
+    "--type",
+    "subject_type",
+    type=click.Choice(["movie", "series"]),
+    default="movie",
+    show_default=True,
+    help="Whether the titles are of movies or tv-series",
+)
+@click.option("-y", "--year", type=click.INT, default=0, help="Year filter for the items to proceed with")
+@click.option(
+    "-s", "--season", type=click.IntRange(1, 1000), default=1, show_default=True, help="TV Series season"
+)
+@click.option(
+    "-e",
+    "--episode",
+    type=click.IntRange(1, 1000),
+    default=1,
+    show_default=True,
+    help="Episode offset of the tv-series season",
+)
+@click.option(
+    "-l",
+    "--limit",
+    type=click.IntRange(1, 1000),
+    default=1,
+    show_default=True,
+    help="Total number of episodes to check in the season",
+)
+@click.option(
+    "-A", "--auto-mode", is_flag=True, help="When limit is 1 (default), check entire remaining seasons."
+)
+@click.option(
+    "-q",
+    "--quality",
+    help="Media quality to be checked",
+    type=click.Choice(DOWNLOAD_QUALITIES, case_sensitive=False),
+    default="BEST",
+    show_default=True,
+)
+@click.option(
+    "--max-size",
+    "max_file_size",
+    callback=parse_size_callback,
+    default=None,
+    help="Most bytes of a media file e.g 700M, falling back to the nearest fitting quality",
+)
+@click.option("-x", "--language", help="Caption language filter", multiple=True, default=["English"])
+@click.option("-c", "--caption", is_flag=True, help="Check caption files as well")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(1),
+    default=DEFAULT_PROBE_CONCURRENCY,
+    show_default=True,
+    help="Most file probes made at once",
+)
+@click.option("-J", "--json", is_flag=True, help="Output availability in json format")
+@click.option("-V", "--verbose", count=True, help="Show more detailed interactive texts", default=0)
+@click.option("-Q", "--quiet", is_flag=True, help="Disable showing interactive texts on the progress (logs)")
+@click.help_option("-h", "--help")
+def check_availability_command(
+    titles: tuple[str, ...],
+    subject_type: str,
+    year: int,
+    quality: str,
+    caption: bool,
+    json: bool,
+    verbose: int,
+    quiet: bool,
+    **check_params,
+):
+    """Check whether files of several movies or tv-series episodes can be downloaded, all at once."""
+    prepare_start(quiet, verbose=verbose)
+
+    availability = Downloader().check_availability_sync(
+        titles,
+        subject_type=SubjectType.MOVIES if subject_type == "movie" else SubjectType.TV_SERIES,
+        year=year,
+        quality=quality.upper(),
+        download_caption=caption,
+        **check_params,
+    )
+
+    if json:
+        rich.print_json(data=[item_availability.to_dict() for item_availability in availability], indent=4)
+        return
+
+    table = Table(title="Availability", show_lines=True)
+    table.add_column("Title", style="cyan", justify="left")
+    table.add_column("Episode", justify="center")
+    table.add_column("Quality", justify="center")
+    table.add_column("Media", justify="center")
+    table.add_column("Captions", justify="center")
+
+    for item_availability in availability:
+        for episode_availability in item_availability.episodes:
+            details = episode_availability.to_dict()
+            table.add_row(
+                item_availability.item.title,
+                f"S{details['season']}E{details['episode']}" if details["season"] else "-",
+                f"{details['resolution']}P" if details["resolution"] else "-",
+                "[green]available[/green]"
+                if details["available"]
+                else f"[red]{details['error'] or details['status']}[/red]",
+                ", ".join(
+                    f"{language} {'✓' if reachable else '✗'}"
+                    for language, reachable in details["captions"].items()
+                )
+                or "-",
+            )
+
+    rich.print(table)
+
+
+@click.group()
+@click.help_option("-h", "--help")
+def jobs_command():
+    """List, resume or cancel recorded download jobs."""
+
+
+@jobs_command.command("list", context_settings=command_context_settings)
+@click.option(
+    "-s",
+    "--status",
+    type=click.Choice([status.value for status in JobStatus]),
+    default=None,
+    help="List jobs having this status only",
+)
+@click.option("-J", "--json", is_flag=True, help="Output jobs in json format")
+@click.help_option("-h", "--help")
+def list_jobs_command(status: str | None, json: bool):
+    """List recorded download jobs."""
+    with JobStore() as job_store:
+        jobs = job_store.list_jobs(None if status is None else JobStatus(status))
+
+    if json:
+        rich.print_json(
+            data=[
+                dict(
+                    id=job.id,
+                    title=job.title,
+                    status=job.status,
+                    quality=job.quality,
+                    completed=job.completed_count,
+                    total=len(job.items),
+                    pending=[[item.season, item.episode] for item in job.unfinished_items],
+                )
+                for job in jobs
+            ],
+            indent=4,
+        )
+        return
+
+    table = Table(title="Download jobs", show_lines=True)
+    table.add_column("Id", style="white", justify="center")
+    table.add_column("Title", style="cyan", justify="left")
+    table.add_column("Quality", justify="center")
+    table.add_column("Progress", justify="center")
+    table.add_column("Status", style="yellow", justify="center")
+    table.add_column("Updated", justify="center")
+
+    for job in jobs:
+        table.add_row(
+            str(job.id),
+            job.title,
+            job.quality,
+            f"{job.completed_count}/{len(job.items)}",
+            job.status,
+            datetime.fromtimestamp(job.updated_at).strftime("%Y-%m-%d %H:%M"),
+        )
+
+    rich.print(table)
+
+
+@jobs_command.command("resume", context_settings=command_context_settings)
+@click.argument("job_id", type=click.INT)
+@click.option(
+    "-V",
+    "--verbose",
+    count=True,
+    help="Show more detailed interactive texts",
+    default=0,
+)
+@click.option(
+    "-Q",
+    "--quiet",
+    is_flag=True,
+    help="Disable showing interactive texts on the progress (logs)",
+)
+@click.help_option("-h", "--help")
+def resume_job_command(job_id: int, verbose: int, quiet: bool):
+    """Download unfinished items of a recorded job."""
+    prepare_start(quiet, verbose=verbose)
+
+    with JobStore() as job_store:
+        Downloader().resume_job_sync(job_id, job_store)
+
+
+@jobs_command.command("cancel", context_settings=command_context_settings)
+@click.argument("job_id", type=click.INT)
+@click.help_option("-h", "--help")
+def cancel_job_command(job_id: int):
+    """Cancel a recorded job so that its unfinished items are not downloaded."""
+    with JobStore() as job_store:
+        if not job_store.cancel(job_id):
+            raise click.ClickException(f"There is no unfinished download job with id {job_id}")
+
+    click.echo(f"Cancelled download job {job_id}")
+
+
 def main():
     """Entry point"""
     try:
@@ -602,6 +1085,8 @@ def main():
 
         moviebox.add_command(item_details_command, "item-details")
         moviebox.add_command(interactive_menu_command, "interactive")
+        moviebox.add_command(jobs_command, "jobs")
+        moviebox.add_command(check_availability_command, "check-availability")
 
         return moviebox()
 
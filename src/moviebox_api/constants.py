@@ -98,6 +98,81 @@ ITEM_DETAILS_PATH = "/detail"
 DEFAULT_TASKS = 5
 """Default number of connections for download"""
 
+DEFAULT_SIGNED_URL_EXPIRY_MARGIN = 300
+"""Seconds before expiry of a signed file url when it's considered expired"""
+
+DEFAULT_MIN_STEAL_SIZE = 1_024 * 1_024
+"""Least bytes in each half of a range split for an idle download connection"""
+
+DEFAULT_CHECKSUM_ALGORITHM = "sha256"
+"""Hashlib algorithm for checksums computed while downloading"""
+
+DEFAULT_CHECKSUM_BLOCK_SIZE = 4 * 1_024 * 1_024
+"""Bytes covered by each block digest of a downloaded file"""
+
+DEFAULT_REORDER_BUFFER_SIZE = 32 * 1_024 * 1_024
+"""Most bytes held back by a stream sink while waiting for earlier ranges to arrive"""
+
+DEFAULT_S3_PART_SIZE = 8 * 1_024 * 1_024
+"""Bytes in each part of a multipart upload to object storage"""
+
+S3_MIN_PART_SIZE = 5 * 1_024 * 1_024
+"""Least bytes S3 accepts in every part of a multipart upload except the last one"""
+
+S3_MAX_PARTS = 10_000
+"""Most parts S3 accepts in a multipart upload"""
+
+DEFAULT_METADATA_CONCURRENCY = 8
+"""Most downloadable files metadata requests made at once when planning several episodes"""
+
+DEFAULT_PROBE_CONCURRENCY = 16
+"""Most availability probe requests made at once to file urls"""
+
+DEFAULT_DISK_SPACE_MARGIN = 64 * 1_024**2
+"""Bytes left free on a filesystem besides those reserved by running downloads"""
+
+DEFAULT_DISK_SPACE_POLL_INTERVAL = 1.0
+"""Seconds between free-space checks of downloads waiting to be admitted"""
+
+DEFAULT_SLOW_TASK_RATIO = 0.25
+"""Download connections slower than this fraction of the median throughput are restarted"""
+
+DEFAULT_SLOW_TASK_GRACE = 5.0
+"""Seconds a download connection runs before its throughput is judged"""
+
+DEFAULT_AUTO_TASKS_START = 2
+"""Connections an automatically tuned download starts with for a host not tuned before"""
+
+DEFAULT_AUTO_TASKS_LIMIT = 32
+"""Most connections an automatically tuned download grows to"""
+
+THROTTLING_STATUS_CODES = (429, 503)
+"""Response status codes of servers limiting the number of connections"""
+
+EXPIRED_URL_STATUS_CODES = (403, 410)
+"""Response status codes of requests made with an expired signed file url"""
+
+ENVIRONMENT_DATA_DIR_KEY = "MOVIEBOX_API_DATA_DIR"
+"""User declares directory for persistent data such as tuned tasks using this key"""
+
+DATA_DIR = Path(
+    os.getenv(ENVIRONMENT_DATA_DIR_KEY)
+    or Path(os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share") / "moviebox-api"
+)
+"""Directory for data kept across runs"""
+
+TUNED_TASKS_PATH = DATA_DIR / "tuned_tasks.json"
+"""Json file storing number of download connections tuned for each host"""
+
+JOBS_DATABASE_PATH = DATA_DIR / "jobs.sqlite3"
+"""SQLite database keeping track of download jobs"""
+
+LIBRARY_DATABASE_PATH = DATA_DIR / "library.sqlite3"
+"""SQLite database indexing downloaded media files"""
+
+S3_UPLOADS_DIR = DATA_DIR / "s3_uploads"
+"""Directory recording parts of unfinished multipart uploads to object storage"""
+
 
 class SubjectType(IntEnum):
     """Content types mapped to their integer representatives"""
@@ -6,6 +6,7 @@ Also provides object mapping support to specific extracted item details
 
 import typing as t
 
+from moviebox_api import logger
 from moviebox_api._bases import (
     BaseContentProviderAndHelper,
 )
@@ -17,6 +18,7 @@ from moviebox_api.extractor._core import (
     TagDetailsExtractor,
     TagDetailsExtractorModel,
 )
+from moviebox_api.extractor.helpers import JsonScriptScanner
 from moviebox_api.extractor.models.json import ItemJsonDetailsModel
 from moviebox_api.helpers import (
     assert_instance,
@@ -34,6 +36,7 @@ from moviebox_api.models import (
     SearchResultsModel,
     SuggestedItemsModel,
     TrendingResultsModel,
+    build_model,
 )
 from moviebox_api.requests import Session
 
@@ -76,7 +79,7 @@ class Homepage(BaseContentProviderAndHelper):
     async def get_content_model(self) -> HomepageContentModel:
         """Modelled version of the contents"""
         content = await self.get_content()
-        return HomepageContentModel(**content)
+        return build_model(HomepageContentModel, content, self._session.trusted_responses)
 
 
 class BaseSearch(BaseContentProviderAndHelper):
@@ -198,7 +201,7 @@ class Search(BaseSearch):
             SearchResultsModel: Modelled contents
         """
         contents = await self.get_content()
-        return SearchResultsModel(**contents)
+        return build_model(SearchResultsModel, contents, self.session.trusted_responses)
 
     def next_page(self, content: SearchResultsModel) -> "Search":
         """Navigate to the search results of the next page.
@@ -303,7 +306,7 @@ class Trending(BaseSearch):
             SearchResultsModel: Modelled contents
         """
         contents = await self.get_content()
-        return TrendingResultsModel(**contents)
+        return build_model(TrendingResultsModel, contents, self.session.trusted_responses)
 
     def next_page(self, content: TrendingResultsModel) -> "Trending":
         """Navigate to the search results of the next page.
@@ -421,7 +424,7 @@ class Recommend(BaseSearch):
             SearchResultsModel: Modelled contents
         """
         contents = await self.get_content()
-        return SearchResultsModel(**contents)
+        return build_model(SearchResultsModel, contents, self.session.trusted_responses)
 
     def next_page(self, content: SearchResultsModel) -> "Recommend":
         """Navigate to the search results of the next page.
@@ -509,7 +512,7 @@ class HotMoviesAndTVSeries(BaseSearch):
 
     async def get_content_model(self) -> HotMoviesAndTVSeriesModel:
         contents = await self.get_content()
-        return HotMoviesAndTVSeriesModel(**contents)
+        return build_model(HotMoviesAndTVSeriesModel, contents, self.session.trusted_responses)
 
 
 class PopularSearch(BaseContentProviderAndHelper):
@@ -577,7 +580,7 @@ class SearchSuggestion(BaseContentProviderAndHelper):
             SuggestedItemsModel: Modelled suggested item(s) details
         """
         contents = await self.get_content(reference)
-        return SuggestedItemsModel(**contents)
+        return build_model(SuggestedItemsModel, contents, self.session.trusted_responses)
 
 
 class BaseItemDetails(BaseContentProviderAndHelper):
@@ -586,35 +589,124 @@ class BaseItemDetails(BaseContentProviderAndHelper):
     - Page content is fetched only once throughout the life of the instance
     """
 
-    def __init__(self, page_url: str, session: Session):
+    def __init__(self, page_url: str, session: Session, early_stop: bool = False):
         """Constructor for `BaseItemPageDetails`
 
         Args:
             page_url (str): Url to specific page containing the item details.
             session (Session): MovieboxAPI request session
-        """
+            early_stop (bool, optional): Stop fetching the page once its json-formatted data is received. Defaults to False.
+        """  # noqa: E501
         assert_instance(session, Session, "session")
         self._url = validate_item_page_url(page_url)
         self._session = session
+        self.early_stop = early_stop
+        self.__html_content_bytes: bytes | None = None
+        """Cached raw page contents"""
+        self.__json_html_content_bytes: bytes | None = None
+        """Cached raw page contents up to the end of the json-formatted data"""
         self.__html_content: str | None = None
-        """Cached page contents"""
+        """Cached decoded page contents"""
+        self.__encoding: str = "utf-8"
+        """Encoding of the page contents as declared by the server"""
 
-    async def get_html_content(self) -> str:
-        """The specific page contents
+    async def get_html_content_bytes(self) -> bytes:
+        """The specific page contents as received from the server (not decoded)
 
         Returns:
-            str: html formatted contents of the page
+            bytes: html formatted contents of the page
         """
-        if self.__html_content is not None:
+        if self.__html_content_bytes is not None:
             # Not a good approach for async but it will save alot of seconds & bandwidth
-            return self.__html_content
+            return self.__html_content_bytes
 
         resp = await self._session.get_with_cookies(
             get_absolute_url(self._url),
         )
-        self.__html_content = resp.text
+        self.__encoding = resp.encoding or self.__encoding
+        self.__html_content_bytes = resp.content
+        return self.__html_content_bytes
+
+    async def get_html_content(self) -> str:
+        """The specific page contents
+
+        Returns:
+            str: html formatted contents of the page
+        """
+        if self.__html_content is None:
+            html_content = await self.get_html_content_bytes()
+            self.__html_content = html_content.decode(self.__encoding, errors="replace")
+
         return self.__html_content
 
+    async def get_json_html_content_bytes(self) -> bytes:
+        """The specific page contents up to the end of its json-formatted data (not decoded).
+
+        - The page is streamed and the connection closed as soon as the json-formatted
+          data is received, saving the time and bandwidth of fetching the rest of it.
+        - Whole page contents are returned incase the json-formatted data is not found.
+
+        Returns:
+            bytes: html formatted contents of the page
+        """
+        if self.__html_content_bytes is not None:
+            return self.__html_content_bytes
+
+        if self.__json_html_content_bytes is not None:
+            return self.__json_html_content_bytes
+
+        async with self._session.stream_with_cookies(get_absolute_url(self._url)) as resp:
+            buffer = bytearray()
+            scanner = JsonScriptScanner()
+            location = None
+
+            async for chunk in resp.aiter_bytes():
+                buffer.extend(chunk)
+                location = scanner.scan(buffer)
+
+                if location is not None:
+                    break
+
+            self.__encoding = resp.encoding or self.__encoding
+
+        if location is None:
+            logger.debug(f"Json-formatted data not found while streaming page {self._url}")
+            self.__html_content_bytes = bytes(buffer)
+            return self.__html_content_bytes
+
+        logger.debug(f"Stopped fetching page {self._url} after receiving {len(buffer)} bytes")
+        _, end = location
+        del buffer[end:]
+        buffer.extend(b"</script>")
+        self.__json_html_content_bytes = bytes(buffer)
+        return self.__json_html_content_bytes
+
+    async def get_json_html_content(self) -> str:
+        """The specific page contents up to the end of its json-formatted data.
+
+        - See `self.get_json_html_content_bytes`
+
+        Returns:
+            str: html formatted contents of the page
+        """
+        if self.__html_content is not None:
+            return self.__html_content
+
+        json_html_content = await self.get_json_html_content_bytes()
+        return json_html_content.decode(self.__encoding, errors="replace")
+
+    async def get_json_source_content(self) -> bytes:
+        """Raw page contents to extract json-formatted data from.
+
+        - Streamed up to the end of the json-formatted data only when `self.early_stop` is activated.
+
+        Returns:
+            bytes: html formatted contents of the page
+        """
+        if self.early_stop:
+            return await self.get_json_html_content_bytes()
+        return await self.get_html_content_bytes()
+
     async def get_content(self) -> dict[str, t.Any]:
         """Get extracted item details using `self.get_json_details_extractor`
 
@@ -640,7 +732,7 @@ class BaseItemDetails(BaseContentProviderAndHelper):
 
     async def get_json_details_extractor(self) -> JsonDetailsExtractor:
         """Fetch content and return object that extract details from json-formatted data in the page"""
-        html_contents = await self.get_html_content()
+        html_contents = await self.get_json_source_content()
         return JsonDetailsExtractor(html_contents)
 
     async def get_tag_details_extractor_model(self) -> TagDetailsExtractorModel:
@@ -652,8 +744,8 @@ class BaseItemDetails(BaseContentProviderAndHelper):
         self,
     ) -> JsonDetailsExtractorModel:
         """Fetch content and return object that models extracted details from json-formatted data in the page"""  # noqa: E501
-        html_contents = await self.get_html_content()
-        return JsonDetailsExtractorModel(html_contents)
+        html_contents = await self.get_json_source_content()
+        return JsonDetailsExtractorModel(html_contents, trusted=self._session.trusted_responses)
 
     def get_html_content_sync(self, *args, **kwargs) -> str:
         """Get specific page contents `synchronously`
@@ -663,6 +755,14 @@ class BaseItemDetails(BaseContentProviderAndHelper):
         """
         return get_event_loop().run_until_complete(self.get_html_content(*args, **kwargs))
 
+    def get_json_html_content_sync(self, *args, **kwargs) -> str:
+        """Get specific page contents up to the end of its json-formatted data `synchronously`
+
+        Returns:
+            str: html formatted contents of the page
+        """
+        return get_event_loop().run_until_complete(self.get_json_html_content(*args, **kwargs))
+
     def get_tag_details_extractor_sync(self, *args, **kwargs) -> TagDetailsExtractor:
         """Synchronously fetch content and return object that provide ways to extract details from html tags of the page"""  # noqa: E501
         return get_event_loop().run_until_complete(self.get_tag_details_extractor(*args, **kwargs))
@@ -683,13 +783,14 @@ class BaseItemDetails(BaseContentProviderAndHelper):
 class MovieDetails(BaseItemDetails):
     """Specific movie item details"""
 
-    def __init__(self, url_or_item: str | SearchResultsItem, session: Session):
+    def __init__(self, url_or_item: str | SearchResultsItem, session: Session, early_stop: bool = False):
         """Constructor for `MovieDetails`
 
         Args:
             page_url (str|SearchResultsItem): Url to specific item page or search-results-item.
             session (Session): MovieboxAPI request session
-        """
+            early_stop (bool, optional): Stop fetching the page once its json-formatted data is received. Defaults to False.
+        """  # noqa: E501
         assert_instance(url_or_item, (str, SearchResultsItem), "url_or_item")
 
         if isinstance(url_or_item, SearchResultsItem):
@@ -704,19 +805,20 @@ class MovieDetails(BaseItemDetails):
         else:
             page_url = url_or_item
 
-        super().__init__(page_url=page_url, session=session)
+        super().__init__(page_url=page_url, session=session, early_stop=early_stop)
 
 
 class TVSeriesDetails(BaseItemDetails):
     """Specific tv-series details"""
 
-    def __init__(self, url_or_item: str | SearchResultsItem, session: Session):
+    def __init__(self, url_or_item: str | SearchResultsItem, session: Session, early_stop: bool = False):
         """Constructor for `TVSeriesDetails`
 
         Args:
             url_or_item: (str|SearchResultsItem): Url to specific item page or search-results-item.
             session (Session): MovieboxAPI request session
-        """
+            early_stop (bool, optional): Stop fetching the page once its json-formatted data is received. Defaults to False.
+        """  # noqa: E501
         assert_instance(url_or_item, (str, SearchResultsItem), "url_or_item")
 
         if isinstance(url_or_item, SearchResultsItem):
@@ -731,4 +833,4 @@ class TVSeriesDetails(BaseItemDetails):
         else:
             page_url = url_or_item
 
-        super().__init__(page_url=page_url, session=session)
+        super().__init__(page_url=page_url, session=session, early_stop=early_stop)
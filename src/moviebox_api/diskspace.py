@@ -0,0 +1,245 @@
+"""Free-space checks and admission of downloads.
+
+Before a download opens any connection, the bytes it is yet to write are compared against
+the free space of each filesystem it writes to - the final file, plus the part files when
+they get merged since both exist until the merge completes. Bytes claimed by running
+downloads are reserved on a process-wide ledger so that downloads started at once do not
+count the same free space twice. Reservations shrink as their files grow on disk and are
+released once the downloads end, letting queued downloads waiting for space in.
+"""
+
+import asyncio
+import contextlib
+import glob
+import itertools
+import os
+import shutil
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from throttlebuster.helpers import get_filesize_string
+
+from moviebox_api import logger
+from moviebox_api.constants import DEFAULT_DISK_SPACE_MARGIN, DEFAULT_DISK_SPACE_POLL_INTERVAL
+from moviebox_api.exceptions import InsufficientDiskSpaceError
+
+__all__ = [
+    "DiskSpaceLedger",
+    "SpaceNeed",
+    "allocated_size",
+    "free_space",
+    "get_disk_space_ledger",
+]
+
+
+def existing_ancestor(path: Path | str) -> Path:
+    """Path itself or its nearest parent that exists already"""
+    path = Path(path).absolute()
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return path
+
+
+def free_space(path: Path | str) -> int:
+    """Free bytes of the filesystem holding path, which may not exist yet"""
+    return shutil.disk_usage(existing_ancestor(path)).free
+
+
+def filesystem_id(path: Path | str) -> int:
+    """Device number of the filesystem holding path, which may not exist yet"""
+    return os.stat(existing_ancestor(path)).st_dev
+
+
+def allocated_size(path: Path | str) -> int:
+    """Bytes a file occupies on disk, including preallocated ones. 0 when it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 0
+
+    blocks = getattr(stat, "st_blocks", None)
+    # Sparse files occupy less than their size. Windows lacks st_blocks.
+    return stat.st_size if blocks is None else blocks * 512
+
+
+@dataclass(frozen=True)
+class SpaceNeed:
+    """Bytes a download writes under a directory"""
+
+    directory: Path
+    size: int
+    pattern: str | None = None
+    """Glob of the files in directory holding those bytes. Bytes they occupy are not needed anymore."""
+
+    def written(self) -> int:
+        """Bytes the matching files occupy on disk already"""
+        if self.pattern is None or not self.directory.exists():
+            return 0
+        return sum(allocated_size(path) for path in self.directory.glob(self.pattern))
+
+    def outstanding(self) -> int:
+        """Bytes still to be written"""
+        return max(0, self.size - self.written())
+
+    @classmethod
+    def for_file(cls, path: Path | str, size: int) -> "SpaceNeed":
+        """Need of a file written in place e.g preallocated or resumed"""
+        path = Path(path)
+        return cls(path.parent, size, glob.escape(path.name))
+
+
+class DiskSpaceLedger:
+    """Bytes reserved by running downloads on each filesystem.
+
+    For instance:
+
+    ```python
+    ledger = get_disk_space_ledger()
+    async with ledger.reservation([SpaceNeed.for_file("Merlin S1E1.mp4", media_file.size)], wait=True):
+        ...  # download
+    ```
+    """
+
+    def __init__(
+        self,
+        margin: int = DEFAULT_DISK_SPACE_MARGIN,
+        poll_interval: float = DEFAULT_DISK_SPACE_POLL_INTERVAL,
+    ):
+        """Constructor for `DiskSpaceLedger`
+
+        Args:
+            margin (int, optional): Bytes left free on every filesystem. Defaults to DEFAULT_DISK_SPACE_MARGIN.
+            poll_interval (float, optional): Seconds between checks while waiting for space. Defaults to DEFAULT_DISK_SPACE_POLL_INTERVAL.
+        """  # noqa: E501
+        assert margin >= 0, f"Value for margin should be atleast 0 not {margin}"
+        self.margin = margin
+        self.poll_interval = poll_interval
+        self._reservations: dict[int, tuple[SpaceNeed, ...]] = {}
+        self._ids = itertools.count()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} margin={self.margin} "
+            f"reservations={len(self._reservations)}>"
+        )
+
+    def reserved(self, directory: Path | str) -> int:
+        """Bytes running downloads are yet to write to the filesystem holding directory"""
+        filesystem = filesystem_id(directory)
+        return sum(
+            need.outstanding()
+            for needs in self._reservations.values()
+            for need in needs
+            if filesystem_id(need.directory) == filesystem
+        )
+
+    def _is_reserved(self, directory: Path | str) -> bool:
+        filesystem = filesystem_id(directory)
+        return any(
+            filesystem_id(need.directory) == filesystem
+            for needs in self._reservations.values()
+            for need in needs
+        )
+
+    def available(self, directory: Path | str) -> int:
+        """Free bytes of the filesystem holding directory not reserved by running downloads"""
+        return free_space(directory) - self.reserved(directory) - self.margin
+
+    def _group(self, needs: t.Iterable[SpaceNeed]) -> dict[int, tuple[Path, int]]:
+        grouped: dict[int, tuple[Path, int]] = {}
+        for need in needs:
+            filesystem = filesystem_id(need.directory)
+            directory, required = grouped.get(filesystem, (need.directory, 0))
+            grouped[filesystem] = (directory, required + need.outstanding())
+        return grouped
+
+    def shortfall(self, needs: t.Iterable[SpaceNeed]) -> InsufficientDiskSpaceError | None:
+        """Error describing the first filesystem lacking space for the needs. None when all have it."""
+        for directory, required in self._group(needs).values():
+            if not required:
+                continue
+
+            available = self.available(directory)
+            if required > available:
+                return InsufficientDiskSpaceError(
+                    directory,
+                    required,
+                    available,
+                    f'Download needs {get_filesize_string(required)} in "{directory}" but only '
+                    f"{get_filesize_string(max(available, 0))} is available",
+                )
+
+    def reserve(self, needs: t.Iterable[SpaceNeed]) -> int:
+        """Reserves space for the needs right away.
+
+        Raises:
+            InsufficientDiskSpaceError: Incase any of the filesystems lacks the space.
+
+        Returns:
+            int: Reservation id for `release`.
+        """
+        needs = tuple(needs)
+        error = self.shortfall(needs)
+        if error is not None:
+            raise error
+
+        reservation_id = next(self._ids)
+        self._reservations[reservation_id] = needs
+        return reservation_id
+
+    async def wait(self, needs: t.Iterable[SpaceNeed], timeout: float | None = None) -> None:
+        """Waits until the filesystems have space for the needs.
+
+        Raises:
+            InsufficientDiskSpaceError: Incase space is lacking while no running download holds
+                a reservation that could free it up, or timeout elapses.
+        """
+        needs = tuple(needs)
+        started_at = time.monotonic()
+        logged = False
+
+        while (error := self.shortfall(needs)) is not None:
+            if not self._is_reserved(error.path) or (
+                timeout is not None and time.monotonic() - started_at >= timeout
+            ):
+                raise error
+
+            if not logged:
+                logger.info(f"{error.args[0]}. Waiting for running downloads to complete.")
+                logged = True
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def acquire(self, needs: t.Iterable[SpaceNeed], wait: bool = False) -> int:
+        """Reserves space for the needs, waiting for running downloads to release theirs if wait.
+
+        Returns:
+            int: Reservation id for `release`.
+        """
+        needs = tuple(needs)
+        if wait:
+            await self.wait(needs)
+        return self.reserve(needs)
+
+    def release(self, reservation_id: int) -> None:
+        """Releases space reserved with `reserve` or `acquire`"""
+        self._reservations.pop(reservation_id, None)
+
+    @contextlib.asynccontextmanager
+    async def reservation(self, needs: t.Iterable[SpaceNeed], wait: bool = False) -> t.AsyncIterator[int]:
+        """Holds space for the needs for the duration of the context"""
+        reservation_id = await self.acquire(needs, wait=wait)
+        try:
+            yield reservation_id
+        finally:
+            self.release(reservation_id)
+
+
+_disk_space_ledger = DiskSpaceLedger()
+
+
+def get_disk_space_ledger() -> DiskSpaceLedger:
+    """Process-wide ledger used by downloads unless told otherwise"""
+    return _disk_space_ledger
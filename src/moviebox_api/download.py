@@ -2,39 +2,60 @@
 and later performing the actual download as well
 """
 
+import asyncio
+import glob
+import os
+import time
+import typing as t
 from pathlib import Path
 
 import httpx
 from throttlebuster import DownloadedFile, ThrottleBuster
 from throttlebuster.helpers import get_filesize_string, sanitize_filename
 
+from moviebox_api import logger
 from moviebox_api._bases import (
     BaseContentProviderAndHelper,
     BaseFileDownloaderAndHelper,
 )
+from moviebox_api.bandwidth import BandwidthShare, governed_client_kwargs
 from moviebox_api.constants import (
     CURRENT_WORKING_DIR,
     DEFAULT_CHUNK_SIZE,
     DEFAULT_READ_TIMEOUT_ATTEMPTS,
+    DEFAULT_REORDER_BUFFER_SIZE,
     DEFAULT_TASKS,
     DOWNLOAD_PART_EXTENSION,
     DOWNLOAD_QUALITIES,
     DOWNLOAD_REQUEST_HEADERS,
+    HOST_PROTOCOL,
+    MIRROR_HOSTS,
+    SELECTED_HOST,
     DownloadMode,
     DownloadQualitiesType,
     SubjectType,
 )
+from moviebox_api.diskspace import SpaceNeed, filesystem_id, get_disk_space_ledger
+from moviebox_api.exceptions import MediaFileChangedError
 from moviebox_api.extractor.models.json import (
     ItemJsonDetailsModel,
     PostListItemSubjectModel,
 )
-from moviebox_api.helpers import assert_instance, get_absolute_url
+from moviebox_api.helpers import (
+    assert_instance,
+    get_absolute_url,
+    run_alongside,
+    write_file_atomically,
+)
 from moviebox_api.models import (
     CaptionFileMetadata,
     DownloadableFilesMetadata,
     MediaFileMetadata,
     SearchResultsItem,
+    build_model,
 )
+from moviebox_api.quality import QualityPolicy
+from moviebox_api.ranged import BaseSink, OrderedStreamSink, RefreshableUrl, download_merge_free
 from moviebox_api.requests import Session
 
 __all__ = [
@@ -47,22 +68,28 @@ __all__ = [
 
 
 def resolve_media_file_to_be_downloaded(
-    quality: DownloadQualitiesType,
+    quality: DownloadQualitiesType | QualityPolicy,
     downloadable_metadata: DownloadableFilesMetadata,
+    duration: int | None = None,
 ) -> MediaFileMetadata:
     """Gets media-file-metadata that matches the target quality
 
     Args:
-        quality (DownloadQualitiesType): Target media quality such
+        quality (DownloadQualitiesType | QualityPolicy): Target media quality such as `720P` or a policy choosing it.
         downloadable_metadata (DownloadableFilesMetadata): Downloadable files metadata
+        duration (int | None, optional): Seconds the item lasts, for the bitrate limit of a policy. Defaults to None.
 
     Raises:
         RuntimeError: Incase no media file matched the target quality
         ValueError: Unexpected target media quality
+        QualityUnavailableError: Incase no media file satisfies the quality policy
 
     Returns:
         MediaFileMetadata: Media file details matching the target media quality
-    """
+    """  # noqa: E501
+    if isinstance(quality, QualityPolicy):
+        return quality.select(downloadable_metadata, duration)
+
     match quality:
         case "BEST":
             target_metadata = downloadable_metadata.best_media_file
@@ -76,7 +103,7 @@ def resolve_media_file_to_be_downloaded(
                 if target_metadata is None:
                     raise RuntimeError(
                         f"Media file for quality {quality} does not exists. "
-                        f"Try other qualities from {target_metadata.keys()}"
+                        f"Try other qualities from {list(quality_downloads_map.keys())}"
                     )
             else:
                 raise ValueError(
@@ -152,7 +179,87 @@ class BaseDownloadableFilesDetail(BaseContentProviderAndHelper):
             DownloadableFilesMetadata: Modelled file details
         """
         contents = await self.get_content(season, episode)
-        return DownloadableFilesMetadata(**contents)
+        return build_model(DownloadableFilesMetadata, contents, self.session.trusted_responses)
+
+    @staticmethod
+    def _match_media_file(
+        downloadable_metadata: DownloadableFilesMetadata, media_file: MediaFileMetadata
+    ) -> MediaFileMetadata:
+        fresh_media_file = downloadable_metadata.resolution_media_file_map.get(media_file.resolution)
+
+        if fresh_media_file is None or fresh_media_file.size != media_file.size:
+            raise MediaFileChangedError(
+                media_file,
+                f"Media file of resolution {media_file.resolution}p and size {media_file.size} "
+                "is no longer available",
+            )
+        return fresh_media_file
+
+    async def get_media_file_afresh(
+        self, media_file: MediaFileMetadata, season: int, episode: int
+    ) -> MediaFileMetadata:
+        """Fetches the media file again, e.g for a fresh signed url after the previous one expired.
+
+        Args:
+            media_file (MediaFileMetadata): Media file fetched earlier.
+            season (int): Season number of the series.
+            episode (int): Episode number of the series.
+
+        Raises:
+            MediaFileChangedError: Incase no media file has the same resolution and size
+
+        Returns:
+            MediaFileMetadata: Same media file with a fresh url
+        """
+        return self._match_media_file(await self.get_content_model(season, episode), media_file)
+
+    async def _get_mirror_media_file(
+        self, host: str, media_file: MediaFileMetadata, season: int, episode: int
+    ) -> MediaFileMetadata:
+        host_url = f"{HOST_PROTOCOL}://{host}"
+        contents = await self.session.get_with_cookies_from_api(
+            url=host_url + "/wefeed-h5-bff/web/subject/download",
+            params=self._create_request_params(season, episode),
+            headers={"Host": host, "Referer": f"{host_url}/movies/{self._item.detailPath}"},
+        )
+        metadata = build_model(DownloadableFilesMetadata, contents, self.session.trusted_responses)
+        return self._match_media_file(metadata, media_file)
+
+    async def get_mirror_media_files(
+        self,
+        media_file: MediaFileMetadata,
+        season: int = 0,
+        episode: int = 0,
+        hosts: tuple[str, ...] = MIRROR_HOSTS,
+    ) -> list[MediaFileMetadata]:
+        """Fetches the same media file through other mirror hosts, whose urls may point at other CDN hosts.
+
+        - Hosts failing or lacking the media file are skipped.
+
+        Args:
+            media_file (MediaFileMetadata): Media file fetched earlier.
+            season (int, optional): Season number of the series. Defaults to 0.
+            episode (int, optional): Episode number of the series. Defaults to 0.
+            hosts (tuple[str, ...], optional): Mirror hosts to query. Defaults to MIRROR_HOSTS.
+
+        Returns:
+            list[MediaFileMetadata]: Equivalent media files with urls other than that of media_file
+        """
+        hosts = [host for host in hosts if host != SELECTED_HOST]
+        results = await asyncio.gather(
+            *(self._get_mirror_media_file(host, media_file, season, episode) for host in hosts),
+            return_exceptions=True,
+        )
+        mirror_media_files: dict[str, MediaFileMetadata] = {}
+
+        for host, result in zip(hosts, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Skipping mirror host {host} - {result!r}")
+
+            elif str(result.url) != str(media_file.url):
+                mirror_media_files.setdefault(str(result.url), result)
+
+        return list(mirror_media_files.values())
 
 
 class DownloadableMovieFilesDetail(BaseDownloadableFilesDetail):
@@ -165,7 +272,13 @@ class DownloadableMovieFilesDetail(BaseDownloadableFilesDetail):
     async def get_content_model(self) -> DownloadableFilesMetadata:
         """Modelled version of the files detail"""
         contents = await self.get_content()
-        return DownloadableFilesMetadata(**contents)
+        return build_model(DownloadableFilesMetadata, contents, self.session.trusted_responses)
+
+    async def get_media_file_afresh(
+        self, media_file: MediaFileMetadata, season: int = 0, episode: int = 0
+    ) -> MediaFileMetadata:
+        """Fetches the movie file again, e.g for a fresh signed url after the previous one expired"""
+        return self._match_media_file(await self.get_content_model(), media_file)
 
 
 class DownloadableTVSeriesFilesDetail(BaseDownloadableFilesDetail):
@@ -205,6 +318,7 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
         part_extension: str = DOWNLOAD_PART_EXTENSION,
         merge_buffer_size: int | None = None,
         group_series: bool = False,
+        bandwidth_share: BandwidthShare | None = None,
         **httpx_kwargs,
     ):
         """Constructor for `MediaFileDownloader`
@@ -217,12 +331,14 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
             part_extension (str, optional): Filename extension for download parts. Defaults to DOWNLOAD_PART_EXTENSION.
             merge_buffer_size (int|None, optional). Buffer size for merging the separated files in kilobytes. Defaults to chunk_size.
             group_series(bool, optional): Create directory for a series & group episodes based on season number. Defaults to False.
+            bandwidth_share (BandwidthShare | None, optional): Weight and priority of downloads on the process-wide bandwidth. Defaults to None (weight 1).
 
         httpx_kwargs : Keyword arguments for `httpx.AsyncClient`
         """  # noqa: E501
 
         httpx_kwargs.setdefault("cookies", self.request_cookies)
         self.group_series = group_series
+        self.bandwidth_share = bandwidth_share or BandwidthShare()
 
         self.throttle_buster = ThrottleBuster(
             dir=dir,
@@ -232,7 +348,7 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
             part_extension=part_extension,
             merge_buffer_size=merge_buffer_size,
             request_headers=self.request_headers,
-            **httpx_kwargs,
+            **governed_client_kwargs(httpx_kwargs, self.bandwidth_share),
         )
 
     def generate_filename(
@@ -242,6 +358,7 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
         season: int = 0,
         episode: int = 0,
         test: bool = False,
+        filename_template: str | None = None,
     ) -> tuple[str, Path]:
         """Generates filename in the format as in `self.*filename_template` and updates
         final directory for saving contents
@@ -251,6 +368,7 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
             media_file (MediaFileMetadata): Movie/tv-series/music to be downloaded.
             season (int): Season number of the series.
             episde (int): Episode number of the series.
+            filename_template (str | None, optional): Overrides `self.*filename_template`. Defaults to None.
 
         """
         assert_instance(
@@ -272,11 +390,12 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
             episode=episode,
         )
 
-        filename_template: str = (
-            self.series_filename_template
-            if search_results_item.subjectType == SubjectType.TV_SERIES
-            else self.movie_filename_template
-        )
+        if filename_template is None:
+            filename_template = (
+                self.series_filename_template
+                if search_results_item.subjectType == SubjectType.TV_SERIES
+                else self.movie_filename_template
+            )
 
         final_dir = self.create_final_dir(
             working_dir=self.throttle_buster.dir,
@@ -289,6 +408,44 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
 
         return filename_template.format(**placeholders), final_dir
 
+    def space_needs(
+        self, size: int, filename: str, dir: Path | str | None = None, merge_free: bool = False
+    ) -> list[SpaceNeed]:
+        """Disk space downloading a file takes.
+
+        Part files and the file they get merged into exist at once until the merge completes.
+        A single part is moved instead, taking no extra space within the same filesystem.
+
+        Args:
+            size (int): Size of the file in bytes.
+            filename (str): Filename for the downloaded content.
+            dir (Path | str | None, optional): Directory for saving the file to. Defaults to None (self.throttle_buster.dir).
+            merge_free (bool, optional): Whether ranges are written straight into the final file. Defaults to False.
+
+        Returns:
+            list[SpaceNeed]: Bytes to be written under each directory. Empty when the file is complete already.
+        """  # noqa: E501
+        filename = sanitize_filename(filename)
+        saved_to = Path(dir or self.throttle_buster.dir).joinpath(filename)
+
+        final_need = SpaceNeed.for_file(saved_to, size)
+        if merge_free:
+            # Preallocated and resumed in place
+            return [final_need]
+
+        if saved_to.is_file() and os.path.getsize(saved_to) == size:
+            # Completed already hence left as it is
+            return []
+
+        part_dir = self.throttle_buster.part_dir
+        part_need = SpaceNeed(
+            part_dir, size, f"{glob.escape(filename)}-*{glob.escape(self.throttle_buster.part_extension)}"
+        )
+
+        if self.throttle_buster.tasks == 1 and filesystem_id(part_dir) == filesystem_id(saved_to.parent):
+            return [part_need]
+        return [part_need, final_need]
+
     async def run(
         self,
         media_file: MediaFileMetadata,
@@ -304,6 +461,14 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
         test: bool = False,
         leave: bool = True,
         ascii: bool = False,
+        merge_free: bool = False,
+        auto_tasks: bool = False,
+        refresh_from: BaseDownloadableFilesDetail | None = None,
+        checksum: str | None = None,
+        mirror_files: list[MediaFileMetadata] | None = None,
+        sink: BaseSink | None = None,
+        check_disk_space: bool = True,
+        wait_for_space: bool = False,
         **filename_kwargs,
     ) -> DownloadedFile | httpx.Response:
         """Performs the actual download.
@@ -322,8 +487,16 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
             simple (bool, optional): Show percentage and bar only in progressbar. Deafults to False.
             test (bool, optional): Just test if download is possible but do not actually download. Defaults to False.
             ascii (bool, optional): Use unicode (smooth blocks) to fill the progress-bar meter. Defaults to False.
+            merge_free (bool, optional): Write each range straight into the final file instead of part files that get merged. Defaults to False.
+            auto_tasks (bool, optional): Tune number of connections to the throughput instead of using `tasks`. Implies merge_free. Defaults to False.
+            refresh_from (BaseDownloadableFilesDetail | None, optional): Fetch fresh url of the media file from it once the signed one expires. Defaults to None.
+            checksum (str | None, optional): Hashlib algorithm for checksums computed while downloading, saved in a sidecar. Also verifies size of the file against that of media_file. Implies merge_free. Defaults to None.
+            mirror_files (list[MediaFileMetadata] | None, optional): Same media file from other sources e.g `get_mirror_media_files`. Ranges are spread across all of them. Implies merge_free. Defaults to None.
+            sink (BaseSink | None, optional): Write downloaded bytes to it e.g `OrderedStreamSink` instead of a file under dir. Implies merge_free. Defaults to None.
+            check_disk_space (bool, optional): Reserve disk space for the file before starting, raising `InsufficientDiskSpaceError` when it's lacking. Defaults to True.
+            wait_for_space (bool, optional): Wait for running downloads to release their disk space instead of raising. Defaults to False.
 
-        filename_kwargs: Keyworded arguments for generating filename incase instance of filename is SearchResultsItem.
+        filename_kwargs: Keyworded arguments for generating filename incase instance of filename is SearchResultsItem e.g `filename_template`.
 
         Returns:
             DownloadedFile | httpx.Response: Downloaded file details or httpx stream response (test).
@@ -331,6 +504,9 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
 
         assert_instance(media_file, MediaFileMetadata, "media_file")
 
+        if sink is not None and checksum:
+            raise ValueError("Checksums are saved alongside downloaded files hence can't be used with a sink")
+
         dir = None
 
         if isinstance(filename, SearchResultsItem):
@@ -344,14 +520,28 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
                 "when group_series is activated"
             )
 
-        return await self.throttle_buster.run(
-            url=str(media_file.url),
+        url_refresher = None
+
+        if refresh_from is not None:
+            assert_instance(refresh_from, BaseDownloadableFilesDetail, "refresh_from")
+
+            async def url_refresher() -> str:
+                fresh_media_file = await refresh_from.get_media_file_afresh(
+                    media_file,
+                    season=filename_kwargs.get("season", 0),
+                    episode=filename_kwargs.get("episode", 0),
+                )
+                return str(fresh_media_file.url)
+
+        url = RefreshableUrl(str(media_file.url), url_refresher)
+
+        run_kwargs = dict(
+            url=url.url,
             filename=filename,
             progress_hook=progress_hook,
             mode=mode,
             disable_progress_bar=disable_progress_bar,
             file_size=file_size,
-            keep_parts=keep_parts,
             timeout_retry_attempts=timeout_retry_attempts,
             colour=colour,
             simple=simple,
@@ -361,12 +551,92 @@ class MediaFileDownloader(BaseFileDownloaderAndHelper):
             dir=dir,
         )
 
+        merge_free = bool(merge_free or auto_tasks or checksum or mirror_files or sink is not None)
+        space_needs = (
+            self.space_needs(media_file.size, filename, dir, merge_free)
+            if check_disk_space and sink is None and not test and media_file.size
+            else []
+        )
+
+        async with get_disk_space_ledger().reservation(space_needs, wait=wait_for_space):
+            if merge_free:
+                # Bytes can only be hashed as they are written when there are no part files to merge
+                return await download_merge_free(
+                    self.throttle_buster,
+                    auto_tasks=auto_tasks,
+                    url_refresher=url_refresher,
+                    checksum=checksum,
+                    expected_size=media_file.size if checksum else None,
+                    mirror_urls=[str(mirror_file.url) for mirror_file in mirror_files or ()],
+                    sink=sink,
+                    **run_kwargs,
+                )
+
+            # ThrottleBuster cannot switch urls mid-download, so it's only renewed upfront
+            run_kwargs["url"] = await url.get()
+            return await self.throttle_buster.run(keep_parts=keep_parts, **run_kwargs)
+
+    async def stream(
+        self,
+        media_file: MediaFileMetadata,
+        filename: str | SearchResultsItem,
+        buffer_size: int = DEFAULT_REORDER_BUFFER_SIZE,
+        **run_kwargs,
+    ) -> t.AsyncIterator[bytes]:
+        """Downloads the media file yielding its bytes in order as they arrive, without saving it.
+
+        For instance:
+
+        ```python
+        async for chunk in media_file_downloader.stream(media_file, "movie.mp4"):
+            process.stdin.write(chunk)
+        ```
+
+        Args:
+            media_file (MediaFileMetadata): Movie/tv-series/music to be downloaded.
+            filename (str | SearchResultsItem): Name of the content shown in progress and logs.
+            buffer_size (int, optional): Most bytes held back for reordering. Defaults to DEFAULT_REORDER_BUFFER_SIZE.
+
+        run_kwargs: Other keyword arguments for `MediaFileDownloader.run`
+
+        Yields:
+            bytes: Next bytes of the media file
+        """  # noqa: E501
+        chunks: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        sink = OrderedStreamSink(chunks.put, buffer_size)
+        download = asyncio.ensure_future(self.run(media_file, filename, sink=sink, **run_kwargs))
+        getter = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({getter, download}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                    continue
+
+                getter.cancel()
+                # Every byte is queued before the download completes
+                while not chunks.empty():
+                    yield chunks.get_nowait()
+
+                download.result()
+                return
+
+        finally:
+            download.cancel()
+            if getter is not None:
+                getter.cancel()
+
 
 class CaptionFileDownloader(BaseFileDownloaderAndHelper):
     """Creates a local copy of a remote subtitle/caption file"""
 
     request_headers = DOWNLOAD_REQUEST_HEADERS
     request_cookies = {}
+    in_memory_size_limit = 5 * 1_024 * 1_024
+    """Caption files not bigger than this (bytes) are downloaded in memory by `run_many`"""
+    unsupported_run_options = ("checksum", "check_disk_space", "wait_for_space")
+    """Options of `MediaFileDownloader.run` rejected since captions are too small to be worth them"""
     movie_filename_template = "{title} ({release_year}).{lan}.{ext}"
     series_filename_template = "{title} S{season}E{episode}.{lan}.{ext}"
     possible_filename_placeholders = (
@@ -392,6 +662,7 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
         part_extension: str = DOWNLOAD_PART_EXTENSION,
         merge_buffer_size: int | None = None,
         group_series: bool = False,
+        bandwidth_share: BandwidthShare | None = None,
         **httpx_kwargs,
     ):
         """Constructor for `CaptionFileDownloader`
@@ -403,12 +674,14 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
             part_extension (str, optional): Filename extension for download parts. Defaults to DOWNLOAD_PART_EXTENSION.
             merge_buffer_size (int|None, optional). Buffer size for merging the separated files in kilobytes. Defaults to chunk_size.
             group_series(bool, optional): Create directory for a series & group episodes based on season number. Defaults to False.
+            bandwidth_share (BandwidthShare | None, optional): Weight and priority of downloads on the process-wide bandwidth. Defaults to None (weight 1).
 
         httpx_kwargs : Keyword arguments for `httpx.AsyncClient`
         """  # noqa: E501
 
         httpx_kwargs.setdefault("cookies", self.request_cookies)
         self.group_series = group_series
+        self.bandwidth_share = bandwidth_share or BandwidthShare()
 
         self.throttle_buster = ThrottleBuster(
             dir=dir,
@@ -418,7 +691,7 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
             part_extension=part_extension,
             merge_buffer_size=merge_buffer_size,
             request_headers=self.request_headers,
-            **httpx_kwargs,
+            **governed_client_kwargs(httpx_kwargs, self.bandwidth_share),
         )
 
     def generate_filename(
@@ -428,6 +701,7 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
         season: int = 0,
         episode: int = 0,
         test: bool = False,
+        filename_template: str | None = None,
         **kwargs,
     ) -> tuple[str, Path]:
         """Generates filename in the format as in `self.*filename_template`
@@ -438,6 +712,7 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
             season (int): Season number of the series.
             episde (int): Episode number of the series.
             test (bool, optional): whether to create final directory
+            filename_template (str | None, optional): Overrides `self.*filename_template`. Defaults to None.
 
         Kwargs: Nothing much folk.
                 It's just here so that `MediaFileDownloader.run` and `CaptionFileDownloader.run`
@@ -462,11 +737,12 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
             episode=episode,
         )
 
-        filename_template: str = (
-            self.series_filename_template
-            if search_results_item.subjectType == SubjectType.TV_SERIES
-            else self.movie_filename_template
-        )
+        if filename_template is None:
+            filename_template = (
+                self.series_filename_template
+                if search_results_item.subjectType == SubjectType.TV_SERIES
+                else self.movie_filename_template
+            )
 
         final_dir = self.create_final_dir(
             working_dir=self.throttle_buster.dir,
@@ -479,12 +755,18 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
 
         return sanitize_filename(filename_template.format(**placeholders)), final_dir
 
+    def _reject_unsupported_run_options(self, run_kwargs: dict[str, t.Any]) -> None:
+        unsupported = [key for key in self.unsupported_run_options if key in run_kwargs]
+        if unsupported:
+            raise ValueError(f"Caption file downloads do not support {', '.join(unsupported)}")
+
     async def run(
         self,
         caption_file: CaptionFileMetadata,
         filename: str | SearchResultsItem,
         season: int = 0,
         episode: int = 0,
+        filename_template: str | None = None,
         **run_kwargs,
     ) -> DownloadedFile | httpx.Response:
         """Performs the actual download, incase already downloaded then return its Path.
@@ -494,14 +776,17 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
             filename (str|SearchResultsItem): Movie filename
             season (int): Season number of the series. Defaults to 0.
             episde (int): Episode number of the series. Defaults to 0.
+            filename_template (str | None, optional): Template for generating filename instead of `self.*filename_template`. Defaults to None.
 
-        run_kwargs: Keyword arguments for `ThrottleBuster.run`
+        run_kwargs: Keyword arguments for `ThrottleBuster.run`. Pass `merge_free=True` to write ranges straight into the final file,
+            `auto_tasks=True` to also tune number of connections to the throughput and `sink` e.g `S3MultipartSink` to write elsewhere.
 
         Returns:
             Path | httpx.Response: Path where the caption file has been saved to or httpx Response (test).
-        """
+        """  # noqa: E501
 
         assert_instance(caption_file, CaptionFileMetadata, "caption_file")
+        self._reject_unsupported_run_options(run_kwargs)
 
         dir = None
 
@@ -513,7 +798,144 @@ class CaptionFileDownloader(BaseFileDownloaderAndHelper):
                 season=season,
                 episode=episode,
                 test=run_kwargs.get("test", False),
+                filename_template=filename_template,
+            )
+
+        merge_free = run_kwargs.pop("merge_free", False)
+        if merge_free or run_kwargs.get("auto_tasks") or run_kwargs.get("sink") is not None:
+            run_kwargs.pop("keep_parts", None)
+            return await download_merge_free(
+                self.throttle_buster, url=str(caption_file.url), filename=filename, dir=dir, **run_kwargs
             )
+
+        run_kwargs.pop("auto_tasks", None)
         return await self.throttle_buster.run(
             url=str(caption_file.url), filename=filename, dir=dir, **run_kwargs
         )
+
+    async def run_in_memory(
+        self,
+        caption_file: CaptionFileMetadata,
+        filename: str | SearchResultsItem,
+        season: int = 0,
+        episode: int = 0,
+        mode: DownloadMode = DownloadMode.AUTO,
+        test: bool = False,
+        filename_template: str | None = None,
+        **run_kwargs,
+    ) -> DownloadedFile | httpx.Response:
+        """Downloads the whole caption file in a single request and saves it atomically from memory.
+
+        - Skips the part files, tasks and merging of `run` which only slow down tiny files.
+
+        Args:
+            caption_file (CaptionFileMetadata): Movie/tv-series/music caption file details.
+            filename (str|SearchResultsItem): Movie filename
+            season (int): Season number of the series. Defaults to 0.
+            episde (int): Episode number of the series. Defaults to 0.
+            mode (DownloadMode, optional): Whether to download afresh or reuse complete file. Defaults DownloadMode.AUTO.
+            test (bool, optional): Just test if download is possible but do not actually download. Defaults to False.
+            filename_template (str | None, optional): Template for generating filename instead of `self.*filename_template`. Defaults to None.
+
+        run_kwargs: Keyword arguments for `ThrottleBuster.run`. Ignored, except `unsupported_run_options` which are rejected.
+
+        Returns:
+            DownloadedFile | httpx.Response: Downloaded caption file details or httpx Response (test).
+        """  # noqa: E501
+        assert_instance(caption_file, CaptionFileMetadata, "caption_file")
+        self._reject_unsupported_run_options(run_kwargs)
+
+        dir = self.throttle_buster.dir
+
+        if isinstance(filename, SearchResultsItem):
+            filename, dir = self.generate_filename(
+                search_results_item=filename,
+                caption_file=caption_file,
+                season=season,
+                episode=episode,
+                test=test,
+                filename_template=filename_template,
+            )
+
+        url = str(caption_file.url)
+        client = self.throttle_buster.client
+
+        if test:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                return response
+
+        saved_to = Path(dir).joinpath(sanitize_filename(filename))
+
+        if (
+            mode is not DownloadMode.START
+            and saved_to.exists()
+            and saved_to.stat().st_size == caption_file.size
+        ):
+            return DownloadedFile(
+                url=url,
+                saved_to=saved_to,
+                expected_size=caption_file.size,
+                size=caption_file.size,
+                duration=0,
+                merge_duration=0,
+            )
+
+        start_time = time.perf_counter()
+        response = await client.get(url)
+        response.raise_for_status()
+
+        content = response.content
+        expected_size = (
+            len(content)
+            if response.headers.get("content-encoding")
+            else int(response.headers.get("content-length", len(content)))
+        )
+        await asyncio.to_thread(write_file_atomically, saved_to, content)
+
+        return DownloadedFile(
+            url=url,
+            saved_to=saved_to,
+            expected_size=expected_size,
+            size=len(content),
+            duration=time.perf_counter() - start_time,
+            merge_duration=0,
+        )
+
+    async def run_many(
+        self,
+        caption_files: list[CaptionFileMetadata],
+        filename: str | SearchResultsItem,
+        season: int = 0,
+        episode: int = 0,
+        **run_kwargs,
+    ) -> list[DownloadedFile | httpx.Response]:
+        """Downloads several caption files concurrently over the same client.
+
+        - Files not bigger than `in_memory_size_limit` go through `run_in_memory` and the rest through `run`.
+        - Filename templates should tell the files apart e.g using `{lan}`.
+
+        Args:
+            caption_files (list[CaptionFileMetadata]): Caption files e.g one for each language.
+            filename (str|SearchResultsItem): Movie filename
+            season (int): Season number of the series. Defaults to 0.
+            episde (int): Episode number of the series. Defaults to 0.
+
+        run_kwargs: Keyword arguments for `ThrottleBuster.run`
+
+        Returns:
+            list[DownloadedFile | httpx.Response]: Downloaded caption files details in the order of caption_files.
+        """  # noqa: E501
+        self._reject_unsupported_run_options(run_kwargs)
+        return await run_alongside(
+            *(
+                (self.run_in_memory if caption_file.size <= self.in_memory_size_limit else self.run)(
+                    caption_file=caption_file,
+                    filename=filename,
+                    season=season,
+                    episode=episode,
+                    **run_kwargs,
+                )
+                for caption_file in caption_files
+            )
+        )
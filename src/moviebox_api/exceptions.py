@@ -46,3 +46,38 @@ class ZeroCaptionFileError(BaseMovieboxException):
 
 class ZeroMediaFileError(BaseMovieboxException):
     """Raised when trying to access a downloadable media file but the list is empty"""
+
+
+class QualityUnavailableError(BaseMovieboxException):
+    """Raised when none of the available media files satisfies the quality policy"""
+
+
+class MediaFileChangedError(BaseMovieboxException):
+    """Raised when refreshed downloadable files metadata no longer has the media file being downloaded"""
+
+    def __init__(self, media_file, *args, **kwargs):
+        self.media_file = media_file
+        """Media file being downloaded"""
+        super().__init__(*args, **kwargs)
+
+
+class DownloadIntegrityError(BaseMovieboxException):
+    """Raised when size or digests of a downloaded file differ from the expected ones"""
+
+    def __init__(self, path, *args, **kwargs):
+        self.path = path
+        """Path of the downloaded file"""
+        super().__init__(*args, **kwargs)
+
+
+class InsufficientDiskSpaceError(BaseMovieboxException):
+    """Raised when a filesystem lacks the free space a download needs"""
+
+    def __init__(self, path, required: int, available: int, *args, **kwargs):
+        self.path = path
+        """Directory the download writes to"""
+        self.required = required
+        """Bytes the download still has to write there"""
+        self.available = available
+        """Free bytes not reserved by other downloads"""
+        super().__init__(*args, **kwargs)
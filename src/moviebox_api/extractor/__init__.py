@@ -1,5 +1,6 @@
 """Extracts data from specific movie/tv-series page"""
 
+from moviebox_api.extractor._batch import BatchDetailsExtractor, extract_details
 from moviebox_api.extractor._core import (
     JsonDetailsExtractor,
     JsonDetailsExtractorModel,
@@ -14,4 +15,6 @@ __all__ = [
     "TagDetailsExtractorModel",
     "JsonDetailsExtractorModel",
     "DetailsExtractionError",
+    "BatchDetailsExtractor",
+    "extract_details",
 ]
@@ -0,0 +1,220 @@
+"""Fans item-page extraction out to a process pool.
+
+Parsing and validating an item page is CPU-bound and, when done on the event loop
+thread, starves all network I/O. `BatchDetailsExtractor` offloads that work to worker
+processes while keeping a bounded amount of it in flight.
+"""
+
+import asyncio
+import os
+import typing as t
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from moviebox_api.extractor._core import JsonDetailsExtractor
+from moviebox_api.extractor.models.json import ItemJsonDetailsModel
+from moviebox_api.models import build_model
+
+if t.TYPE_CHECKING:
+    from moviebox_api.core import BaseItemDetails
+
+__all__ = ["BatchDetailsExtractor", "extract_details"]
+
+BatchContentType: t.TypeAlias = "str | bytes | BaseItemDetails"
+
+
+def extract_details(
+    content: str | bytes, model: bool = False, trusted: bool = False
+) -> dict[str, t.Any] | ItemJsonDetailsModel:
+    """Extracts item details from json-formatted data of its page.
+
+    - Runs in the worker processes hence has to stay at module level (picklable).
+
+    Args:
+        content (str | bytes): Html contents of the item page.
+        model (bool, optional): Return modelled details instead of a plain dict. Defaults to False.
+        trusted (bool, optional): Skip url validation when modelling. Defaults to False.
+
+    Returns:
+        dict[str, t.Any] | ItemJsonDetailsModel: Extracted item details
+    """
+    details = JsonDetailsExtractor.extract(content)
+    return build_model(ItemJsonDetailsModel, details, trusted) if model else details
+
+
+class BatchDetailsExtractor:
+    """Extracts details of many item pages using a pool of worker processes
+
+    For instance:
+
+    ```python
+    async with BatchDetailsExtractor(model=True) as batch:
+        async for details in batch.map(item_details_instances):
+            print(details.resData.subject.title)
+    ```
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        model: bool = False,
+        executor: Executor | None = None,
+        trusted: bool = False,
+    ):
+        """Constructor for `BatchDetailsExtractor`
+
+        Args:
+            max_workers (int | None, optional): Number of worker processes. Defaults to os.cpu_count().
+            max_pending (int | None, optional): Maximum pages being fetched or extracted at once. Defaults to twice max_workers.
+            model (bool, optional): Yield `ItemJsonDetailsModel` instead of plain dicts. Defaults to False.
+            executor (Executor | None, optional): Use this executor instead of creating a process pool. Defaults to None.
+            trusted (bool, optional): Skip url validation when modelling. Defaults to False.
+        """  # noqa: E501
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 2
+        assert self.max_pending > 0, f"Value for max_pending should be atleast 1 not {self.max_pending}"
+        self.model = model
+        self.trusted = trusted
+        self._owns_executor = executor is None
+        self._executor = executor
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} max_workers={self.max_workers} "
+            f"max_pending={self.max_pending} model={self.model}>"
+        )
+
+    @property
+    def executor(self) -> Executor:
+        """Executor running the extraction. Created on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """Shuts down the process pool incase it was created by this instance"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "BatchDetailsExtractor":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    async def _extract(self, content: BatchContentType) -> dict[str, t.Any] | ItemJsonDetailsModel:
+        """Fetches page contents if need be then extracts them in the executor"""
+        if not isinstance(content, (str, bytes)):
+            # Network I/O stays on the event loop
+            content = await content.get_json_source_content()
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, extract_details, content, self.model, self.trusted
+        )
+
+    @staticmethod
+    async def _iterate(
+        contents: t.Iterable[BatchContentType] | t.AsyncIterable[BatchContentType],
+    ) -> t.AsyncIterator[BatchContentType]:
+        if hasattr(contents, "__aiter__"):
+            async for content in contents:
+                yield content
+        else:
+            for content in contents:
+                yield content
+
+    async def map(
+        self,
+        contents: t.Iterable[BatchContentType] | t.AsyncIterable[BatchContentType],
+        return_exceptions: bool = False,
+    ) -> t.AsyncIterator[dict[str, t.Any] | ItemJsonDetailsModel | Exception]:
+        """Extracts details and yields them in the same order as the contents.
+
+        Args:
+            contents (Iterable | AsyncIterable): Html contents or `BaseItemDetails` instances.
+            return_exceptions (bool, optional): Yield exceptions instead of raising them. Defaults to False.
+
+        Yields:
+            dict[str, t.Any] | ItemJsonDetailsModel | Exception: Extracted item details
+        """
+        pending: deque[asyncio.Task] = deque()
+
+        async def next_result():
+            task = pending.popleft()
+            try:
+                return await task
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        try:
+            async for content in self._iterate(contents):
+                pending.append(asyncio.ensure_future(self._extract(content)))
+
+                if len(pending) >= self.max_pending:
+                    yield await next_result()
+
+            while pending:
+                yield await next_result()
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def as_completed(
+        self,
+        contents: t.Iterable[BatchContentType] | t.AsyncIterable[BatchContentType],
+        return_exceptions: bool = False,
+    ) -> t.AsyncIterator[tuple[int, dict[str, t.Any] | ItemJsonDetailsModel | Exception]]:
+        """Extracts details and yields them as soon as each is ready.
+
+        Args:
+            contents (Iterable | AsyncIterable): Html contents or `BaseItemDetails` instances.
+            return_exceptions (bool, optional): Yield exceptions instead of raising them. Defaults to False.
+
+        Yields:
+            tuple[int, dict[str, t.Any] | ItemJsonDetailsModel | Exception]: Position of the content and its details
+        """  # noqa: E501
+        pending: dict[asyncio.Task, int] = {}
+
+        async def completed_results():
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            results = []
+            for task in done:
+                index = pending.pop(task)
+                try:
+                    results.append((index, task.result()))
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append((index, e))
+            return results
+
+        try:
+            index = 0
+            async for content in self._iterate(contents):
+                pending[asyncio.ensure_future(self._extract(content))] = index
+                index += 1
+
+                if len(pending) >= self.max_pending:
+                    for result in await completed_results():
+                        yield result
+
+            while pending:
+                for result in await completed_results():
+                    yield result
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def gather(
+        self,
+        contents: t.Iterable[BatchContentType] | t.AsyncIterable[BatchContentType],
+        return_exceptions: bool = False,
+    ) -> list[dict[str, t.Any] | ItemJsonDetailsModel | Exception]:
+        """Extracts details of all the contents and returns them in order"""
+        return [details async for details in self.map(contents, return_exceptions=return_exceptions)]
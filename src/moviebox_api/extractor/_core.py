@@ -6,7 +6,7 @@ import typing as t
 from json import loads
 
 from moviebox_api.extractor.exceptions import DetailsExtractionError
-from moviebox_api.extractor.helpers import souper
+from moviebox_api.extractor.helpers import get_json_script_text, souper
 from moviebox_api.extractor.models.json import (
     ItemJsonDetailsModel,
     MetadataModel,
@@ -26,6 +26,7 @@ from moviebox_api.extractor.models.tag import (
     OthersModel,
     ReviewModel,
 )
+from moviebox_api.models import build_model
 
 __all__ = [
     "TagDetailsExtractor",
@@ -44,11 +45,11 @@ class TagDetailsExtractor:
     - e.g "This content is not available on the website. Please download our Android app to access it."
     """
 
-    def __init__(self, content: str):
+    def __init__(self, content: str | bytes):
         """Constructor for `TagDetailsExtractor`
 
         Args:
-            content (str): Html formatted text
+            content (str | bytes): Html formatted text
         """
         self._content = content
         self.souped_content = souper(content)
@@ -190,11 +191,11 @@ class JsonDetailsExtractor:
     - Extracts whole details available.
     """
 
-    def __init__(self, content: str):
+    def __init__(self, content: str | bytes | memoryview):
         """Constructor for `JsonDetailsExtractor`
 
         Args:
-            content (str): Html contents of the item page
+            content (str | bytes | memoryview): Html contents of the item page
         """
         self._content = content
         self.details: dict[str, t.Any] = self.extract(content)
@@ -210,11 +211,14 @@ class JsonDetailsExtractor:
         return self.details
 
     @classmethod
-    def extract(self, content: str, whole: bool = False) -> dict[str, t.Any]:
+    def extract(self, content: str | bytes | memoryview, whole: bool = False) -> dict[str, t.Any]:
         """Extract item details from its specific page.
 
+        - The json-formatted data is located by offset and decoded straight from its slice,
+          falling back to parsing the whole html only when it cannot be located that way.
+
         Args:
-            content (str): Contents of the specific item page (html).
+            content (str | bytes | memoryview): Contents of the specific item page (html).
             whole (bool, optional): Include less important details. Defaults to False.
 
         Raises:
@@ -224,7 +228,13 @@ class JsonDetailsExtractor:
             dict[str, t.Any]: Extracted item details
         """
         try:
-            from_script = souper(content).find("script", {"type": "application/json"}).text
+            from_script = get_json_script_text(content)
+
+            if from_script is None:
+                if isinstance(content, memoryview):
+                    content = content.tobytes()
+                from_script = souper(content).find("script", {"type": "application/json"}).text
+
             data: list = loads(from_script)
             extracts = []
 
@@ -349,11 +359,11 @@ class JsonDetailsExtractor:
 class TagDetailsExtractorModel:
     """Extracts item details from html tags and model them"""
 
-    def __init__(self, content: str):
+    def __init__(self, content: str | bytes):
         """Constructor for `TagDetailsExtractorModel`
 
         Args:
-            content (str): Html formatted text
+            content (str | bytes): Html formatted text
         """
         self.tag_details_extractor: TagDetailsExtractor = TagDetailsExtractor(content)
 
@@ -406,21 +416,25 @@ class TagDetailsExtractorModel:
 class JsonDetailsExtractorModel:
     """Extracts item details from json-formatted data and models them"""
 
-    def __init__(self, content: str):
+    def __init__(self, content: str | bytes | memoryview, trusted: bool = False):
         """Constructor for `JsonDetailsExtractorModel`
 
         Args:
-            content (str): Html contents of the item page
+            content (str | bytes | memoryview): Html contents of the item page
+            trusted (bool, optional): Skip url validation when modelling. Defaults to False.
         """
         self.json_details_extractor: JsonDetailsExtractor = JsonDetailsExtractor(content)
-        self.details: ItemJsonDetailsModel = self.extract(content)
+        self.details: ItemJsonDetailsModel = build_model(
+            ItemJsonDetailsModel, self.json_details_extractor.details, trusted
+        )
 
     @classmethod
-    def extract(cls, content: str) -> ItemJsonDetailsModel:
+    def extract(cls, content: str | bytes | memoryview, trusted: bool = False) -> ItemJsonDetailsModel:
         """Extract item details from its specific page and form model.
 
         Args:
-            content (str): Contents of the specific item page (html).
+            content (str | bytes | memoryview): Contents of the specific item page (html).
+            trusted (bool, optional): Skip url validation when modelling. Defaults to False.
 
         Raises:
             DetailsExtractionError: Incase no data extracted
@@ -429,7 +443,7 @@ class JsonDetailsExtractorModel:
             ItemJsonDetailsModel: Modelled extracted item details
         """
         contents = JsonDetailsExtractor.extract(content, whole=False)
-        return ItemJsonDetailsModel(**contents)
+        return build_model(ItemJsonDetailsModel, contents, trusted)
 
     @property
     def data(self) -> ResDataModel:
@@ -1,15 +1,117 @@
 """Contains common functions for the submodule"""
 
+import re
+
 from bs4 import BeautifulSoup
 
+JSON_SCRIPT_OPENING_PATTERN = re.compile(rb'<script[^>]*type="application/json"[^>]*>')
+"""Opening tag of the script holding the json-formatted item details"""
+
+SCRIPT_CLOSING_PATTERN = re.compile(rb"</script>")
+
+STR_JSON_SCRIPT_OPENING_PATTERN = re.compile(JSON_SCRIPT_OPENING_PATTERN.pattern.decode())
+
+STR_SCRIPT_CLOSING_PATTERN = re.compile(SCRIPT_CLOSING_PATTERN.pattern.decode())
+
 
-def souper(html: str) -> BeautifulSoup:
+def souper(html: str | bytes) -> BeautifulSoup:
     """Convert html formatted txt to bts object
 
     Args:
-        html (str): Html formatted text
+        html (str | bytes): Html formatted text
 
     Returns:
         BeautifulSoup: Souped html
     """
     return BeautifulSoup(html, "html.parser")
+
+
+def locate_json_script(content: str | bytes | bytearray | memoryview) -> tuple[int, int] | None:
+    """Finds where the json-formatted script text lies in html contents without copying them
+
+    Args:
+        content (str | bytes | bytearray | memoryview): Whole or partial html contents of the item page
+
+    Returns:
+        tuple[int, int] | None: Start and end offsets of the script text or None
+            incase the script has not been found (or has not been received completely).
+    """
+    if isinstance(content, str):
+        opening_pattern, closing_pattern = STR_JSON_SCRIPT_OPENING_PATTERN, STR_SCRIPT_CLOSING_PATTERN
+    else:
+        opening_pattern, closing_pattern = JSON_SCRIPT_OPENING_PATTERN, SCRIPT_CLOSING_PATTERN
+
+    opening_match = opening_pattern.search(content)
+    if opening_match is None:
+        return None
+
+    closing_match = closing_pattern.search(content, opening_match.end())
+    if closing_match is None:
+        return None
+
+    return opening_match.end(), closing_match.start()
+
+
+class JsonScriptScanner:
+    """Locates the json-formatted script in html contents received chunk by chunk
+
+    - Only the bytes added since the previous scan (and the few that might hold a tag
+      cut short by a chunk boundary) are searched, so streaming a page stays linear in its size.
+    """
+
+    def __init__(self):
+        self.scanned: int = 0
+        """Length of the contents already searched"""
+
+        self.opening_end: int | None = None
+        """End offset of the script opening tag once found"""
+
+    def scan(self, content: bytes | bytearray) -> tuple[int, int] | None:
+        """Searches the newly received part of the growing html contents
+
+        Args:
+            content (bytes | bytearray): Html contents of the item page received so far
+
+        Returns:
+            tuple[int, int] | None: Start and end offsets of the script text or None
+                incase the script has not been received completely.
+        """
+        if self.opening_end is None:
+            # An opening tag cut short by the previous chunk holds no ">" so it starts after the last one
+            start = content.rfind(b">", 0, self.scanned) + 1 if self.scanned else 0
+            opening_match = JSON_SCRIPT_OPENING_PATTERN.search(content, start)
+
+            if opening_match is None:
+                self.scanned = len(content)
+                return None
+
+            self.opening_end = self.scanned = opening_match.end()
+
+        closing_start = max(self.opening_end, self.scanned - len(SCRIPT_CLOSING_PATTERN.pattern) + 1)
+        closing_match = SCRIPT_CLOSING_PATTERN.search(content, closing_start)
+        self.scanned = len(content)
+
+        if closing_match is None:
+            return None
+
+        return self.opening_end, closing_match.start()
+
+
+def get_json_script_text(content: str | bytes | bytearray | memoryview) -> str | bytes | None:
+    """Slices out the json-formatted script text from html contents
+
+    - Only the script text is copied, the rest of the contents are left untouched.
+
+    Args:
+        content (str | bytes | bytearray | memoryview): Html contents of the item page
+
+    Returns:
+        str | bytes | None: Script text ready for `json.loads` or None incase it's not found
+    """
+    location = locate_json_script(content)
+    if location is None:
+        return None
+
+    start, end = location
+    script_text = content[start:end]
+    return script_text if isinstance(script_text, (str, bytes)) else bytes(script_text)
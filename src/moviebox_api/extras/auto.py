@@ -23,7 +23,7 @@ from moviebox_api.download import (
     resolve_media_file_to_be_downloaded,
 )
 from moviebox_api.exceptions import ZeroSearchResultsError
-from moviebox_api.helpers import assert_membership, get_event_loop
+from moviebox_api.helpers import assert_membership, get_event_loop, run_alongside
 from moviebox_api.models import (
     DownloadableFilesMetadata,
     SearchResultsItem,
@@ -175,7 +175,9 @@ class MovieAuto:
         target_subtitle = downloadable_movie_file_details.get_subtitle_by_language(caption_language)
 
         if target_subtitle:
-            saved_to_or_response = await self.caption_file_downloader.run(target_subtitle, **run_kwargs)
+            (saved_to_or_response,) = await self.caption_file_downloader.run_many(
+                [target_subtitle], **run_kwargs
+            )
 
             return saved_to_or_response
 
@@ -233,15 +235,18 @@ class MovieAuto:
                 **kwargs,
             )
 
-        else:
-            # Download subtitle first
-            if caption_language:
-                caption_details_or_httpx_response = await self._caption_download_handler(
+        elif caption_language:
+            # Download subtitle alongside the movie
+            caption_details_or_httpx_response, movie_details_or_httpx_response = await run_alongside(
+                self._caption_download_handler(
                     downloadable_movie_file_details,
                     caption_language,
                     **kwargs,
-                )
+                ),
+                self._movie_download_handler(downloadable_movie_file_details, quality, **kwargs),
+            )
 
+        else:
             movie_details_or_httpx_response = await self._movie_download_handler(
                 downloadable_movie_file_details, quality, **kwargs
             )
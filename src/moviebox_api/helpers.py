@@ -4,8 +4,14 @@ across the package.
 """
 
 import asyncio
+import contextlib
+import os
 import re
+import stat
 import typing as t
+import uuid
+from json import loads
+from pathlib import Path
 from urllib.parse import urljoin
 
 from moviebox_api import logger
@@ -14,6 +20,8 @@ from moviebox_api.exceptions import UnsuccessfulResponseError
 
 FILE_EXT_PATTERN = re.compile(r".+\.(\w+)\?.+")
 
+SIGNED_URL_EXPIRY_PATTERN = re.compile(r"[?&]auth_key=(\d+)-")
+
 ILLEGAL_CHARACTERS_PATTERN = re.compile(r"[^\w\-_\.\s()&|]")
 
 VALID_ITEM_PAGE_URL_PATTERN = re.compile(r"^.*" + ITEM_DETAILS_PATH + r"/[\w-]+(?:\?id\=\d{17,}.*)?$")
@@ -59,15 +67,18 @@ def assert_instance(obj: object, class_or_tuple, name: str = "Parameter") -> t.N
     )
 
 
-def process_api_response(json: dict) -> dict | list:
+def process_api_response(json: dict | bytes | bytearray | memoryview) -> dict | list:
     """Extracts the response data field
 
     Args:
-        json (t.Dict): Whole server response
+        json (t.Dict | bytes | bytearray | memoryview): Whole server response, decoded or raw body.
 
     Returns:
         t.Dict: Extracted data field value
     """
+    if not isinstance(json, dict):
+        json = loads(json.tobytes() if isinstance(json, memoryview) else json)
+
     if json.get("code", 1) == 0 and json.get("message") == "ok":
         return json["data"]
 
@@ -94,6 +105,51 @@ def get_file_extension(url: str) -> str | None:
         return ext_match.groups()[0]
 
 
+def get_signed_url_expiry(url: str) -> int | None:
+    """Extracts expiry (unix timestamp) embedded in `auth_key` of signed file url
+
+    For example:
+        url : https://valiw.hakunaymatata.com/resource/537977caa8c13703185d26471ce7de9f.mp4?auth_key=1753024153-0-0-c824d3b5a5c8acc294bfd41de43c51ef"
+        returns 1753024153
+    """
+    expiry_match = SIGNED_URL_EXPIRY_PATTERN.search(str(url))
+
+    if expiry_match:
+        return int(expiry_match.groups()[0])
+
+
+def write_file_atomically(path: Path | str, content: bytes) -> Path:
+    """Saves content to a temporary file next to path then moves it into place
+    so that path never holds partially written content
+
+    Args:
+        path (Path | str): Where to save the content to.
+        content (bytes): File contents.
+
+    Returns:
+        Path: Path where content has been saved to.
+    """
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    # Created like any other file hence the umask applies
+    fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+
+        with contextlib.suppress(FileNotFoundError):
+            # Replaced file keeps its permissions
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+
+        os.replace(temp_path, path)
+
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return path
+
+
 def validate_item_page_url(url: str) -> str:
     """Checks whether specific item page url is valid"""
     if VALID_ITEM_PAGE_URL_PATTERN.match(url):
@@ -102,6 +158,21 @@ def validate_item_page_url(url: str) -> str:
     raise ValueError(f"Invalid url for a specific item page - '{url}'")
 
 
+async def run_alongside(*awaitables: t.Awaitable) -> list:
+    """Runs awaitables concurrently and cancels the rest as soon as one of them fails
+
+    Returns:
+        list: Results in the order of the awaitables
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return list(await asyncio.gather(*tasks))
+
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 def get_event_loop():
     try:
         event_loop = asyncio.get_event_loop()
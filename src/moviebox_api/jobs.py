@@ -0,0 +1,352 @@
+"""Persistent download jobs.
+
+Queued movie and episode downloads are recorded in a SQLite database along with
+their urls, completed byte ranges and status. An interrupted batch can then be
+resumed - even from another process - skipping finished items without a single
+request to the server.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import typing as t
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+
+from moviebox_api.constants import JOBS_DATABASE_PATH, SubjectType
+
+__all__ = ["JobStatus", "Job", "JobItem", "JobStore"]
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class JobItem:
+    """Movie or episode download of a job. Movies have season and episode 0."""
+
+    id: int
+    job_id: int
+    season: int
+    episode: int
+    status: JobStatus
+    url: str | None = None
+    resolution: int | None = None
+    size: int | None = None
+    saved_to: str | None = None
+    completed_ranges: list[list[int]] = field(default_factory=list)
+    """Sorted [start, end) byte spans already downloaded"""
+    error: str | None = None
+    updated_at: float = 0.0
+
+    @property
+    def completed_size(self) -> int:
+        return sum(end - start for start, end in self.completed_ranges)
+
+
+@dataclass(frozen=True)
+class Job:
+    """Download of a movie or several episodes of a tv-series"""
+
+    id: int
+    subject_type: SubjectType
+    title: str
+    item: dict[str, t.Any]
+    """Dumped `SearchResultsItem` so that resuming does not search again"""
+    quality: str
+    options: dict[str, t.Any]
+    """Keyword arguments the download was started with"""
+    status: JobStatus
+    created_at: float
+    updated_at: float
+    items: tuple[JobItem, ...] = ()
+
+    @property
+    def unfinished_items(self) -> list[JobItem]:
+        return [item for item in self.items if item.status != JobStatus.COMPLETED]
+
+    @property
+    def completed_count(self) -> int:
+        return len(self.items) - len(self.unfinished_items)
+
+
+class JobStore:
+    """SQLite database of download jobs.
+
+    For instance:
+
+    ```python
+    job_store = JobStore()
+    job_id = job_store.create_job(SubjectType.TV_SERIES, "Merlin", item, "BEST", {}, [(1, 1), (1, 2)])
+    job_store.update_item(job_id, 1, 1, status=JobStatus.COMPLETED, saved_to="Merlin S1E1.mp4")
+    print(job_store.get_job(job_id).unfinished_items)
+    ```
+    """
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        subject_type INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        item TEXT NOT NULL,
+        quality TEXT NOT NULL,
+        options TEXT NOT NULL,
+        status TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS job_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+        season INTEGER NOT NULL,
+        episode INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        url TEXT,
+        resolution INTEGER,
+        size INTEGER,
+        saved_to TEXT,
+        completed_ranges TEXT NOT NULL DEFAULT '[]',
+        error TEXT,
+        updated_at REAL NOT NULL,
+        UNIQUE (job_id, season, episode)
+    );
+    """
+
+    item_fields = ("status", "url", "resolution", "size", "saved_to", "completed_ranges", "error")
+    """Job item columns that can be updated"""
+
+    def __init__(self, path: Path | str = JOBS_DATABASE_PATH):
+        """Constructor for `JobStore`
+
+        Args:
+            path (Path | str, optional): SQLite database file. Defaults to JOBS_DATABASE_PATH.
+        """
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'<{self.__module__}.{self.__class__.__name__} path="{self.path}">'
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Database connection. Opened and set up on first use."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            # Write-ahead logging survives crashes and lets other processes read meanwhile
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(self.schema)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _execute(self, sql: str, parameters: t.Sequence | dict = ()) -> sqlite3.Cursor:
+        with self._lock, self.connection:
+            return self.connection.execute(sql, parameters)
+
+    def create_job(
+        self,
+        subject_type: SubjectType,
+        title: str,
+        item: dict[str, t.Any],
+        quality: str,
+        options: dict[str, t.Any],
+        episodes: t.Iterable[tuple[int, int]] = ((0, 0),),
+    ) -> int:
+        """Records a new job with all its items pending.
+
+        Args:
+            subject_type (SubjectType): Movies or tv-series.
+            title (str): Title of the movie or tv-series.
+            item (dict[str, t.Any]): Dumped `SearchResultsItem`.
+            quality (str): Chosen media quality e.g `BEST`.
+            options (dict[str, t.Any]): Json serializable keyword arguments of the download.
+            episodes (t.Iterable[tuple[int, int]], optional): (season, episode) pairs. Defaults to ((0, 0),) for a movie.
+
+        Returns:
+            int: Job id
+        """  # noqa: E501
+        now = time.time()
+        with self._lock, self.connection as connection:
+            job_id = connection.execute(
+                "INSERT INTO jobs (subject_type, title, item, quality, options, status, created_at, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    int(subject_type),
+                    title,
+                    json.dumps(item),
+                    quality,
+                    json.dumps(options),
+                    JobStatus.PENDING,
+                    now,
+                    now,
+                ),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO job_items (job_id, season, episode, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(job_id, season, episode, JobStatus.PENDING, now) for season, episode in episodes],
+            )
+        return job_id
+
+    @staticmethod
+    def _make_item(row: sqlite3.Row) -> JobItem:
+        details = dict(row)
+        details["status"] = JobStatus(details["status"])
+        details["completed_ranges"] = json.loads(details["completed_ranges"])
+        return JobItem(**details)
+
+    def _make_job(self, row: sqlite3.Row, items: t.Iterable[sqlite3.Row]) -> Job:
+        details = dict(row)
+        details["subject_type"] = SubjectType(details["subject_type"])
+        details["item"] = json.loads(details["item"])
+        details["options"] = json.loads(details["options"])
+        details["status"] = JobStatus(details["status"])
+        return Job(**details, items=tuple(self._make_item(item) for item in items))
+
+    def get_job(self, job_id: int) -> Job | None:
+        """Job with its items. None incase it does not exist."""
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        items = self._execute(
+            "SELECT * FROM job_items WHERE job_id = ? ORDER BY season, episode", (job_id,)
+        ).fetchall()
+        return self._make_job(row, items)
+
+    def list_jobs(self, status: JobStatus | None = None) -> list[Job]:
+        """Jobs with their items, most recent first.
+
+        Args:
+            status (JobStatus | None, optional): List jobs having this status only. Defaults to None.
+        """
+        if status is None:
+            rows = self._execute("SELECT * FROM jobs ORDER BY id DESC").fetchall()
+        else:
+            rows = self._execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC", (status,)).fetchall()
+
+        items: dict[int, list[sqlite3.Row]] = {row["id"]: [] for row in rows}
+        for item in self._execute("SELECT * FROM job_items ORDER BY season, episode").fetchall():
+            if item["job_id"] in items:
+                items[item["job_id"]].append(item)
+
+        return [self._make_job(row, items[row["id"]]) for row in rows]
+
+    def get_item(self, job_id: int, season: int, episode: int) -> JobItem | None:
+        """Job item of the movie or episode. None incase it does not exist."""
+        row = self._execute(
+            "SELECT * FROM job_items WHERE job_id = ? AND season = ? AND episode = ?",
+            (job_id, season, episode),
+        ).fetchone()
+        return None if row is None else self._make_item(row)
+
+    def get_status(self, job_id: int) -> JobStatus | None:
+        """Current status of the job without loading its items"""
+        row = self._execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else JobStatus(row["status"])
+
+    def set_status(self, job_id: int, status: JobStatus) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (status, time.time(), job_id)
+        )
+
+    def update_item(self, job_id: int, season: int, episode: int, **fields) -> None:
+        """Updates details of a job item.
+
+        Args:
+            job_id (int): Job id.
+            season (int): Season number of the item. 0 for movies.
+            episode (int): Episode number of the item. 0 for movies.
+
+        fields: New values for any of `item_fields`
+        """
+        unknown_fields = set(fields) - set(self.item_fields)
+        assert not unknown_fields, f"Unknown job item fields {unknown_fields}. Choose from {self.item_fields}"
+
+        if "completed_ranges" in fields:
+            fields["completed_ranges"] = json.dumps(fields["completed_ranges"])
+
+        assignments = ", ".join(f"{name} = :{name}" for name in fields)
+        self._execute(
+            f"UPDATE job_items SET {assignments}, updated_at = :updated_at "
+            "WHERE job_id = :job_id AND season = :season AND episode = :episode",
+            fields | dict(updated_at=time.time(), job_id=job_id, season=season, episode=episode),
+        )
+
+    def settle_status(self, job_id: int) -> JobStatus | None:
+        """Derives job status from its items once none is running.
+
+        Returns:
+            JobStatus | None: New status of the job. None incase it does not exist.
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+
+        statuses = {item.status for item in job.items}
+        if job.status == JobStatus.CANCELLED or JobStatus.RUNNING in statuses:
+            return job.status
+
+        if statuses <= {JobStatus.COMPLETED}:
+            status = JobStatus.COMPLETED
+        elif JobStatus.FAILED in statuses:
+            status = JobStatus.FAILED
+        else:
+            status = JobStatus.PENDING
+
+        self.set_status(job_id, status)
+        return status
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancels the job so that its unfinished items are not started.
+
+        Returns:
+            bool: Whether the job existed and was unfinished
+        """
+        with self._lock, self.connection as connection:
+            updated = connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status != ?",
+                (JobStatus.CANCELLED, time.time(), job_id, JobStatus.COMPLETED),
+            ).rowcount
+            connection.execute(
+                "UPDATE job_items SET status = ?, updated_at = ? WHERE job_id = ? AND status = ?",
+                (JobStatus.CANCELLED, time.time(), job_id, JobStatus.PENDING),
+            )
+        return bool(updated)
+
+    def reopen(self, job_id: int) -> None:
+        """Makes a cancelled, failed or interrupted job pending again"""
+        with self._lock, self.connection as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status != ?",
+                (JobStatus.PENDING, time.time(), job_id, JobStatus.COMPLETED),
+            )
+            connection.execute(
+                "UPDATE job_items SET status = ?, updated_at = ? WHERE job_id = ? AND status != ?",
+                (JobStatus.PENDING, time.time(), job_id, JobStatus.COMPLETED),
+            )
+
+    def delete(self, job_id: int) -> None:
+        """Removes the job and its items"""
+        self._execute("DELETE FROM jobs WHERE id = ?", (job_id,))
@@ -0,0 +1,250 @@
+"""Local index of downloaded media files.
+
+Every movie and episode downloaded is recorded in a SQLite database along with its
+subject id, resolution, path, size and digest. Before requesting anything from the
+server, downloads and plans look items up in the index and skip the ones whose files
+are still in place - so re-running a sync over a large library is mostly local lookups.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from throttlebuster import DownloadedFile
+
+from moviebox_api.checksums import FileChecksums
+from moviebox_api.constants import LIBRARY_DATABASE_PATH, DownloadQualitiesType
+
+__all__ = ["LibraryEntry", "LibraryIndex"]
+
+
+@dataclass(frozen=True)
+class LibraryEntry:
+    """Downloaded movie or episode. Movies have season and episode 0."""
+
+    subject_id: str
+    season: int
+    episode: int
+    resolution: int
+    path: str
+    size: int
+    digest: str | None = None
+    """Combined digest of the file incase checksums were computed while downloading"""
+    algorithm: str | None = None
+    """Hashlib algorithm of the digest"""
+    added_at: float = 0.0
+    quality: str | None = None
+    """Quality requested for the download e.g BEST. None for entries recorded without it."""
+
+    @property
+    def is_present(self) -> bool:
+        """Checks whether the file is still in place with the recorded size"""
+        try:
+            return os.stat(self.path).st_size == self.size
+        except OSError:
+            return False
+
+    def satisfies(self, quality: DownloadQualitiesType) -> bool:
+        """Checks whether the entry is good enough for the quality e.g 1080P satisfies 720P.
+
+        Only entries downloaded as BEST satisfy BEST since the best resolution available
+        is not known without requesting the metadata.
+        """
+        if quality == "WORST":
+            return True
+        if quality == "BEST":
+            return self.quality == "BEST"
+        return self.resolution >= int(quality.removesuffix("P"))
+
+
+class LibraryIndex:
+    """SQLite index of downloaded media files.
+
+    For instance:
+
+    ```python
+    library = LibraryIndex()
+    library.add(item.subjectId, downloaded_file, resolution=720, season=1, episode=2)
+    entry = library.find(item.subjectId, season=1, episode=2)
+    ```
+    """
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS library (
+        subject_id TEXT NOT NULL,
+        season INTEGER NOT NULL,
+        episode INTEGER NOT NULL,
+        resolution INTEGER NOT NULL,
+        path TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        digest TEXT,
+        algorithm TEXT,
+        added_at REAL NOT NULL,
+        quality TEXT,
+        PRIMARY KEY (subject_id, season, episode, resolution)
+    );
+    """
+
+    def __init__(self, path: Path | str = LIBRARY_DATABASE_PATH):
+        """Constructor for `LibraryIndex`
+
+        Args:
+            path (Path | str, optional): SQLite database file. Defaults to LIBRARY_DATABASE_PATH.
+        """
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'<{self.__module__}.{self.__class__.__name__} path="{self.path}">'
+
+    def __enter__(self) -> "LibraryIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Database connection. Opened and set up on first use."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.schema)
+            columns = [row["name"] for row in connection.execute("PRAGMA table_info(library)")]
+            if "quality" not in columns:
+                # Database made before requested qualities were kept
+                connection.execute("ALTER TABLE library ADD COLUMN quality TEXT")
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _execute(self, sql: str, parameters: t.Sequence | dict = ()) -> sqlite3.Cursor:
+        with self._lock, self.connection:
+            return self.connection.execute(sql, parameters)
+
+    def add(
+        self,
+        subject_id: str,
+        downloaded_file: DownloadedFile,
+        resolution: int,
+        season: int = 0,
+        episode: int = 0,
+        quality: DownloadQualitiesType | None = None,
+    ) -> LibraryEntry:
+        """Records a downloaded media file, replacing any entry of the same resolution.
+
+        The digest is taken from the checksums sidecar of the file if there is one.
+
+        Args:
+            subject_id (str): Subject id of the movie or tv-series.
+            downloaded_file (DownloadedFile): Downloaded media file.
+            resolution (int): Resolution of the media file.
+            season (int, optional): Season number of the episode. Defaults to 0 for a movie.
+            episode (int, optional): Episode number. Defaults to 0 for a movie.
+            quality (DownloadQualitiesType | None, optional): Requested quality. Defaults to None.
+
+        Returns:
+            LibraryEntry: Recorded entry.
+        """
+        saved_to = Path(downloaded_file.saved_to).absolute()
+        checksums = FileChecksums.load(FileChecksums.path_for(saved_to))
+        entry = LibraryEntry(
+            subject_id=subject_id,
+            season=season,
+            episode=episode,
+            resolution=resolution,
+            path=str(saved_to),
+            size=downloaded_file.size,
+            digest=None if checksums is None else checksums.digest,
+            algorithm=None if checksums is None else checksums.algorithm,
+            added_at=time.time(),
+            quality=quality,
+        )
+        self._execute(
+            "INSERT OR REPLACE INTO library (subject_id, season, episode, resolution, path, size, digest, "
+            "algorithm, added_at, quality) VALUES (:subject_id, :season, :episode, :resolution, :path, "
+            ":size, :digest, :algorithm, :added_at, :quality)",
+            entry.__dict__,
+        )
+        return entry
+
+    def entries(self, subject_id: str) -> list[LibraryEntry]:
+        """All recorded entries of a movie or tv-series ordered by season, episode then resolution"""
+        rows = self._execute(
+            "SELECT * FROM library WHERE subject_id = ? ORDER BY season, episode, resolution", (subject_id,)
+        ).fetchall()
+        return [LibraryEntry(**dict(row)) for row in rows]
+
+    def find(
+        self,
+        subject_id: str,
+        season: int = 0,
+        episode: int = 0,
+        quality: DownloadQualitiesType = "BEST",
+    ) -> LibraryEntry | None:
+        """Highest resolution entry satisfying the quality whose file is still in place.
+
+        Entries whose files are gone or changed in size are dropped along the way.
+
+        Args:
+            subject_id (str): Subject id of the movie or tv-series.
+            season (int, optional): Season number of the episode. Defaults to 0 for a movie.
+            episode (int, optional): Episode number. Defaults to 0 for a movie.
+            quality (DownloadQualitiesType, optional): Least acceptable quality. Defaults to "BEST".
+
+        Returns:
+            LibraryEntry | None: Present entry if any.
+        """
+        rows = self._execute(
+            "SELECT * FROM library WHERE subject_id = ? AND season = ? AND episode = ? "
+            "ORDER BY resolution DESC",
+            (subject_id, season, episode),
+        ).fetchall()
+
+        for row in rows:
+            entry = LibraryEntry(**dict(row))
+            if not entry.is_present:
+                self.remove(entry)
+            elif entry.satisfies(quality):
+                return entry
+
+    def find_many(
+        self,
+        subject_id: str,
+        episodes: t.Iterable[tuple[int, int]],
+        quality: DownloadQualitiesType = "BEST",
+    ) -> dict[tuple[int, int], LibraryEntry]:
+        """Present entries of several episodes in one query. Episodes lacking one are left out."""
+        episodes = set(episodes)
+        found: dict[tuple[int, int], LibraryEntry] = {}
+
+        for entry in self.entries(subject_id):
+            key = (entry.season, entry.episode)
+            if key not in episodes:
+                continue
+
+            if not entry.is_present:
+                self.remove(entry)
+            elif entry.satisfies(quality) and (key not in found or entry.resolution > found[key].resolution):
+                found[key] = entry
+
+        return found
+
+    def remove(self, entry: LibraryEntry) -> None:
+        """Forgets an entry"""
+        self._execute(
+            "DELETE FROM library WHERE subject_id = ? AND season = ? AND episode = ? AND resolution = ?",
+            (entry.subject_id, entry.season, entry.episode, entry.resolution),
+        )
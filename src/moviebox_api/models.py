@@ -2,16 +2,94 @@
 Pydantic models.
 """
 
+import operator
+import types
+import typing as t
 from dataclasses import dataclass
 from datetime import date
+from functools import cache, cached_property, reduce
 from json import loads
 from uuid import UUID
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+from pydantic import BaseModel, Field, HttpUrl, create_model, field_validator
 
 from moviebox_api.constants import ITEM_DETAILS_PATH, DownloadQualitiesType, SubjectType
 from moviebox_api.exceptions import ZeroMediaFileError
-from moviebox_api.helpers import get_file_extension
+from moviebox_api.helpers import get_file_extension, get_signed_url_expiry
+
+ModelType = t.TypeVar("ModelType", bound=BaseModel)
+
+
+def _get_trusted_annotation(annotation: t.Any) -> t.Any:
+    """Swaps url types for plain strings, recursing into nested models and generics"""
+    if annotation is HttpUrl:
+        return str
+
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return get_trusted_model(annotation)
+
+    origin = t.get_origin(annotation)
+    if origin is None:
+        return annotation
+
+    args = t.get_args(annotation)
+    trusted_args = tuple(_get_trusted_annotation(arg) for arg in args)
+    if trusted_args == args:
+        return annotation
+
+    elif origin in (t.Union, types.UnionType):
+        return reduce(operator.or_, trusted_args)
+
+    return origin[trusted_args]
+
+
+@cache
+def get_trusted_model(model_class: type[ModelType]) -> type[ModelType]:
+    """Creates a subclass of the model whose url fields are not validated.
+
+    - Url validation dominates construction cost of models such as `SearchResultsModel`
+      and `DownloadableFilesMetadata`. The rest (field validators, nested models, dates etc)
+      still runs in pydantic-core.
+    - Url fields of the built instances are plain `str` instead of `HttpUrl`.
+
+    Args:
+        model_class (type[ModelType]): Pydantic model.
+
+    Returns:
+        type[ModelType]: Trusted variant of the model or the model itself when it has nothing to skip.
+    """
+    overridden_fields = {}
+    for name, field in model_class.model_fields.items():
+        trusted_annotation = _get_trusted_annotation(field.annotation)
+        if trusted_annotation is not field.annotation:
+            overridden_fields[name] = (trusted_annotation, field)
+
+    if not overridden_fields:
+        return model_class
+
+    return create_model(
+        model_class.__name__,
+        __base__=model_class,
+        __module__=model_class.__module__,
+        **overridden_fields,
+    )
+
+
+def build_model(model_class: type[ModelType], data: dict[str, t.Any], trusted: bool = False) -> ModelType:
+    """Builds model instance from data.
+
+    Args:
+        model_class (type[ModelType]): Pydantic model to build.
+        data (dict[str, t.Any]): Raw data as received from server.
+        trusted (bool, optional): Skip url validation using `get_trusted_model`. Defaults to False.
+
+    Returns:
+        ModelType: Built model instance
+    """
+    if trusted:
+        model_class = get_trusted_model(model_class)
+
+    return model_class.model_validate(data)
 
 
 @dataclass(frozen=True)
@@ -66,8 +144,9 @@ class ContentSubjectModel(BaseModel):
     # imdbRatingCount: int
 
     @field_validator("genre", mode="before")
-    def validate_genre(value: str) -> list[str]:
-        return value.split(",")
+    def validate_genre(value: str | list[str]) -> list[str]:
+        # Lists come from dumped models e.g those kept in the jobs database
+        return value.split(",") if isinstance(value, str) else value
 
 
 class ContentModel(BaseModel):
@@ -113,8 +192,8 @@ class ContentCategorySubjectsModel(ContentSubjectModel):
     hasResource: bool
 
     @field_validator("subtitles", mode="before")
-    def validate_subtitles(value: str) -> list[str]:
-        return value.split(",")
+    def validate_subtitles(value: str | list[str]) -> list[str]:
+        return value.split(",") if isinstance(value, str) else value
 
 
 class ContentCategoryModel(BaseModel):
@@ -172,12 +251,12 @@ class SearchResultsItem(ContentSubjectModel):
     imdbRatingCount: int | None = None  # None for TrendingResults
 
     @field_validator("ops", mode="before")
-    def validate_ops(value: str) -> dict:
-        return loads(value)
+    def validate_ops(value: str | dict) -> dict:
+        return loads(value) if isinstance(value, str) else value
 
     @field_validator("subtitles", mode="before")
-    def validate_subtitles(value: str) -> list[str]:
-        return value.split(",")
+    def validate_subtitles(value: str | list[str]) -> list[str]:
+        return value.split(",") if isinstance(value, str) else value
 
     @property
     def page_url(self) -> str:
@@ -240,6 +319,11 @@ class BaseFileMetadata(BaseModel):
         """Media file extension such as `mp4` or `srt`"""
         return get_file_extension(self.url)
 
+    @property
+    def expires_at(self) -> int | None:
+        """Unix timestamp after which the signed file url is no longer valid"""
+        return get_signed_url_expiry(self.url)
+
 
 class MediaFileMetadata(BaseFileMetadata):
     id: str
@@ -278,27 +362,57 @@ class DownloadableFilesMetadata(BaseModel):
 
         raise ZeroMediaFileError("There are no downloadable  mediafiles for the targeted item")
 
-    @property
+    # Selection indexes below are built once per instance on first use
+    # and assume `downloads` & `captions` are not mutated afterwards.
+
+    @cached_property
+    def media_files_by_size(self) -> tuple[MediaFileMetadata, ...]:
+        """Media files sorted by size in ascending order"""
+        return tuple(sorted(self.downloads, key=lambda media_file: media_file.size))
+
+    @cached_property
+    def captions_by_size(self) -> tuple[CaptionFileMetadata, ...]:
+        """Caption files sorted by size in ascending order"""
+        return tuple(sorted(self.captions, key=lambda caption: caption.size))
+
+    @cached_property
+    def resolution_media_file_map(self) -> t.Mapping[int, MediaFileMetadata]:
+        """Maps resolution to the first media file having it e.g { 720 : MediaFileMetadata }"""
+        resolution_media_file_map = {}
+        for media_file in self.downloads:
+            resolution_media_file_map.setdefault(media_file.resolution, media_file)
+        # Read-only since it is shared by all lookups
+        return types.MappingProxyType(resolution_media_file_map)
+
+    @cached_property
+    def _quality_downloads_map(self) -> dict[DownloadQualitiesType, MediaFileMetadata]:
+        return {f"{media_file.resolution}P": media_file for media_file in self.downloads}
+
+    @cached_property
+    def _language_subtitle_map(self) -> dict[str, CaptionFileMetadata]:
+        return {caption.lanName: caption for caption in self.captions}
+
+    @cached_property
+    def _language_short_subtitle_map(self) -> dict[str, CaptionFileMetadata]:
+        return {caption.lan: caption for caption in self.captions}
+
+    @cached_property
+    def expires_at(self) -> int | None:
+        """Unix timestamp after which the earliest expiring media file url is no longer valid"""
+        expiries = [media_file.expires_at for media_file in self.downloads]
+        return min((expiry for expiry in expiries if expiry is not None), default=None)
+
+    @cached_property
     def best_media_file(self) -> MediaFileMetadata:
         """Highest quality media file"""
         self._check_downloads()
-        if bool(self.downloads):
-            found = self.downloads[0]
-            for media_file in self.downloads[1:]:
-                if media_file.resolution > found.resolution:
-                    found = media_file
-            return found
+        return max(self.downloads, key=lambda media_file: media_file.resolution)
 
-    @property
+    @cached_property
     def worst_media_file(self) -> MediaFileMetadata:
         """Lowest quality media file"""
         self._check_downloads()
-        if bool(self.downloads):
-            found = self.downloads[0]
-            for media_file in self.downloads[1:]:
-                if media_file.resolution < found.resolution:
-                    found = media_file
-            return found
+        return min(self.downloads, key=lambda media_file: media_file.resolution)
 
     @property
     def english_subtitle_file(self) -> CaptionFileMetadata | None:
@@ -315,10 +429,7 @@ class DownloadableFilesMetadata(BaseModel):
         Returns:
             dict[DownloadQualitiesType, MediaFileMetadata]
         """
-        resolution_downloads_map = {}
-        for item in self.downloads:
-            resolution_downloads_map[f"{item.resolution}P"] = item
-        return resolution_downloads_map
+        return dict(self._quality_downloads_map)
 
     def get_media_file_by_resolution(self, resolution: int) -> MediaFileMetadata:
         """Get specific MediaFileMetadata based on resolution.
@@ -332,39 +443,92 @@ class DownloadableFilesMetadata(BaseModel):
         Raises:
             ValueError: Incase no media_file matched the resolution.
         """
-        available_media_file_resolutions = []
-        for media_file in self.downloads:
-            available_media_file_resolutions.append(media_file.resolution)
-            if media_file.resolution == resolution:
-                return media_file
-        raise ValueError(
-            "No media_file matched that resolution. Available resolutions "
-            f"include {available_media_file_resolutions}"
-        )
+        media_file = self.resolution_media_file_map.get(resolution)
+        if media_file is None:
+            raise ValueError(
+                "No media_file matched that resolution. Available resolutions "
+                f"include {[media_file.resolution for media_file in self.downloads]}"
+            )
+        return media_file
+
+    def get_media_file_by_quality(self, quality: DownloadQualitiesType) -> MediaFileMetadata | None:
+        """Get media file matching quality such as `BEST` or `720P`.
+
+        Args:
+            quality (DownloadQualitiesType): Target media quality.
+
+        Raises:
+            ZeroMediaFileError: Incase the downloads list is empty and quality is `BEST` or `WORST`.
+
+        Returns:
+            MediaFileMetadata | None: Media file matching the quality if any.
+        """
+        match quality:
+            case "BEST":
+                return self.best_media_file
+            case "WORST":
+                return self.worst_media_file
+            case _:
+                return self._quality_downloads_map.get(quality)
 
     def get_language_subtitle_map(
         self,
     ) -> dict[str, CaptionFileMetadata]:
         """Returns something like { English : CaptionFileMetadata }"""
-        language_subtitle_map = {}
-        for caption in self.captions:
-            language_subtitle_map[caption.lanName] = caption
-        return language_subtitle_map
+        return dict(self._language_subtitle_map)
 
     def get_language_short_subtitle_map(
         self,
     ) -> dict[str, CaptionFileMetadata]:
         """Returns something like { en : CaptionFileMetadata }"""
-        language_subtitle_map = {}
-        for caption in self.captions:
-            language_subtitle_map[caption.lan] = caption
-        return language_subtitle_map
+        return dict(self._language_short_subtitle_map)
 
     def get_subtitle_by_language(self, language: str) -> CaptionFileMetadata | None:
         """Both `English` and `en` will return same thing"""
         if len(language) == 2:
-            return self.get_language_short_subtitle_map().get(language.lower())
-        return self.get_language_subtitle_map().get(language.capitalize())
+            return self._language_short_subtitle_map.get(language.lower())
+        return self._language_subtitle_map.get(language.capitalize())
+
+    def select_files(
+        self, quality: DownloadQualitiesType = "BEST", languages: t.Iterable[str] = ()
+    ) -> "SelectedFiles":
+        """Chooses media file and caption files in one go.
+
+        Args:
+            quality (DownloadQualitiesType, optional): Target media quality. Defaults to "BEST".
+            languages (t.Iterable[str], optional): Caption languages such as `English` or `en`. Defaults to ().
+
+        Raises:
+            ZeroMediaFileError: Incase the downloads list is empty and quality is `BEST` or `WORST`.
+
+        Returns:
+            SelectedFiles: Chosen media file, captions and languages that had none.
+        """  # noqa: E501
+        captions, missing_languages = [], []
+        for language in languages:
+            caption = self.get_subtitle_by_language(language)
+            if caption is None:
+                missing_languages.append(language)
+            elif caption not in captions:
+                captions.append(caption)
+
+        return SelectedFiles(
+            media_file=self.get_media_file_by_quality(quality),
+            captions=tuple(captions),
+            missing_languages=tuple(missing_languages),
+        )
+
+
+@dataclass(frozen=True)
+class SelectedFiles:
+    """Files chosen by `DownloadableFilesMetadata.select_files`"""
+
+    media_file: MediaFileMetadata | None
+    """None incase no media file matched the quality"""
+    captions: tuple[CaptionFileMetadata, ...]
+    """Caption files in the order their languages were requested"""
+    missing_languages: tuple[str, ...]
+    """Requested languages without caption file"""
 
 
 class StreamFileMetadata(BaseModel):
@@ -0,0 +1,250 @@
+"""Dry-run planning of tv-series downloads.
+
+Downloadable files metadata of all the target episodes is fetched concurrently - at most
+`concurrency` requests at a time - and the media file of each episode is chosen just like
+the actual download would. Nothing is downloaded. The resulting `DownloadPlan` reports
+sizes per season and in total, captions availability and the time the download would
+take at the measured bandwidth. It can be saved as json and later handed to
+`Downloader.download_tv_series(plan=...)` to be executed without fetching the metadata
+again - media urls expiring in between are refreshed by the downloads themselves.
+"""
+
+import asyncio
+import time
+import typing as t
+from pathlib import Path
+
+import httpx
+from pydantic import BaseModel, Field
+
+from moviebox_api.bandwidth import get_bandwidth_governor
+from moviebox_api.constants import DEFAULT_METADATA_CONCURRENCY
+from moviebox_api.helpers import write_file_atomically
+from moviebox_api.library import LibraryIndex
+from moviebox_api.models import DownloadableFilesMetadata, MediaFileMetadata, SearchResultsItem
+from moviebox_api.quality import QualityPolicy
+from moviebox_api.ranged import TunedTasksStore
+
+if t.TYPE_CHECKING:
+    from moviebox_api.download import BaseDownloadableFilesDetail
+
+__all__ = ["DownloadPlan", "EpisodesDownloadPlanner", "PlannedEpisode", "measured_bandwidth"]
+
+
+def measured_bandwidth(
+    hosts: t.Iterable[str], tuned_tasks_store: TunedTasksStore | None = None
+) -> float | None:
+    """Bytes per second a download from the hosts is expected to achieve.
+
+    Uses the best throughput recorded while tuning connections for any of the hosts,
+    capped by the current rate of the process-wide bandwidth governor.
+
+    Args:
+        hosts (t.Iterable[str]): Hosts serving the media files.
+        tuned_tasks_store (TunedTasksStore | None, optional): Recorded throughputs. Defaults to TunedTasksStore().
+
+    Returns:
+        float | None: Expected bytes per second. None when neither is known.
+    """  # noqa: E501
+    tuned = (tuned_tasks_store or TunedTasksStore()).load()
+    throughput = max(
+        (tuned[host]["throughput"] for host in hosts if tuned.get(host, {}).get("throughput")),
+        default=None,
+    )
+    rate = get_bandwidth_governor().current_rate()
+
+    if throughput is None or rate is None:
+        return rate if throughput is None else throughput
+    return min(throughput, rate)
+
+
+class PlannedEpisode(BaseModel):
+    """Episode to be downloaded along with the files chosen for it"""
+
+    season: int
+    episode: int
+    media_file: MediaFileMetadata
+    captions: list[str] = Field(default_factory=list)
+    """Requested caption languages the episode has"""
+    missing_captions: list[str] = Field(default_factory=list)
+    """Requested caption languages the episode lacks"""
+    metadata: DownloadableFilesMetadata
+    """Downloadable files metadata the choice was made from"""
+
+
+class DownloadPlan(BaseModel):
+    """Outcome of planning a tv-series download. Serialisable to and from json."""
+
+    item: SearchResultsItem
+    quality_policy: QualityPolicy
+    languages: list[str] = Field(default_factory=list)
+    episodes: list[PlannedEpisode]
+    present_episodes: list[tuple[int, int]] = Field(default_factory=list)
+    """(season, episode) pairs left out since the library has them already"""
+    bandwidth: float | None = None
+    """Bytes per second expected while downloading"""
+    created_at: int = Field(default_factory=lambda: int(time.time()))
+
+    @property
+    def total_size(self) -> int:
+        """Bytes of all the planned media files"""
+        return sum(planned.media_file.size for planned in self.episodes)
+
+    @property
+    def season_sizes(self) -> dict[int, int]:
+        """Bytes of the planned media files of each season"""
+        season_sizes: dict[int, int] = {}
+        for planned in self.episodes:
+            season_sizes[planned.season] = season_sizes.get(planned.season, 0) + planned.media_file.size
+        return season_sizes
+
+    @property
+    def estimated_duration(self) -> float | None:
+        """Seconds downloading the media files would take at `bandwidth`. None when it's unknown."""
+        if not self.bandwidth:
+            return None
+        return self.total_size / self.bandwidth
+
+    @property
+    def target_episodes(self) -> list[tuple[int, int]]:
+        """(season, episode) pairs of the plan"""
+        return [(planned.season, planned.episode) for planned in self.episodes]
+
+    @property
+    def episodes_metadata(self) -> dict[tuple[int, int], DownloadableFilesMetadata]:
+        """Downloadable files metadata of each episode"""
+        return {(planned.season, planned.episode): planned.metadata for planned in self.episodes}
+
+    @property
+    def media_files(self) -> dict[tuple[int, int], MediaFileMetadata]:
+        """Media file chosen for each episode"""
+        return {(planned.season, planned.episode): planned.media_file for planned in self.episodes}
+
+    def save(self, path: Path | str) -> Path:
+        """Writes the plan to a json file"""
+        # Urls of trusted metadata are plain strings and serialize as they are
+        return write_file_atomically(path, self.model_dump_json(indent=4, warnings=False).encode())
+
+    @classmethod
+    def load(cls, path: Path | str) -> "DownloadPlan":
+        """Reads a plan saved with `save`"""
+        return cls.model_validate_json(Path(path).read_bytes())
+
+
+class EpisodesDownloadPlanner:
+    """Plans downloads of tv-series episodes without downloading anything.
+
+    For instance:
+
+    ```python
+    planner = EpisodesDownloadPlanner(downloadable_files, QualityPolicy("720P"), languages=["English"])
+    plan = await planner.plan([(1, 1), (1, 2), (2, 1)])
+    print(plan.season_sizes, plan.total_size, plan.estimated_duration)
+    ```
+    """
+
+    def __init__(
+        self,
+        downloadable_files: "BaseDownloadableFilesDetail",
+        quality_policy: QualityPolicy | None = None,
+        languages: t.Iterable[str] = (),
+        concurrency: int = DEFAULT_METADATA_CONCURRENCY,
+        bandwidth: float | None = None,
+        library: LibraryIndex | None = None,
+    ):
+        """Constructor for `EpisodesDownloadPlanner`
+
+        Args:
+            downloadable_files (BaseDownloadableFilesDetail): Fetches downloadable files metadata of the series.
+            quality_policy (QualityPolicy | None, optional): Chooses media file of each episode. Defaults to QualityPolicy().
+            languages (t.Iterable[str], optional): Caption languages to check availability of e.g `English` or `en`. Defaults to ().
+            concurrency (int, optional): Most metadata requests made at once. Defaults to DEFAULT_METADATA_CONCURRENCY.
+            bandwidth (float | None, optional): Expected bytes per second. Defaults to None (measured).
+            library (LibraryIndex | None, optional): Leave out episodes present in this index. Defaults to None.
+        """  # noqa: E501
+        assert concurrency > 0, f"Value for concurrency should be atleast 1 not {concurrency}"
+        self.downloadable_files = downloadable_files
+        self.quality_policy = QualityPolicy() if quality_policy is None else quality_policy
+        self.languages = list(languages)
+        self.concurrency = concurrency
+        self.bandwidth = bandwidth
+        self.library = library
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} quality_policy={self.quality_policy!r} "
+            f"concurrency={self.concurrency}>"
+        )
+
+    async def fetch_metadata(
+        self, episodes: t.Iterable[tuple[int, int]]
+    ) -> dict[tuple[int, int], DownloadableFilesMetadata]:
+        """Fetches downloadable files metadata of the episodes, at most `concurrency` at a time"""
+        episodes = list(episodes)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(season: int, episode: int) -> DownloadableFilesMetadata:
+            async with semaphore:
+                return await self.downloadable_files.get_content_model(season=season, episode=episode)
+
+        episodes_metadata = await asyncio.gather(*(fetch(season, episode) for season, episode in episodes))
+        return dict(zip(episodes, episodes_metadata))
+
+    async def plan(self, episodes: t.Iterable[tuple[int, int]]) -> DownloadPlan:
+        """Chooses files of the episodes
+
+        Args:
+            episodes (t.Iterable[tuple[int, int]]): (season, episode) pairs to plan.
+
+        Raises:
+            QualityUnavailableError: Incase the quality policy cannot be satisfied.
+
+        Returns:
+            DownloadPlan: Episodes in order along with their chosen media files.
+        """
+        item: SearchResultsItem = self.downloadable_files._item
+        episodes = sorted(set(episodes))
+        present_episodes = (
+            []
+            if self.library is None
+            else sorted(self.library.find_many(item.subjectId, episodes, self.quality_policy.quality))
+        )
+        episodes_metadata = await self.fetch_metadata(
+            season_episode for season_episode in episodes if season_episode not in present_episodes
+        )
+        media_files = self.quality_policy.plan(
+            episodes_metadata, durations=dict.fromkeys(episodes_metadata, item.duration)
+        )
+        planned_episodes = []
+
+        for (season, episode), metadata in episodes_metadata.items():
+            captions, missing_captions = [], []
+            for language in self.languages:
+                has_caption = metadata.get_subtitle_by_language(language) is not None
+                (captions if has_caption else missing_captions).append(language)
+
+            planned_episodes.append(
+                PlannedEpisode(
+                    season=season,
+                    episode=episode,
+                    media_file=media_files[(season, episode)],
+                    captions=captions,
+                    missing_captions=missing_captions,
+                    metadata=metadata,
+                )
+            )
+
+        bandwidth = self.bandwidth
+        if bandwidth is None:
+            bandwidth = measured_bandwidth(
+                {httpx.URL(str(media_file.url)).host for media_file in media_files.values()}
+            )
+
+        return DownloadPlan(
+            item=item,
+            quality_policy=self.quality_policy,
+            languages=self.languages,
+            episodes=planned_episodes,
+            present_episodes=present_episodes,
+            bandwidth=bandwidth,
+        )
@@ -0,0 +1,299 @@
+"""Bulk availability checks of media and caption files.
+
+Unlike `run(test=True)` of the downloaders which checks one download at a time, many
+movies and episodes are checked at once: downloadable files metadata is fetched with at
+most `metadata_concurrency` requests at a time, then the chosen media file and requested
+captions are probed with a single-byte range request each - at most `concurrency` at a
+time. The outcome is a compact availability matrix of items by episodes.
+"""
+
+import asyncio
+import typing as t
+from dataclasses import dataclass, field
+
+import httpx
+
+from moviebox_api._bases import BaseMovieboxException
+from moviebox_api.constants import (
+    DEFAULT_METADATA_CONCURRENCY,
+    DEFAULT_PROBE_CONCURRENCY,
+    DOWNLOAD_REQUEST_HEADERS,
+)
+from moviebox_api.models import DownloadableFilesMetadata, SearchResultsItem
+from moviebox_api.quality import QualityPolicy
+
+if t.TYPE_CHECKING:
+    from moviebox_api.download import BaseDownloadableFilesDetail
+
+__all__ = [
+    "AvailabilityProber",
+    "EpisodeAvailability",
+    "ItemAvailability",
+    "ProbeResult",
+    "ProbeTarget",
+    "probe_url",
+]
+
+REACHABLE_STATUS_CODES = (200, 206)
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Response of a file url to a probe request"""
+
+    url: str
+    status_code: int | None = None
+    size: int | None = None
+    """Total bytes of the file as reported by the server"""
+    error: str | None = None
+
+    @property
+    def reachable(self) -> bool:
+        return self.status_code in REACHABLE_STATUS_CODES
+
+
+async def probe_url(
+    client: httpx.AsyncClient, url: str, method: t.Literal["GET", "HEAD"] = "GET"
+) -> ProbeResult:
+    """Checks whether a file url is reachable without downloading it.
+
+    Args:
+        client (httpx.AsyncClient): Client to make the request with.
+        url (str): File url.
+        method (t.Literal["GET", "HEAD"], optional): GET requests the first byte only. Defaults to "GET".
+
+    Returns:
+        ProbeResult: Status code and size of the file or the error met.
+    """
+    headers = {"Range": "bytes=0-0"} if method == "GET" else {}
+
+    try:
+        async with client.stream(method, url, headers=headers) as response:
+            content_range = response.headers.get("content-range", "")
+            if "/" in content_range and not content_range.endswith("/*"):
+                size = int(content_range.rsplit("/", 1)[1])
+            elif response.status_code == 200 and "content-length" in response.headers:
+                size = int(response.headers["content-length"])
+            else:
+                size = None
+            return ProbeResult(url=url, status_code=response.status_code, size=size)
+
+    except httpx.HTTPError as e:
+        return ProbeResult(url=url, error=repr(e))
+
+
+@dataclass(frozen=True)
+class ProbeTarget:
+    """Movie or episodes of a tv-series to probe"""
+
+    downloadable_files: "BaseDownloadableFilesDetail"
+    episodes: tuple[tuple[int, int], ...] = ((0, 0),)
+    """(season, episode) pairs. Defaults to ((0, 0),) for a movie."""
+
+
+@dataclass(frozen=True)
+class EpisodeAvailability:
+    """Availability of a movie or episode. Movies have season and episode 0."""
+
+    season: int
+    episode: int
+    resolution: int | None = None
+    """Resolution of the media file chosen by the quality policy"""
+    expected_size: int | None = None
+    media: ProbeResult | None = None
+    captions: dict[str, ProbeResult | None] = field(default_factory=dict)
+    """Probe result of each requested caption language. None when the item lacks it."""
+    error: str | None = None
+    """Reason the media file could not be probed at all"""
+
+    @property
+    def available(self) -> bool:
+        """Checks whether the media file is reachable with the expected size"""
+        return (
+            self.media is not None
+            and self.media.reachable
+            and (self.media.size is None or self.media.size == self.expected_size)
+        )
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Compact json serializable form"""
+        return dict(
+            season=self.season,
+            episode=self.episode,
+            available=self.available,
+            resolution=self.resolution,
+            status=None if self.media is None else self.media.status_code,
+            captions={
+                language: caption is not None and caption.reachable
+                for language, caption in self.captions.items()
+            },
+            error=self.error or (None if self.media is None else self.media.error),
+        )
+
+
+@dataclass(frozen=True)
+class ItemAvailability:
+    """Availability of a movie or the targeted episodes of a tv-series"""
+
+    item: SearchResultsItem
+    episodes: list[EpisodeAvailability]
+
+    @property
+    def available_count(self) -> int:
+        return sum(episode.available for episode in self.episodes)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Compact json serializable form"""
+        return dict(
+            subject_id=self.item.subjectId,
+            title=self.item.title,
+            available=self.available_count,
+            total=len(self.episodes),
+            episodes=[episode.to_dict() for episode in self.episodes],
+        )
+
+
+class AvailabilityProber:
+    """Checks reachability of media and caption files of many movies and episodes at once.
+
+    For instance:
+
+    ```python
+    async with AvailabilityProber(QualityPolicy("720P"), languages=["English"]) as prober:
+        matrix = await prober.probe(
+            [
+                ProbeTarget(DownloadableMovieFilesDetail(session, movie)),
+                ProbeTarget(DownloadableTVSeriesFilesDetail(session, series), ((1, 1), (1, 2))),
+            ]
+        )
+    print([item.to_dict() for item in matrix])
+    ```
+    """
+
+    def __init__(
+        self,
+        quality_policy: QualityPolicy | None = None,
+        languages: t.Iterable[str] = (),
+        concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+        metadata_concurrency: int = DEFAULT_METADATA_CONCURRENCY,
+        method: t.Literal["GET", "HEAD"] = "GET",
+        client: httpx.AsyncClient | None = None,
+        **httpx_kwargs,
+    ):
+        """Constructor for `AvailabilityProber`
+
+        Args:
+            quality_policy (QualityPolicy | None, optional): Chooses the media file to probe. Defaults to QualityPolicy().
+            languages (t.Iterable[str], optional): Caption languages to probe e.g `English` or `en`. Defaults to ().
+            concurrency (int, optional): Most file probes made at once. Defaults to DEFAULT_PROBE_CONCURRENCY.
+            metadata_concurrency (int, optional): Most metadata requests made at once. Defaults to DEFAULT_METADATA_CONCURRENCY.
+            method (t.Literal["GET", "HEAD"], optional): Request method of the probes. Defaults to "GET" (first byte only).
+            client (httpx.AsyncClient | None, optional): Client for the probes. Defaults to None (own client).
+
+        httpx_kwargs : Keyword arguments for `httpx.AsyncClient` when creating own client
+        """  # noqa: E501
+        assert concurrency > 0, f"Value for concurrency should be atleast 1 not {concurrency}"
+        assert metadata_concurrency > 0, (
+            f"Value for metadata_concurrency should be atleast 1 not {metadata_concurrency}"
+        )
+        self.quality_policy = QualityPolicy() if quality_policy is None else quality_policy
+        self.languages = list(languages)
+        self.method = method
+        self._owns_client = client is None
+        httpx_kwargs.setdefault("headers", DOWNLOAD_REQUEST_HEADERS)
+        httpx_kwargs.setdefault("follow_redirects", True)
+        self.client = httpx.AsyncClient(**httpx_kwargs) if client is None else client
+        self._probes = asyncio.Semaphore(concurrency)
+        self._metadata_requests = asyncio.Semaphore(metadata_concurrency)
+
+    def __repr__(self) -> str:
+        return f"<{self.__module__}.{self.__class__.__name__} quality_policy={self.quality_policy!r}>"
+
+    async def __aenter__(self) -> "AvailabilityProber":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes own http client"""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _probe(self, url: str) -> ProbeResult:
+        async with self._probes:
+            return await probe_url(self.client, url, self.method)
+
+    async def _get_metadata(
+        self, downloadable_files: "BaseDownloadableFilesDetail", season: int, episode: int
+    ) -> DownloadableFilesMetadata:
+        async with self._metadata_requests:
+            if season == 0 and episode == 0:
+                # Movie
+                return await downloadable_files.get_content_model()
+            return await downloadable_files.get_content_model(season=season, episode=episode)
+
+    async def probe_episode(
+        self, downloadable_files: "BaseDownloadableFilesDetail", season: int = 0, episode: int = 0
+    ) -> EpisodeAvailability:
+        """Checks availability of a movie or an episode
+
+        Args:
+            downloadable_files (BaseDownloadableFilesDetail): Fetches downloadable files metadata of the item.
+            season (int, optional): Season number of the episode. Defaults to 0 for a movie.
+            episode (int, optional): Episode number. Defaults to 0 for a movie.
+
+        Returns:
+            EpisodeAvailability: Probe results of the chosen media file and requested captions.
+        """
+        try:
+            metadata = await self._get_metadata(downloadable_files, season, episode)
+            media_file = self.quality_policy.select(metadata, downloadable_files._item.duration)
+
+        except (httpx.HTTPError, BaseMovieboxException) as e:
+            return EpisodeAvailability(season=season, episode=episode, error=repr(e))
+
+        caption_files = {language: metadata.get_subtitle_by_language(language) for language in self.languages}
+        media, *captions = await asyncio.gather(
+            self._probe(str(media_file.url)),
+            *(self._probe(str(caption_file.url)) for caption_file in caption_files.values() if caption_file),
+        )
+        captions = iter(captions)
+
+        return EpisodeAvailability(
+            season=season,
+            episode=episode,
+            resolution=media_file.resolution,
+            expected_size=media_file.size,
+            media=media,
+            captions={
+                language: None if caption_file is None else next(captions)
+                for language, caption_file in caption_files.items()
+            },
+        )
+
+    async def probe(self, targets: t.Iterable[ProbeTarget]) -> list[ItemAvailability]:
+        """Checks availability of all the targets concurrently
+
+        Args:
+            targets (t.Iterable[ProbeTarget]): Movies and episodes of tv-series.
+
+        Returns:
+            list[ItemAvailability]: Availability of each target in the same order.
+        """
+        targets = list(targets)
+        results = await asyncio.gather(
+            *(
+                asyncio.gather(
+                    *(
+                        self.probe_episode(target.downloadable_files, season, episode)
+                        for season, episode in target.episodes
+                    )
+                )
+                for target in targets
+            )
+        )
+        return [
+            ItemAvailability(item=target.downloadable_files._item, episodes=list(episodes))
+            for target, episodes in zip(targets, results)
+        ]
@@ -0,0 +1,205 @@
+"""Size-budget aware selection of the media file to download.
+
+A `QualityPolicy` ranks the media files of an item by how close they are to the target
+quality and leaves out the ones breaking its constraints - a byte budget per file or a
+most average bitrate given the item duration. When the exact quality is missing or too
+big, the nearest fitting one is picked instead. For a whole season, `QualityPolicy.plan`
+additionally keeps the total size within a byte budget, lowering the quality of the
+biggest episodes first so that the same metadata always yields the same plan.
+"""
+
+import heapq
+from dataclasses import dataclass
+
+from throttlebuster.helpers import get_filesize_string
+
+from moviebox_api import logger
+from moviebox_api.constants import DOWNLOAD_QUALITIES, DownloadQualitiesType
+from moviebox_api.exceptions import QualityUnavailableError
+from moviebox_api.helpers import assert_membership
+from moviebox_api.models import DownloadableFilesMetadata, MediaFileMetadata
+
+__all__ = ["QualityPolicy", "bitrate_of"]
+
+EpisodeKeyType = tuple[int, int]
+"""(season, episode) pair"""
+
+
+def bitrate_of(media_file: MediaFileMetadata, duration: int | None) -> float | None:
+    """Average bits per second of a media file lasting `duration` seconds. None when unknown."""
+    if not duration:
+        return None
+    return media_file.size * 8 / duration
+
+
+def describe_media_files(media_files: list[MediaFileMetadata]) -> str:
+    """Text listing qualities and sizes of media files e.g `720P (310.5 MB), 1080P (1.2 GB)`"""
+    return ", ".join(
+        f"{media_file.resolution}P ({get_filesize_string(media_file.size)})"
+        for media_file in sorted(media_files, key=lambda media_file: media_file.resolution)
+    )
+
+
+@dataclass(frozen=True)
+class QualityPolicy:
+    """Rules for choosing one media file out of the available qualities"""
+
+    quality: DownloadQualitiesType = "BEST"
+    """Target quality such as `720P`, `BEST` or `WORST`"""
+    max_file_size: int | None = None
+    """Most bytes of a single media file"""
+    max_bitrate: float | None = None
+    """Most average bits per second of a media file. Ignored when the duration is unknown."""
+    season_budget: int | None = None
+    """Most bytes of all the media files planned together"""
+    fallback: bool = True
+    """Pick the nearest quality when the target one is missing or breaks the constraints"""
+
+    def __post_init__(self):
+        assert_membership(self.quality, DOWNLOAD_QUALITIES, "quality")
+
+    def fits(self, media_file: MediaFileMetadata, duration: int | None = None) -> bool:
+        """Checks whether a media file satisfies the per-file constraints"""
+        if self.max_file_size is not None and media_file.size > self.max_file_size:
+            return False
+
+        bitrate = bitrate_of(media_file, duration)
+        if self.max_bitrate is not None and bitrate is not None and bitrate > self.max_bitrate:
+            return False
+
+        return True
+
+    def _preference_key(self, media_file: MediaFileMetadata) -> tuple:
+        match self.quality:
+            case "BEST":
+                key = (-media_file.resolution,)
+            case "WORST":
+                key = (media_file.resolution,)
+            case _:
+                target = int(self.quality.removesuffix("P"))
+                # Equally near qualities favour the lower one
+                key = (abs(media_file.resolution - target), media_file.resolution)
+
+        return (*key, media_file.size, media_file.id)
+
+    def rank(
+        self, downloadable_metadata: DownloadableFilesMetadata, duration: int | None = None
+    ) -> list[MediaFileMetadata]:
+        """Media files satisfying the per-file constraints, most preferred first
+
+        Args:
+            downloadable_metadata (DownloadableFilesMetadata): Downloadable files metadata.
+            duration (int | None, optional): Seconds the item lasts. Defaults to None.
+
+        Returns:
+            list[MediaFileMetadata]: Candidates in order of preference.
+        """
+        downloadable_metadata._check_downloads()
+        candidates = sorted(
+            (media_file for media_file in downloadable_metadata.downloads if self.fits(media_file, duration)),
+            key=self._preference_key,
+        )
+
+        if not self.fallback and self.quality not in ("BEST", "WORST"):
+            candidates = [
+                media_file for media_file in candidates if f"{media_file.resolution}P" == self.quality
+            ]
+
+        return candidates
+
+    def select(
+        self, downloadable_metadata: DownloadableFilesMetadata, duration: int | None = None
+    ) -> MediaFileMetadata:
+        """Picks the media file to download
+
+        Args:
+            downloadable_metadata (DownloadableFilesMetadata): Downloadable files metadata.
+            duration (int | None, optional): Seconds the item lasts. Defaults to None.
+
+        Raises:
+            QualityUnavailableError: Incase no media file satisfies the policy.
+
+        Returns:
+            MediaFileMetadata: Most preferred media file satisfying the policy.
+        """
+        candidates = self.rank(downloadable_metadata, duration)
+
+        if not candidates:
+            raise QualityUnavailableError(
+                f"No media file satisfies {self!r}. "
+                f"Available qualities are {describe_media_files(downloadable_metadata.downloads)}"
+            )
+
+        if self.quality not in ("BEST", "WORST") and f"{candidates[0].resolution}P" != self.quality:
+            logger.info(f"Falling back to {candidates[0].resolution}P from {self.quality} for {self!r}")
+
+        return candidates[0]
+
+    def plan(
+        self,
+        episodes_metadata: dict[EpisodeKeyType, DownloadableFilesMetadata],
+        durations: dict[EpisodeKeyType, int | None] | None = None,
+    ) -> dict[EpisodeKeyType, MediaFileMetadata]:
+        """Picks media files of several episodes at once keeping their total size within `season_budget`
+
+        Each episode starts at its most preferred media file. While the total exceeds the
+        budget, the episode having the biggest planned file - the earliest one on ties - is
+        moved to its next preferred file that is smaller.
+
+        Args:
+            episodes_metadata (dict[EpisodeKeyType, DownloadableFilesMetadata]): Downloadable files metadata of each episode.
+            durations (dict[EpisodeKeyType, int | None] | None, optional): Seconds each episode lasts. Defaults to None.
+
+        Raises:
+            QualityUnavailableError: Incase an episode has no fitting media file or even the smallest ones exceed the budget.
+
+        Returns:
+            dict[EpisodeKeyType, MediaFileMetadata]: Media file to download for each episode in episodes order.
+        """  # noqa: E501
+        durations = durations or {}
+        candidates: dict[EpisodeKeyType, list[MediaFileMetadata]] = {}
+        positions: dict[EpisodeKeyType, int] = {}
+
+        for key in sorted(episodes_metadata):
+            candidates[key] = self.rank(episodes_metadata[key], durations.get(key))
+            positions[key] = 0
+
+            if not candidates[key]:
+                raise QualityUnavailableError(
+                    f"No media file of S{key[0]}E{key[1]} satisfies {self!r}. Available qualities are "
+                    f"{describe_media_files(episodes_metadata[key].downloads)}"
+                )
+
+        total_size = sum(episode_candidates[0].size for episode_candidates in candidates.values())
+
+        if self.season_budget is not None:
+            biggest = [(-candidates[key][0].size, key) for key in candidates]
+            heapq.heapify(biggest)
+
+            while total_size > self.season_budget and biggest:
+                _, key = heapq.heappop(biggest)
+                current = candidates[key][positions[key]]
+                smaller = next(
+                    (
+                        position
+                        for position in range(positions[key] + 1, len(candidates[key]))
+                        if candidates[key][position].size < current.size
+                    ),
+                    None,
+                )
+                if smaller is None:
+                    # Already at its smallest fitting file
+                    continue
+
+                positions[key] = smaller
+                total_size -= current.size - candidates[key][smaller].size
+                heapq.heappush(biggest, (-candidates[key][smaller].size, key))
+
+            if total_size > self.season_budget:
+                raise QualityUnavailableError(
+                    f"Smallest fitting media files of {len(candidates)} episodes sum up to "
+                    f"{get_filesize_string(total_size)} exceeding the budget of "
+                    f"{get_filesize_string(self.season_budget)}"
+                )
+
+        return {key: candidates[key][positions[key]] for key in candidates}
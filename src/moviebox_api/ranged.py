@@ -0,0 +1,1421 @@
+"""Merge-free ranged downloads.
+
+Each byte range is written straight to its offset in a sink (by default the final
+file, preallocated) instead of separate part files that get merged afterwards.
+Completed ranges are recorded in a small sidecar manifest for resuming. Connections that
+finish early take over half of the largest remaining range and slow ones are restarted.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import os
+import statistics
+import threading
+import time
+import typing as t
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+from throttlebuster import DownloadedFile, DownloadTracker
+from throttlebuster.exceptions import FilesizeNotFoundError, IncompatibleServerError
+from throttlebuster.helpers import CustomTqdm, get_filesize_string, sanitize_filename
+
+from moviebox_api import logger
+from moviebox_api.checksums import BlockHasher, FileChecksums, compute_checksums, file_block_reader
+from moviebox_api.constants import (
+    DEFAULT_AUTO_TASKS_LIMIT,
+    DEFAULT_AUTO_TASKS_START,
+    DEFAULT_CHECKSUM_ALGORITHM,
+    DEFAULT_CHECKSUM_BLOCK_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MIN_STEAL_SIZE,
+    DEFAULT_READ_TIMEOUT_ATTEMPTS,
+    DEFAULT_REORDER_BUFFER_SIZE,
+    DEFAULT_SIGNED_URL_EXPIRY_MARGIN,
+    DEFAULT_SLOW_TASK_GRACE,
+    DEFAULT_SLOW_TASK_RATIO,
+    DEFAULT_TASKS,
+    EXPIRED_URL_STATUS_CODES,
+    THROTTLING_STATUS_CODES,
+    TUNED_TASKS_PATH,
+    DownloadMode,
+)
+from moviebox_api.exceptions import DownloadIntegrityError
+from moviebox_api.helpers import get_signed_url_expiry, write_file_atomically
+
+if t.TYPE_CHECKING:
+    from throttlebuster import ThrottleBuster
+
+__all__ = [
+    "ByteRange",
+    "RangeManifest",
+    "BaseSink",
+    "PositionalFileSink",
+    "HashingSink",
+    "OrderedStreamSink",
+    "file_object_consumer",
+    "RangedDownloader",
+    "RefreshableUrl",
+    "DownloadSource",
+    "DownloadSources",
+    "TasksTuner",
+    "TunedTasksStore",
+    "download_merge_free",
+]
+
+RETRIABLE_ERRORS = (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.ReadError)
+"""Errors after which a range download is retried from where it stopped"""
+
+
+@dataclass
+class ByteRange:
+    """Span of bytes from `start` (inclusive) to `end` (exclusive)"""
+
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+    @property
+    def header(self) -> str:
+        """Value for the http `Range` header"""
+        return f"bytes={self.start}-{self.end - 1}"
+
+    def split(self, parts: int) -> list["ByteRange"]:
+        """Splits the range into `parts` ranges of almost equal sizes"""
+        parts = max(1, min(parts, self.size))
+        base_size, remainder = divmod(self.size, parts)
+        ranges, start = [], self.start
+        for index in range(parts):
+            end = start + base_size + (1 if index < remainder else 0)
+            ranges.append(ByteRange(start, end))
+            start = end
+        return ranges
+
+
+@dataclass
+class RangeManifest:
+    """Sidecar file recording completed byte ranges of a merge-free download"""
+
+    path: Path
+    size: int
+    etag: str | None = None
+    completed: list[list[int]] = field(default_factory=list)
+    """Sorted, non-overlapping [start, end) spans already written"""
+
+    suffix: t.ClassVar[str] = ".ranges.json"
+
+    @classmethod
+    def path_for(cls, saved_to: Path) -> Path:
+        """Manifest path of a downloaded file"""
+        return saved_to.with_name(saved_to.name + cls.suffix)
+
+    @classmethod
+    def load(cls, path: Path) -> "RangeManifest | None":
+        """Reads manifest from path. Returns None incase it's missing or unreadable."""
+        try:
+            with open(path) as fh:
+                details = json.load(fh)
+            return cls(path=path, size=details["size"], etag=details["etag"], completed=details["completed"])
+
+        except (OSError, ValueError, KeyError) as e:
+            if path.exists():
+                logger.warning(f'Ignoring unreadable ranges manifest "{path}" - {e!r}')
+            return None
+
+    def save(self) -> None:
+        write_file_atomically(
+            self.path,
+            json.dumps({"size": self.size, "etag": self.etag, "completed": self.completed}).encode(),
+        )
+
+    def remove(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+    def matches(self, size: int, etag: str | None) -> bool:
+        """Checks whether the manifest belongs to a file of that size and etag"""
+        return self.size == size and (self.etag is None or etag is None or self.etag == etag)
+
+    def mark_completed(self, start: int, end: int) -> None:
+        """Records span [start, end) as written, merging it with adjacent ones"""
+        merged = []
+        for span_start, span_end in self.completed:
+            if span_end < start or span_start > end:
+                merged.append([span_start, span_end])
+            else:
+                start, end = min(start, span_start), max(end, span_end)
+        merged.append([start, end])
+        merged.sort()
+        self.completed = merged
+
+    @property
+    def completed_size(self) -> int:
+        return sum(end - start for start, end in self.completed)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.completed == [[0, self.size]]
+
+    def remaining(self) -> list[ByteRange]:
+        """Byte ranges yet to be written"""
+        remaining, position = [], 0
+        for start, end in self.completed:
+            if start > position:
+                remaining.append(ByteRange(position, start))
+            position = max(position, end)
+        if position < self.size:
+            remaining.append(ByteRange(position, self.size))
+        return remaining
+
+
+class BaseSink(ABC):
+    """Destination of downloaded bytes which may arrive in any order"""
+
+    window_size: int | None = None
+    """Bytes past the first missing one the sink takes at once. None means any offset."""
+
+    @abstractmethod
+    async def open(self, size: int, resume: bool = False) -> None:
+        """Prepares the sink for receiving `size` bytes.
+
+        Args:
+            size (int): Total size of the file.
+            resume (bool, optional): Keep bytes written by a previous download. Defaults to False.
+        """
+        raise NotImplementedError("Function needs to be implemented in subclass.")
+
+    @abstractmethod
+    async def write(self, offset: int, data: bytes) -> None:
+        """Writes data at offset"""
+        raise NotImplementedError("Function needs to be implemented in subclass.")
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Finalizes the sink after all bytes have been written"""
+        raise NotImplementedError("Function needs to be implemented in subclass.")
+
+    async def abort(self) -> None:
+        """Releases the sink after a failed download. Written bytes are kept for resuming."""
+        await self.close()
+
+    def remaining(self, size: int) -> list[ByteRange]:
+        """Ranges still to be written once the sink is open. All bytes unless it resumes by itself."""
+        return [ByteRange(0, size)] if size else []
+
+
+class PositionalFileSink(BaseSink):
+    """Writes bytes straight to their offsets in a preallocated file"""
+
+    def __init__(self, path: Path | str, preallocate: bool = True):
+        """Constructor for `PositionalFileSink`
+
+        Args:
+            path (Path | str): Path of the final file.
+            preallocate (bool, optional): Reserve disk space for the whole file upfront where supported. Defaults to True.
+        """  # noqa: E501
+        self.path = Path(path)
+        self.preallocate = preallocate
+        self._fd: int | None = None
+        self._lock = threading.Lock()
+        """Guards seek+write on platforms lacking `os.pwrite`"""
+        self._operations: set[asyncio.Future] = set()
+        """File operations running in threads, including those whose callers got cancelled"""
+
+    def __repr__(self) -> str:
+        return f'<{self.__module__}.{self.__class__.__name__} path="{self.path}">'
+
+    async def _run_in_thread(self, function: t.Callable, *args) -> None:
+        operation = asyncio.ensure_future(asyncio.to_thread(function, *args))
+        self._operations.add(operation)
+        operation.add_done_callback(self._operations.discard)
+        # Cancelling the caller does not stop the thread hence the operation is left to `close`
+        await asyncio.shield(operation)
+
+    def _open(self, size: int, resume: bool) -> None:
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        if not resume:
+            flags |= os.O_TRUNC
+
+        self._fd = os.open(self.path, flags, 0o644)
+
+        if os.fstat(self._fd).st_size != size:
+            os.ftruncate(self._fd, size)
+
+        if self.preallocate and hasattr(os, "posix_fallocate") and size:
+            with contextlib.suppress(OSError):
+                # Not every filesystem supports it - sparse file is just fine then
+                os.posix_fallocate(self._fd, 0, size)
+
+    def _write(self, offset: int, data: bytes) -> None:
+        if hasattr(os, "pwrite"):
+            os.pwrite(self._fd, data, offset)
+        else:
+            with self._lock:
+                os.lseek(self._fd, offset, os.SEEK_SET)
+                os.write(self._fd, data)
+
+    async def open(self, size: int, resume: bool = False) -> None:
+        # Preallocating a large file can block for a while
+        await self._run_in_thread(self._open, size, resume)
+
+    async def write(self, offset: int, data: bytes) -> None:
+        await self._run_in_thread(self._write, offset, data)
+
+    async def close(self) -> None:
+        # The file descriptor may only be closed once no thread writes to it
+        await asyncio.gather(*self._operations, return_exceptions=True)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class HashingSink(BaseSink):
+    """Hashes bytes block by block as they are written to another sink"""
+
+    def __init__(
+        self,
+        sink: BaseSink,
+        algorithm: str = DEFAULT_CHECKSUM_ALGORITHM,
+        block_size: int = DEFAULT_CHECKSUM_BLOCK_SIZE,
+    ):
+        """Constructor for `HashingSink`
+
+        Args:
+            sink (BaseSink): Sink receiving the bytes.
+            algorithm (str, optional): Hashlib algorithm e.g `md5`. Defaults to DEFAULT_CHECKSUM_ALGORITHM.
+            block_size (int, optional): Bytes covered by each block digest. Defaults to DEFAULT_CHECKSUM_BLOCK_SIZE.
+        """  # noqa: E501
+        self.sink = sink
+        self.window_size = sink.window_size
+        self.block_hasher = BlockHasher(0, algorithm, block_size)
+
+    def __repr__(self) -> str:
+        return f"<{self.__module__}.{self.__class__.__name__} sink={self.sink!r} {self.block_hasher!r}>"
+
+    async def open(self, size: int, resume: bool = False) -> None:
+        self.block_hasher = BlockHasher(size, self.block_hasher.algorithm, self.block_hasher.block_size)
+        await self.sink.open(size, resume)
+
+    async def write(self, offset: int, data: bytes) -> None:
+        await self.sink.write(offset, data)
+        self.block_hasher.update(offset, data)
+
+    async def close(self) -> None:
+        await self.sink.close()
+
+    async def abort(self) -> None:
+        await self.sink.abort()
+
+    def remaining(self, size: int) -> list[ByteRange]:
+        return self.sink.remaining(size)
+
+
+ChunkConsumerType: t.TypeAlias = t.Callable[[bytes], t.Awaitable[None] | None]
+"""Receives downloaded bytes in the order of the file"""
+
+
+def file_object_consumer(file_object: t.BinaryIO) -> ChunkConsumerType:
+    """Writes ordered bytes to a binary file object such as a pipe or `sys.stdout.buffer`"""
+
+    def write(data: bytes) -> None:
+        file_object.write(data)
+        file_object.flush()
+
+    async def consume(data: bytes) -> None:
+        await asyncio.to_thread(write, data)
+
+    return consume
+
+
+class OrderedStreamSink(BaseSink):
+    """Hands bytes over to a consumer in the order of the file.
+
+    Ranges arriving ahead of the earliest missing byte are held back in a bounded reorder
+    buffer. Once it is full, connections ahead wait while the one downloading the earliest
+    bytes carries on. The consumer is called from a single task, so a slow consumer slows
+    the download down instead of growing the buffer.
+
+    For instance:
+
+    ```python
+    sink = OrderedStreamSink(file_object_consumer(sys.stdout.buffer))
+    await media_file_downloader.run(media_file, filename="movie.mp4", sink=sink)
+    ```
+    """
+
+    def __init__(self, consumer: ChunkConsumerType, buffer_size: int = DEFAULT_REORDER_BUFFER_SIZE):
+        """Constructor for `OrderedStreamSink`
+
+        Args:
+            consumer (ChunkConsumerType): Function or coroutine function receiving ordered bytes.
+            buffer_size (int, optional): Most bytes held back for reordering. Defaults to DEFAULT_REORDER_BUFFER_SIZE.
+        """  # noqa: E501
+        assert buffer_size > 0, f"Value for buffer_size should be atleast 1 not {buffer_size}"
+        self.consumer = consumer
+        self.buffer_size = buffer_size
+        self.window_size = buffer_size
+        self.size = 0
+        self.position = 0
+        """Bytes handed over to the consumer so far"""
+        self.buffered = 0
+        self._chunks: list[tuple[int, int, bytes]] = []
+        """Heap of (offset, sequence, data) waiting to be handed over"""
+        self._sequence = itertools.count()
+        self._condition: asyncio.Condition | None = None
+        self._emitter: asyncio.Task | None = None
+        self._error: BaseException | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} position={self.position}/{self.size} "
+            f"buffered={self.buffered}>"
+        )
+
+    async def open(self, size: int, resume: bool = False) -> None:
+        # Bytes handed over by a previous download are gone, so a stream always starts afresh
+        self.size = size
+        self.position = self.buffered = 0
+        self._chunks.clear()
+        self._error = None
+        self._condition = asyncio.Condition()
+        self._emitter = asyncio.ensure_future(self._emit())
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def write(self, offset: int, data: bytes) -> None:
+        async with self._condition:
+            # The earliest bytes are always taken in, otherwise a full buffer would never drain
+            await self._condition.wait_for(
+                lambda: (
+                    self._error is not None
+                    or offset <= self.position
+                    or self.buffered + len(data) <= self.buffer_size
+                )
+            )
+            self._raise_error()
+            heapq.heappush(self._chunks, (offset, next(self._sequence), data))
+            self.buffered += len(data)
+            self._condition.notify_all()
+
+    async def _emit(self) -> None:
+        try:
+            while self.position < self.size:
+                async with self._condition:
+                    await self._condition.wait_for(
+                        lambda: bool(self._chunks) and self._chunks[0][0] <= self.position
+                    )
+                    offset, _, data = heapq.heappop(self._chunks)
+                    self.buffered -= len(data)
+                    # Ranges taken over from another connection may overlap what is handed over
+                    data = data[self.position - offset :]
+
+                if data:
+                    result = self.consumer(data)
+                    if asyncio.iscoroutine(result):
+                        await result
+
+                async with self._condition:
+                    self.position += len(data)
+                    self._condition.notify_all()
+
+        except Exception as e:
+            # Raised by whichever of write and close comes next
+            async with self._condition:
+                self._error = e
+                self._condition.notify_all()
+
+    async def close(self) -> None:
+        if self._emitter is not None:
+            await self._emitter
+            self._emitter = None
+        self._raise_error()
+
+    async def abort(self) -> None:
+        if self._emitter is not None:
+            self._emitter.cancel()
+            with contextlib.suppress(BaseException):
+                await self._emitter
+            self._emitter = None
+
+
+@dataclass
+class RangeTask:
+    """Byte range being downloaded by one connection"""
+
+    index: int
+    offset: int
+    """Position of the next byte to be downloaded"""
+    end: int
+    """Exclusive end - may shrink when another connection takes over part of the range"""
+    request_started_at: float | None = None
+    """Monotonic time the current request was sent. None when no request is in flight."""
+    request_downloaded: int = 0
+    """Bytes received through the current request"""
+    downloaded: int = 0
+    """Bytes received through all requests"""
+    elapsed: float = 0.0
+    """Seconds spent on finished requests"""
+    restarts: int = 0
+    """Times the request was abandoned for being too slow"""
+    errors: int = 0
+    """Requests that failed and were retried"""
+    request: asyncio.Future | None = field(default=None, repr=False)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.end - self.offset)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second of the current request"""
+        if self.request_started_at is None:
+            return 0.0
+        return self.request_downloaded / max(time.monotonic() - self.request_started_at, 1e-6)
+
+    @property
+    def average_throughput(self) -> float:
+        """Bytes per second of all requests including the current one"""
+        elapsed = self.elapsed
+        if self.request_started_at is not None:
+            elapsed += time.monotonic() - self.request_started_at
+        return self.downloaded / max(elapsed, 1e-6)
+
+
+UrlRefresherType: t.TypeAlias = t.Callable[[], t.Awaitable[str]]
+"""Returns a fresh signed url of the same file"""
+
+
+class RefreshableUrl:
+    """Signed file url which is renewed through `refresher` once it expires"""
+
+    def __init__(
+        self,
+        url: str,
+        refresher: UrlRefresherType | None = None,
+        expiry_margin: float = DEFAULT_SIGNED_URL_EXPIRY_MARGIN,
+    ):
+        """Constructor for `RefreshableUrl`
+
+        Args:
+            url (str): Signed file url.
+            refresher (UrlRefresherType | None, optional): Fetches fresh url of the same file. Defaults to None.
+            expiry_margin (float, optional): Seconds before expiry when the url is considered expired. Defaults to DEFAULT_SIGNED_URL_EXPIRY_MARGIN.
+        """  # noqa: E501
+        self.url = str(url)
+        self.refresher = refresher
+        self.expiry_margin = expiry_margin
+        self.refreshes = 0
+        """Times the url has been renewed"""
+        self._lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return f'<{self.__module__}.{self.__class__.__name__} url="{self.url}" refreshes={self.refreshes}>'
+
+    def __str__(self) -> str:
+        return self.url
+
+    @property
+    def can_refresh(self) -> bool:
+        return self.refresher is not None
+
+    @property
+    def is_expiring(self) -> bool:
+        """Checks whether the url expires within `expiry_margin` going by its `auth_key`"""
+        expires_at = get_signed_url_expiry(self.url)
+        return expires_at is not None and expires_at - self.expiry_margin <= time.time()
+
+    async def refresh(self, stale_url: str | None = None) -> str:
+        """Renews the url unless it has been renewed since `stale_url` was handed out.
+
+        Args:
+            stale_url (str | None, optional): Url which was found to be expired. Defaults to the current one.
+
+        Returns:
+            str: Fresh url
+        """
+        async with self._lock:
+            if self.refresher is not None and (stale_url is None or stale_url == self.url):
+                logger.info("Refreshing expired signed file url")
+                self.url = str(await self.refresher())
+                self.refreshes += 1
+            return self.url
+
+    async def get(self) -> str:
+        """Current url, renewed first incase it is about to expire"""
+        if self.can_refresh and self.is_expiring:
+            return await self.refresh(self.url)
+        return self.url
+
+
+@dataclass(eq=False)
+class DownloadSource:
+    """Url serving the file along with the throughput measured from it"""
+
+    url: RefreshableUrl
+    downloaded: int = 0
+    """Bytes received through finished requests"""
+    elapsed: float = 0.0
+    """Connection-seconds spent on finished requests"""
+    active: list[RangeTask] = field(default_factory=list, repr=False)
+    """Ranges whose requests are in flight"""
+    failed: bool = False
+
+    @property
+    def host(self) -> str:
+        return httpx.URL(self.url.url).host
+
+    @property
+    def throughput(self) -> float | None:
+        """Bytes per second of each connection, including requests in flight. None when unmeasured."""
+        now = time.monotonic()
+        downloaded, elapsed = self.downloaded, self.elapsed
+        for range_task in self.active:
+            if range_task.request_started_at is not None:
+                downloaded += range_task.request_downloaded
+                elapsed += now - range_task.request_started_at
+
+        return downloaded / elapsed if downloaded and elapsed else None
+
+
+class DownloadSources:
+    """Equivalent urls of one file, e.g from different CDN hosts, shared by the download connections.
+
+    Each request goes to the source with the highest throughput per connection, so that
+    connections - and with work stealing, bytes - spread across sources by their speed.
+    Sources not yet measured get a connection first. Failing sources are dropped as long
+    as others remain.
+    """
+
+    def __init__(self, urls: t.Iterable[str | RefreshableUrl]):
+        """Constructor for `DownloadSources`
+
+        Args:
+            urls (t.Iterable[str | RefreshableUrl]): Urls of the same file. The first one is the primary.
+        """
+        self.sources = [
+            DownloadSource(url if isinstance(url, RefreshableUrl) else RefreshableUrl(url)) for url in urls
+        ]
+        assert self.sources, "Atleast one url is required"
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} sources={len(self.available)}/{len(self.sources)}>"
+        )
+
+    @property
+    def primary(self) -> DownloadSource:
+        return self.sources[0]
+
+    @property
+    def available(self) -> list[DownloadSource]:
+        return [source for source in self.sources if not source.failed]
+
+    def pick(self) -> DownloadSource:
+        """Source for the next request"""
+        available = self.available
+        if not available:
+            raise RuntimeError("All download sources have failed")
+
+        unmeasured = [source for source in available if source.throughput is None]
+        if unmeasured:
+            return min(unmeasured, key=lambda source: len(source.active))
+
+        return max(available, key=lambda source: source.throughput)
+
+    def record(self, source: DownloadSource, downloaded: int, elapsed: float) -> None:
+        """Adds a finished request to the throughput of the source"""
+        source.downloaded += downloaded
+        source.elapsed += elapsed
+
+    def drop(self, source: DownloadSource, error: Exception) -> bool:
+        """Stops using a failing source.
+
+        Returns:
+            bool: Whether other sources remain
+        """
+        if source.failed:
+            return bool(self.available)
+
+        if len(self.available) < 2:
+            return False
+
+        source.failed = True
+        logger.warning(f"Dropping download source {source.host} after {error!r}")
+        return True
+
+    def summary(self) -> dict[str, int]:
+        """Bytes downloaded from each host"""
+        downloaded: dict[str, int] = {}
+        for source in self.sources:
+            downloaded[source.host] = downloaded.get(source.host, 0) + source.downloaded
+        return downloaded
+
+
+class TunedTasksStore:
+    """Number of download connections tuned for each host, kept across runs in a json file"""
+
+    def __init__(self, path: Path | str = TUNED_TASKS_PATH):
+        """Constructor for `TunedTasksStore`
+
+        Args:
+            path (Path | str, optional): Json file of the tuned values. Defaults to TUNED_TASKS_PATH.
+        """
+        self.path = Path(path)
+
+    def __repr__(self) -> str:
+        return f'<{self.__module__}.{self.__class__.__name__} path="{self.path}">'
+
+    def load(self) -> dict[str, dict[str, t.Any]]:
+        """Tuned details of all hosts"""
+        try:
+            with open(self.path) as fh:
+                return json.load(fh)
+
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, host: str) -> int | None:
+        """Tuned number of connections for the host. None incase it has never been tuned."""
+        return self.load().get(host, {}).get("tasks")
+
+    def set(self, host: str, tasks: int, throughput: float) -> None:
+        """Records number of connections tuned for the host and the throughput they achieved"""
+        tuned = self.load()
+        tuned[host] = {"tasks": tasks, "throughput": round(throughput), "updated_at": round(time.time())}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_file_atomically(self.path, json.dumps(tuned, indent=4).encode())
+
+
+class TasksTuner:
+    """Adjusts number of connections of a download to the throughput they achieve.
+
+    Starts with few connections (or the number tuned for the host before) and adds `step` more
+    for as long as each addition raises the aggregate throughput by atleast `min_gain`. Errors
+    and throttling responses fall back to the best number seen so far.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        store: TunedTasksStore | None = None,
+        initial_tasks: int = DEFAULT_AUTO_TASKS_START,
+        max_tasks: int = DEFAULT_AUTO_TASKS_LIMIT,
+        step: int = 2,
+        min_gain: float = 0.1,
+        interval: float = 3.0,
+    ):
+        """Constructor for `TasksTuner`
+
+        Args:
+            host (str): Host serving the file e.g `bcdn.hakunaymatata.com`.
+            store (TunedTasksStore | None, optional): Where tuned values are remembered. Defaults to None.
+            initial_tasks (int, optional): Connections to start with for a host not tuned before. Defaults to DEFAULT_AUTO_TASKS_START.
+            max_tasks (int, optional): Most connections to grow to. Defaults to DEFAULT_AUTO_TASKS_LIMIT.
+            step (int, optional): Connections added at a time. Defaults to 2.
+            min_gain (float, optional): Least relative throughput gain for keeping added connections. Defaults to 0.1.
+            interval (float, optional): Seconds each number of connections is measured for. Defaults to 3.0.
+        """  # noqa: E501
+        assert max_tasks > 0, f"Value for max_tasks should be atleast 1 not {max_tasks}"
+        self.host = host
+        self.store = store
+        self.max_tasks = max_tasks
+        self.step = max(1, step)
+        self.min_gain = min_gain
+        self.interval = interval
+
+        remembered = None if store is None else store.get(host)
+        self.tasks = max(1, min(max_tasks, remembered or initial_tasks))
+        """Current number of connections"""
+        self.best_tasks = self.tasks
+        self.best_throughput = 0.0
+        self.settled = False
+        """Whether tuning is over"""
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} host={self.host} tasks={self.tasks} "
+            f"best_tasks={self.best_tasks} settled={self.settled}>"
+        )
+
+    def observe(self, throughput: float, errors: int = 0) -> int:
+        """Judges the throughput of the current number of connections.
+
+        Args:
+            throughput (float): Aggregate bytes per second achieved by the current connections.
+            errors (int, optional): Failed or throttled requests meanwhile. Defaults to 0.
+
+        Returns:
+            int: Number of connections to continue with
+        """
+        if self.settled:
+            return self.tasks
+
+        if errors:
+            if self.tasks == self.best_tasks:
+                self.best_tasks = max(1, self.tasks - self.step)
+            self.settled = True
+
+        elif throughput >= self.best_throughput * (1 + self.min_gain):
+            self.best_tasks, self.best_throughput = self.tasks, throughput
+            if self.tasks >= self.max_tasks:
+                self.settled = True
+            else:
+                self.tasks = min(self.max_tasks, self.tasks + self.step)
+                return self.tasks
+
+        else:
+            self.settled = True
+
+        self.tasks = self.best_tasks
+        logger.info(f"Settled on {self.tasks} connections for {self.host}")
+        return self.tasks
+
+    def save(self) -> None:
+        """Remembers the best number of connections for the host"""
+        if self.store is not None and self.best_throughput:
+            self.store.set(self.host, self.best_tasks, self.best_throughput)
+
+
+class RangedDownloader:
+    """Downloads a file over several connections writing each byte range straight into a sink.
+
+    - A connection done with its range takes over the second half of the largest remaining one
+      (work stealing), so that all connections keep busy until the last byte.
+    - Connections much slower than the rest are abandoned and their ranges requested afresh.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        tasks: int = DEFAULT_TASKS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout_retry_attempts: int = DEFAULT_READ_TIMEOUT_ATTEMPTS,
+        manifest_save_interval: float = 1.0,
+        work_stealing: bool = True,
+        min_steal_size: int = DEFAULT_MIN_STEAL_SIZE,
+        slow_task_ratio: float | None = DEFAULT_SLOW_TASK_RATIO,
+        slow_task_grace: float = DEFAULT_SLOW_TASK_GRACE,
+        monitor_interval: float = 1.0,
+    ):
+        """Constructor for `RangedDownloader`
+
+        Args:
+            client (httpx.AsyncClient): Client for making the range requests.
+            tasks (int, optional): Number of connections. Defaults to DEFAULT_TASKS.
+            chunk_size (int, optional): Streaming download chunk size in kilobytes. Defaults to DEFAULT_CHUNK_SIZE.
+            timeout_retry_attempts (int, optional): Times to retry a range after network errors. Defaults to DEFAULT_READ_TIMEOUT_ATTEMPTS.
+            manifest_save_interval (float, optional): Minimum seconds between manifest saves. Defaults to 1.0.
+            work_stealing (bool, optional): Let idle connections take over half of the largest remaining range. Defaults to True.
+            min_steal_size (int, optional): Bytes a range should have left, for each half, to be split. Defaults to DEFAULT_MIN_STEAL_SIZE.
+            slow_task_ratio (float | None, optional): Restart requests slower than this fraction of the median throughput. Defaults to DEFAULT_SLOW_TASK_RATIO. None disables.
+            slow_task_grace (float, optional): Seconds a request runs before its throughput is judged. Defaults to DEFAULT_SLOW_TASK_GRACE.
+            monitor_interval (float, optional): Seconds between throughput checks. Defaults to 1.0.
+        """  # noqa: E501
+        assert tasks > 0, f"Value for tasks should be atleast 1 not {tasks}"
+        self.client = client
+        self.tasks = tasks
+        self.chunk_size = chunk_size * 1_024
+        self.timeout_retry_attempts = timeout_retry_attempts
+        self.manifest_save_interval = manifest_save_interval
+        self.work_stealing = work_stealing
+        self.min_steal_size = max(1, min_steal_size)
+        self.slow_task_ratio = slow_task_ratio
+        self.slow_task_grace = slow_task_grace
+        self.monitor_interval = monitor_interval
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} tasks={self.tasks} chunk_size={self.chunk_size} "
+            f"work_stealing={self.work_stealing}>"
+        )
+
+    async def probe(self, url: str | RefreshableUrl) -> httpx.Response:
+        """Requests the file headers without downloading its body.
+
+        Args:
+            url (str | RefreshableUrl): Url of the file. Renewed upon expiry incase it's refreshable.
+
+        Returns:
+            httpx.Response: Closed streamed response
+        """
+        if not isinstance(url, RefreshableUrl):
+            url = RefreshableUrl(url)
+
+        for attempt in range(2):
+            request_url = await url.get()
+            async with self.client.stream("GET", request_url) as response:
+                if attempt or response.status_code not in EXPIRED_URL_STATUS_CODES or not url.can_refresh:
+                    response.raise_for_status()
+                    return response
+
+            await url.refresh(request_url)
+
+    async def probe_sources(self, sources: DownloadSources) -> httpx.Response:
+        """Probes all sources at once and verifies they serve files of the same size.
+
+        - Sources other than the primary one are dropped when their probes fail.
+
+        Args:
+            sources (DownloadSources): Equivalent urls of the file.
+
+        Raises:
+            DownloadIntegrityError: Some source reports a different size than the primary one.
+
+        Returns:
+            httpx.Response: Closed streamed response of the primary source
+        """
+        responses = await asyncio.gather(
+            *(self.probe(source.url) for source in sources.sources), return_exceptions=True
+        )
+        primary_response = responses[0]
+        if isinstance(primary_response, BaseException):
+            raise primary_response
+
+        size = primary_response.headers.get("content-length")
+        for source, response in zip(sources.sources[1:], responses[1:]):
+            if isinstance(response, BaseException):
+                sources.drop(source, response)
+
+            elif response.headers.get("content-length") != size:
+                raise DownloadIntegrityError(
+                    source.url.url,
+                    f"Download source {source.host} reports size of {response.headers.get('content-length')} "
+                    f"bytes while {sources.primary.host} reports {size} bytes",
+                )
+
+        return primary_response
+
+    def plan(self, remaining: list[ByteRange], tasks: int | None = None) -> list[RangeTask]:
+        """Splits remaining ranges into (atmost) `tasks` ranges, dividing the largest ones first"""
+        tasks = self.tasks if tasks is None else tasks
+        ranges = sorted(remaining, key=lambda byte_range: byte_range.start)
+        while ranges and len(ranges) < tasks:
+            largest = max(ranges, key=lambda byte_range: byte_range.size)
+            if largest.size < 2:
+                break
+            ranges.remove(largest)
+            ranges.extend(largest.split(2))
+            ranges.sort(key=lambda byte_range: byte_range.start)
+
+        return [
+            RangeTask(index=index, offset=byte_range.start, end=byte_range.end)
+            for index, byte_range in enumerate(ranges)
+        ]
+
+    def steal(self, range_tasks: list[RangeTask]) -> RangeTask | None:
+        """Takes over the second half of the largest remaining range.
+
+        Args:
+            range_tasks (list[RangeTask]): Ranges being downloaded. The new range is appended.
+
+        Returns:
+            RangeTask | None: New range or None when none is big enough to be split.
+        """
+        victim = max(range_tasks, key=lambda range_task: range_task.remaining, default=None)
+        if victim is None or victim.remaining < 2 * self.min_steal_size:
+            return None
+
+        middle = victim.offset + victim.remaining // 2
+        stolen = RangeTask(index=len(range_tasks), offset=middle, end=victim.end)
+        # The victim stops at the new end even though its request asked for more
+        victim.end = middle
+        range_tasks.append(stolen)
+        logger.debug(f"Range {stolen.index} took over bytes {middle}-{stolen.end} from range {victim.index}")
+        return stolen
+
+    def find_slow_tasks(self, range_tasks: list[RangeTask]) -> list[RangeTask]:
+        """Ranges whose current requests are much slower than the median throughput of all ranges"""
+        if self.slow_task_ratio is None or len(range_tasks) < 2:
+            return []
+
+        now = time.monotonic()
+        median_throughput = statistics.median(range_task.average_throughput for range_task in range_tasks)
+        return [
+            range_task
+            for range_task in range_tasks
+            if range_task.request is not None
+            and not range_task.request.done()
+            and now - range_task.request_started_at >= self.slow_task_grace
+            and range_task.remaining >= self.min_steal_size
+            and range_task.throughput < median_throughput * self.slow_task_ratio
+        ]
+
+    async def _stream_range(
+        self,
+        url: str,
+        range_task: RangeTask,
+        sink: BaseSink,
+        on_progress: t.Callable[[RangeTask, int, int], t.Awaitable[None]],
+    ) -> None:
+        headers = {"Range": ByteRange(range_task.offset, range_task.end).header}
+        async with self.client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status_code != 206 and range_task.offset != 0:
+                raise IncompatibleServerError(
+                    "Server ignored the range request hence merge-free download is not possible"
+                )
+
+            async for chunk in response.aiter_bytes(self.chunk_size):
+                chunk = chunk[: range_task.remaining]
+                if not chunk:
+                    break
+
+                offset = range_task.offset
+                await sink.write(offset, chunk)
+                range_task.offset += len(chunk)
+                range_task.request_downloaded += len(chunk)
+                range_task.downloaded += len(chunk)
+                await on_progress(range_task, offset, len(chunk))
+
+                if not range_task.remaining:
+                    break
+
+        if range_task.remaining:
+            raise httpx.RemoteProtocolError("Server closed the range response early")
+
+    async def _download_range(
+        self,
+        sources: DownloadSources,
+        range_task: RangeTask,
+        sink: BaseSink,
+        on_progress: t.Callable[[RangeTask, int, int], t.Awaitable[None]],
+    ) -> None:
+        attempts = 0
+        while range_task.remaining:
+            source = sources.pick()
+            url = source.url
+            request_url = await url.get()
+            range_task.request_started_at = time.monotonic()
+            range_task.request_downloaded = 0
+            range_task.request = asyncio.ensure_future(
+                self._stream_range(request_url, range_task, sink, on_progress)
+            )
+            source.active.append(range_task)
+            try:
+                # Unlike awaiting the request, waiting does not raise when only the request is cancelled
+                await asyncio.wait({range_task.request})
+                if range_task.request.cancelled():
+                    continue
+
+                range_task.request.result()
+
+            except (*RETRIABLE_ERRORS, httpx.HTTPStatusError) as e:
+                throttled = isinstance(e, httpx.HTTPStatusError)
+                if throttled and e.response.status_code in EXPIRED_URL_STATUS_CODES and url.can_refresh:
+                    # Continues from the same offset with a fresh url
+                    await url.refresh(request_url)
+                    continue
+
+                if throttled and e.response.status_code not in THROTTLING_STATUS_CODES:
+                    if sources.drop(source, e):
+                        continue
+                    raise
+
+                attempts += 1
+                range_task.errors += 1
+                if attempts > self.timeout_retry_attempts:
+                    if sources.drop(source, e):
+                        attempts = 0
+                        continue
+                    raise
+
+                logger.info(
+                    f"Retrying range {range_task.index} from byte {range_task.offset} after {e!r} "
+                    f"- attempt ({attempts}/{self.timeout_retry_attempts})"
+                )
+                if throttled:
+                    await asyncio.sleep(attempts)
+
+            finally:
+                range_task.request.cancel()
+                elapsed = time.monotonic() - range_task.request_started_at
+                range_task.elapsed += elapsed
+                range_task.request_started_at = None
+                source.active.remove(range_task)
+                sources.record(source, range_task.request_downloaded, elapsed)
+
+    async def _monitor(
+        self,
+        range_tasks: list[RangeTask],
+        tuner: TasksTuner | None = None,
+        on_tuned: t.Callable[[], None] | None = None,
+    ) -> None:
+        last_tuned_at = time.monotonic()
+        last_downloaded = last_errors = 0
+
+        while True:
+            await asyncio.sleep(self.monitor_interval)
+            for range_task in self.find_slow_tasks(range_tasks):
+                logger.info(
+                    f"Restarting slow range {range_task.index} from byte {range_task.offset} "
+                    f"({get_filesize_string(round(range_task.throughput))}/s)"
+                )
+                range_task.restarts += 1
+                range_task.request.cancel()
+
+            now = time.monotonic()
+            if tuner is None or tuner.settled or now - last_tuned_at < tuner.interval:
+                continue
+
+            downloaded = sum(range_task.downloaded for range_task in range_tasks)
+            errors = sum(range_task.errors for range_task in range_tasks)
+            remaining = sum(range_task.remaining for range_task in range_tasks)
+
+            # Throughput trails off near the end regardless of the connections
+            if remaining >= 2 * self.min_steal_size * tuner.tasks:
+                throughput = (downloaded - last_downloaded) / (now - last_tuned_at)
+                tuner.observe(throughput, errors - last_errors)
+                logger.debug(
+                    f"Measured {get_filesize_string(round(throughput))}/s over {len(range_tasks)} ranges, "
+                    f"continuing with {tuner.tasks} connections"
+                )
+                on_tuned()
+
+            last_tuned_at, last_downloaded, last_errors = now, downloaded, errors
+
+    async def download(
+        self,
+        url: str | RefreshableUrl | DownloadSources,
+        sink: BaseSink,
+        size: int,
+        manifest: RangeManifest | None = None,
+        on_progress: t.Callable[[RangeTask, int, int], t.Awaitable[None] | None] | None = None,
+        tuner: TasksTuner | None = None,
+        ranges: list[ByteRange] | None = None,
+    ) -> list[RangeTask]:
+        """Downloads the remaining ranges of the file into an already opened sink.
+
+        Args:
+            url (str | RefreshableUrl | DownloadSources): Url of the file, renewed upon expiry incase it's refreshable, or several equivalent ones.
+            sink (BaseSink): Where downloaded bytes are written to.
+            size (int): Total size of the file.
+            manifest (RangeManifest | None, optional): Ranges already downloaded. Updated as ranges complete. Defaults to None.
+            on_progress (t.Callable, optional): Called with range task, offset and size of each written chunk. Defaults to None.
+            tuner (TasksTuner | None, optional): Decides number of connections in place of `tasks`. Defaults to None.
+            ranges (list[ByteRange] | None, optional): Download only these ranges. Defaults to None (those remaining in manifest or the whole file).
+
+        Returns:
+            list[RangeTask]: Downloaded ranges including those taken over from others
+        """  # noqa: E501
+        assert tuner is None or self.work_stealing, "Tuning number of connections requires work stealing"
+        sources = url if isinstance(url, DownloadSources) else DownloadSources([url])
+
+        if ranges is not None:
+            remaining = ranges
+        elif manifest is not None:
+            remaining = manifest.remaining()
+        else:
+            remaining = [ByteRange(0, size)]
+
+        range_tasks = self.plan(remaining, None if tuner is None else tuner.tasks)
+        workers: list[asyncio.Future] = []
+        last_saved = time.monotonic()
+
+        def target_tasks() -> int:
+            return self.tasks if tuner is None else tuner.tasks
+
+        def running_workers() -> int:
+            return sum(not worker.done() for worker in workers)
+
+        async def progress(range_task: RangeTask, offset: int, length: int) -> None:
+            nonlocal last_saved
+            if manifest is not None:
+                manifest.mark_completed(offset, offset + length)
+                if time.monotonic() - last_saved >= self.manifest_save_interval:
+                    await asyncio.to_thread(manifest.save)
+                    last_saved = time.monotonic()
+
+            if on_progress is not None:
+                result = on_progress(range_task, offset, length)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        async def work(range_task: RangeTask | None) -> None:
+            if range_task is None:
+                range_task = self.steal(range_tasks)
+
+            while range_task is not None:
+                await self._download_range(sources, range_task, sink, progress)
+                if running_workers() > target_tasks():
+                    # Number of connections has been tuned down
+                    return
+                range_task = self.steal(range_tasks) if self.work_stealing else None
+
+        def add_workers() -> None:
+            # Connections left idle by small remaining ranges start off by stealing
+            for _ in range(target_tasks() - running_workers()):
+                workers.append(asyncio.ensure_future(work(None)))
+
+        workers.extend(asyncio.ensure_future(work(range_task)) for range_task in range_tasks)
+        if self.work_stealing:
+            add_workers()
+
+        monitor = asyncio.ensure_future(self._monitor(range_tasks, tuner, add_workers))
+        try:
+            # Workers may be added meanwhile hence the periodic re-check
+            while pending := [worker for worker in workers if not worker.done()]:
+                await asyncio.wait(
+                    pending, timeout=self.monitor_interval, return_when=asyncio.FIRST_EXCEPTION
+                )
+                for worker in workers:
+                    if worker.done():
+                        worker.result()
+
+        finally:
+            monitor.cancel()
+            for worker in workers:
+                worker.cancel()
+            # Cancelled workers wind down before the manifest is saved and the sink is closed
+            await asyncio.gather(monitor, *workers, return_exceptions=True)
+
+            if manifest is not None:
+                await asyncio.to_thread(manifest.save)
+
+        if tuner is not None:
+            await asyncio.to_thread(tuner.save)
+
+        return range_tasks
+
+
+async def download_merge_free(
+    throttle_buster: "ThrottleBuster",
+    url: str,
+    filename: str,
+    progress_hook: callable = None,
+    mode: DownloadMode = DownloadMode.AUTO,
+    disable_progress_bar: bool = None,
+    file_size: int = None,
+    timeout_retry_attempts: int = DEFAULT_READ_TIMEOUT_ATTEMPTS,
+    colour: str = "cyan",
+    simple: bool = False,
+    test: bool = False,
+    leave: bool = True,
+    ascii: bool = False,
+    dir: Path = None,
+    sink: BaseSink | None = None,
+    auto_tasks: bool = False,
+    url_refresher: UrlRefresherType | None = None,
+    checksum: str | None = None,
+    expected_size: int | None = None,
+    mirror_urls: t.Iterable[str] | None = None,
+    **p_bar_kwargs,
+) -> DownloadedFile | httpx.Response:
+    """Downloads file straight into its final location, without part files and merging.
+
+    - Uses the client, tasks, chunk size and directory of the `ThrottleBuster` instance.
+    - Progress is recorded in a `RangeManifest` sidecar which is removed once the download completes.
+    - Checksums are computed while the bytes are written and saved in a `FileChecksums` sidecar.
+
+    Args:
+        throttle_buster (ThrottleBuster): Download settings and client.
+        url (str): Url of the file to be downloaded.
+        filename (str): Filename for the downloaded content.
+        sink (BaseSink | None, optional): Write to this sink e.g `OrderedStreamSink` instead of a file under dir. Defaults to None.
+        auto_tasks (bool, optional): Tune number of connections to the throughput, starting from the value remembered for the host. Defaults to False.
+        url_refresher (UrlRefresherType | None, optional): Fetches fresh url of the file once the signed one expires. Defaults to None.
+        checksum (str | None, optional): Hashlib algorithm for checksums of the downloaded file e.g `sha256`. Defaults to None.
+        expected_size (int | None, optional): Raise `DownloadIntegrityError` unless the file has exactly this size. Defaults to None.
+        mirror_urls (t.Iterable[str] | None, optional): Other urls of the same file to spread the ranges across. Defaults to None.
+
+    Other args are same as those of `ThrottleBuster.run`.
+
+    Returns:
+        DownloadedFile | httpx.Response: Downloaded file details or httpx Response incase of (test=True).
+    """  # noqa: E501
+    ranged_downloader = RangedDownloader(
+        client=throttle_buster.client,
+        tasks=throttle_buster.tasks,
+        chunk_size=throttle_buster.chunk_size // 1_024,
+        timeout_retry_attempts=timeout_retry_attempts,
+    )
+
+    source = RefreshableUrl(url, url_refresher)
+    sources = DownloadSources([source, *(mirror_urls or ())])
+    response = await ranged_downloader.probe_sources(sources)
+    content_length = response.headers.get("content-length", file_size)
+    if content_length is None:
+        raise FilesizeNotFoundError(
+            "Unable to get the content-length of the file from server response. "
+            "Set the content-length using parameter file_size to suppres this error."
+        )
+
+    content_length = int(content_length)
+    etag = response.headers.get("etag")
+    saved_to = Path(dir or throttle_buster.dir).joinpath(sanitize_filename(filename))
+
+    if expected_size is not None and content_length != expected_size:
+        raise DownloadIntegrityError(
+            saved_to,
+            f"Server reports size of {content_length} bytes instead of the expected {expected_size} bytes "
+            f'for "{filename}"',
+        )
+
+    if test:
+        logger.info(f"Download test passed successfully ({get_filesize_string(content_length)}) - {saved_to}")
+        return response
+
+    manifest = None
+    resume = False
+    read_block = None
+    file_sink = sink is None
+
+    if file_sink:
+        sink = PositionalFileSink(saved_to)
+        read_block = file_block_reader(saved_to)
+        manifest_path = RangeManifest.path_for(saved_to)
+        manifest = RangeManifest(path=manifest_path, size=content_length, etag=etag)
+
+        if mode is not DownloadMode.START and saved_to.exists():
+            previous_manifest = RangeManifest.load(manifest_path)
+
+            if previous_manifest is not None and previous_manifest.matches(content_length, etag):
+                manifest, resume = previous_manifest, True
+
+            elif previous_manifest is None and os.path.getsize(saved_to) == content_length:
+                logger.warning(f'Download already completed for the file in path "{saved_to}"')
+                checksums_path = FileChecksums.path_for(saved_to)
+                if checksum and getattr(FileChecksums.load(checksums_path), "algorithm", None) != checksum:
+                    checksums = await asyncio.to_thread(compute_checksums, saved_to, checksum)
+                    await asyncio.to_thread(checksums.save)
+
+                return DownloadedFile(
+                    url=url,
+                    saved_to=saved_to,
+                    expected_size=content_length,
+                    size=content_length,
+                    duration=0,
+                    merge_duration=0,
+                )
+
+    else:
+        # Sinks keeping track of what they have received resume by themselves
+        resume = mode is not DownloadMode.START
+
+    if checksum:
+        sink = HashingSink(sink, checksum)
+
+    await sink.open(content_length, resume=resume)
+    remaining = manifest.remaining() if manifest is not None else sink.remaining(content_length)
+    completed_size = content_length - sum(byte_range.size for byte_range in remaining)
+    resume = completed_size > 0
+
+    if disable_progress_bar is None:
+        disable_progress_bar = progress_hook is not None
+
+    tuner = TasksTuner(httpx.URL(url).host, store=TunedTasksStore()) if auto_tasks else None
+    size_string = get_filesize_string(content_length)
+    logger.info(
+        f"{'Resuming' if resume else 'Starting'} merge-free download process "
+        f"({ranged_downloader.tasks if tuner is None else f'{tuner.tasks}+'} tasks, {size_string}) "
+        f'- "{filename}"'
+    )
+    p_bar = CustomTqdm(
+        total=round(content_length / 1_000_000, 6),
+        initial=round(completed_size / 1_000_000, 6),
+        desc=f"Downloading [{filename if len(filename) <= 11 else filename[:8] + '...'}]",
+        unit="Mb",
+        disable=disable_progress_bar,
+        colour=colour,
+        leave=leave,
+        ascii=ascii,
+        bar_format="{l_bar}{bar} | %(size)s" % dict(size=size_string) if simple else "{l_bar}{bar}{r_bar}",
+        **p_bar_kwargs,
+    )
+    download_trackers: dict[int, DownloadTracker] = {}
+
+    async def on_progress(range_task: RangeTask, offset: int, length: int) -> None:
+        p_bar.update(round(length / 1_000_000, 6))
+
+        if progress_hook is not None:
+            download_tracker = download_trackers.get(range_task.index)
+            if download_tracker is None:
+                download_tracker = download_trackers[range_task.index] = DownloadTracker(
+                    url=url,
+                    saved_to=saved_to,
+                    index=range_task.index,
+                    bytes_offset=offset,
+                    expected_size=range_task.end - offset,
+                    download_mode=DownloadMode.RESUME if resume else DownloadMode.START,
+                )
+            download_tracker.expected_size = range_task.end - download_tracker.bytes_offset
+            download_tracker.update_downloaded_size(length)
+            await throttle_buster._call_progress_hook(progress_hook, download_tracker)
+
+    windows = [remaining]
+    if sink.window_size is not None:
+        # Connections work close to each other so that the sink is not flooded with bytes far ahead
+        windows = [
+            [
+                ByteRange(max(byte_range.start, start), min(byte_range.end, start + sink.window_size))
+                for byte_range in remaining
+                if byte_range.start < start + sink.window_size and byte_range.end > start
+            ]
+            for start in range(0, content_length, sink.window_size)
+        ]
+
+    start_time = time.time()
+    try:
+        for ranges in filter(None, windows):
+            await ranged_downloader.download(
+                sources,
+                sink,
+                content_length,
+                manifest=manifest,
+                on_progress=on_progress,
+                tuner=tuner,
+                ranges=ranges,
+            )
+
+    except BaseException:
+        await sink.abort()
+        raise
+
+    finally:
+        with contextlib.suppress(AttributeError):
+            p_bar.close()
+
+    await sink.close()
+    if manifest is not None:
+        manifest.remove()
+
+    if expected_size is not None and file_sink and os.path.getsize(saved_to) != expected_size:
+        raise DownloadIntegrityError(
+            saved_to,
+            f'Downloaded "{saved_to}" is {os.path.getsize(saved_to)} bytes instead of {expected_size}',
+        )
+
+    if len(sources.sources) > 1:
+        logger.info(
+            "Downloaded bytes per source - "
+            + ", ".join(f"{host}: {get_filesize_string(size)}" for host, size in sources.summary().items())
+        )
+
+    if checksum:
+        checksums = await sink.block_hasher.checksums(FileChecksums.path_for(saved_to), read_block)
+        await asyncio.to_thread(checksums.save)
+        logger.info(f'{checksum} digest of "{filename}" - {checksums.digest}')
+
+    downloaded_file = DownloadedFile(
+        url=source.url,
+        saved_to=saved_to,
+        expected_size=content_length,
+        size=os.path.getsize(saved_to) if file_sink else content_length,
+        duration=time.time() - start_time,
+        merge_duration=0,
+        file_parts=list(download_trackers.values()),
+    )
+    logger.info(
+        f"Done downloading {downloaded_file.size_string} in {downloaded_file.duration_string.lower()}, "
+        + (f'saved to "{downloaded_file.saved_to}"' if file_sink else f"written to {sink!r}")
+    )
+    return downloaded_file
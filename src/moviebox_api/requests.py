@@ -2,6 +2,9 @@
 Provide ways to interact with Moviebox using `httpx`
 """
 
+import typing as t
+from contextlib import asynccontextmanager
+
 import httpx
 from httpx import Response
 from httpx._config import DEFAULT_TIMEOUT_CONFIG
@@ -37,6 +40,7 @@ class Session:
         cookies: CookieTypes | None = request_cookies,
         timeout: TimeoutTypes = DEFAULT_TIMEOUT_CONFIG,
         proxy: ProxyTypes | None = None,
+        trusted_responses: bool = False,
         **httpx_kwargs,
     ):
         """Constructor for `Session`
@@ -46,6 +50,7 @@ class Session:
             cookies (CookieTypes | None , optional): Http request cookies. Defaults to request_cookies.
             timeout (TimeoutTypes, optional): Http request timeout in seconds. Defaults to DEFAULT_TIMEOUT_CONFIG.
             proxy (ProxyTypes | None, optional): Http requests proxy. Defaults to None.
+            trusted_responses (bool, optional): Skip url validation when modelling responses. Defaults to False.
 
         httpx_kwargs : Other keyword arguments for `httpx.AsyncClient`
         """  # noqa: E501
@@ -53,6 +58,8 @@ class Session:
         self._cookies = cookies
         self._timeout = timeout
         self._proxy = proxy
+        self.trusted_responses = trusted_responses
+        """Model server responses without validating urls - see `models.get_trusted_model`"""
 
         self._client = httpx.AsyncClient(
             headers=headers,
@@ -105,7 +112,7 @@ class Session:
             dict: Extracted data field value
         """
         response = await self.get(*args, **kwargs)
-        return process_api_response(response.json())
+        return process_api_response(response.content)
 
     async def get_with_cookies(self, url: str, params: dict = {}, **kwargs) -> Response:
         """Makes a http get request with server-assigned cookies from previous requests.
@@ -124,6 +131,25 @@ class Session:
 
         return self._validate_response(response)
 
+    @asynccontextmanager
+    async def stream_with_cookies(self, url: str, params: dict = {}, **kwargs) -> t.AsyncIterator[Response]:
+        """Makes a streaming http get request with server-assigned cookies from previous requests.
+
+        - The connection is closed on exit even when the body has not been read completely.
+
+        Args:
+            url (str): Resource link.
+            params (dict, optional): Request params. Defaults to {}.
+
+        Yields:
+            Response: Httpx response object whose body is yet to be read
+        """
+        await self.ensure_cookies_are_assigned()
+
+        async with self._client.stream("GET", url, params=params, **kwargs) as response:
+            response.raise_for_status()
+            yield response
+
     async def get_with_cookies_from_api(self, *args, **kwargs) -> dict:
         """Makes a http get request with server-assigned cookies from previous requests
         and extract the `data` field from the response.
@@ -132,7 +158,7 @@ class Session:
             dict: Extracted data field value
         """
         response = await self.get_with_cookies(*args, **kwargs)
-        return process_api_response(response.json())
+        return process_api_response(response.content)
 
     async def post(self, url: str, json: dict, **kwargs) -> Response:
         """Makes a http post request with both self assigned and server-
@@ -159,7 +185,7 @@ class Session:
             dict: Extracted data field value
         """
         response = await self.post(*args, **kwargs)
-        return process_api_response(response.json())
+        return process_api_response(response.content)
 
     async def ensure_cookies_are_assigned(self) -> bool:
         """Checks if the essential cookies are available if not update it.
@@ -184,7 +210,7 @@ class Session:
         response = await self._client.get(url=self._moviebox_app_info_url)
         response.raise_for_status()
 
-        moviebox_app_info = process_api_response(response.json())
+        moviebox_app_info = process_api_response(response.content)
 
         if isinstance(moviebox_app_info, list):
             moviebox_app_info = moviebox_app_info[0]
@@ -0,0 +1,379 @@
+"""Uploads to S3-compatible object storage while downloading.
+
+Downloaded ranges are mapped onto parts of a multipart upload. A part goes up as
+soon as all its bytes have arrived - in whatever order - so that memory holds only
+the parts being filled, and the file never touches local disk. Uploaded parts are
+recorded in a small state file, so an interrupted download resumes with the parts
+still missing from the upload.
+
+Requires `boto3` - `pip install "moviebox-api[s3]"`.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import typing as t
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from moviebox_api import logger
+from moviebox_api.constants import DEFAULT_S3_PART_SIZE, S3_MAX_PARTS, S3_MIN_PART_SIZE, S3_UPLOADS_DIR
+from moviebox_api.helpers import write_file_atomically
+from moviebox_api.ranged import BaseSink, ByteRange
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+__all__ = ["S3MultipartSink", "S3UploadState", "part_size_for"]
+
+
+def part_size_for(size: int, part_size: int = DEFAULT_S3_PART_SIZE) -> int:
+    """Part size, atleast part_size, at which a file of size bytes fits in S3_MAX_PARTS parts"""
+    part_size = max(part_size, S3_MIN_PART_SIZE)
+    return max(part_size, -(-size // S3_MAX_PARTS))
+
+
+@dataclass
+class S3UploadState:
+    """State file recording parts of a multipart upload already in object storage"""
+
+    path: Path
+    bucket: str
+    key: str
+    upload_id: str
+    size: int
+    part_size: int
+    parts: dict[int, str] = field(default_factory=dict)
+    """ETag of each uploaded part by part number"""
+
+    suffix: t.ClassVar[str] = ".upload.json"
+
+    @classmethod
+    def path_for(cls, bucket: str, key: str, directory: Path | str = S3_UPLOADS_DIR) -> Path:
+        """State path of the upload of an object"""
+        name = hashlib.sha256(f"{bucket}/{key}".encode()).hexdigest()[:32]
+        return Path(directory).joinpath(name + cls.suffix)
+
+    @classmethod
+    def load(cls, path: Path) -> "S3UploadState | None":
+        """Reads state from path. Returns None incase it's missing or unreadable."""
+        try:
+            with open(path) as fh:
+                details = json.load(fh)
+            return cls(
+                path=path,
+                bucket=details["bucket"],
+                key=details["key"],
+                upload_id=details["upload_id"],
+                size=details["size"],
+                part_size=details["part_size"],
+                parts={int(number): etag for number, etag in details["parts"].items()},
+            )
+
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_file_atomically(
+            self.path,
+            json.dumps(
+                {
+                    "bucket": self.bucket,
+                    "key": self.key,
+                    "upload_id": self.upload_id,
+                    "size": self.size,
+                    "part_size": self.part_size,
+                    "parts": self.parts,
+                }
+            ).encode(),
+        )
+
+    def remove(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
+@dataclass
+class _PartBuffer:
+    """Bytes of a part received so far"""
+
+    data: bytearray
+    spans: list[list[int]] = field(default_factory=list)
+    """Sorted [start, end) spans received, relative to the part start"""
+
+    def write(self, offset: int, piece: bytes) -> None:
+        end = offset + len(piece)
+        self.data[offset:end] = piece
+        merged = []
+        for span in sorted([*self.spans, [offset, end]]):
+            if merged and span[0] <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], span[1])
+            else:
+                merged.append(span)
+        self.spans = merged
+
+    @property
+    def is_complete(self) -> bool:
+        return self.spans == [[0, len(self.data)]]
+
+
+class S3MultipartSink(BaseSink):
+    """Uploads downloaded bytes to an object through a multipart upload.
+
+    For instance:
+
+    ```python
+    sink = S3MultipartSink("library", "movies/Avatar (2009).mp4", endpoint_url="http://localhost:9000")
+    await media_file_downloader.run(media_file, filename="Avatar (2009).mp4", sink=sink)
+    ```
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        client: t.Any = None,
+        part_size: int = DEFAULT_S3_PART_SIZE,
+        max_buffered_parts: int = 8,
+        max_concurrent_uploads: int = 4,
+        state_dir: Path | str = S3_UPLOADS_DIR,
+        upload_kwargs: dict[str, t.Any] | None = None,
+        **client_kwargs,
+    ):
+        """Constructor for `S3MultipartSink`
+
+        Args:
+            bucket (str): Bucket of the object.
+            key (str): Key of the object.
+            client (t.Any, optional): Boto3 S3 client. Defaults to None (created from client_kwargs).
+            part_size (int, optional): Bytes in each part. Raised to fit the file in S3_MAX_PARTS. Defaults to DEFAULT_S3_PART_SIZE.
+            max_buffered_parts (int, optional): Parts being downloaded at once, which bounds memory used. Defaults to 8.
+            max_concurrent_uploads (int, optional): Parts being uploaded at once. Downloading waits beyond this. Defaults to 4.
+            state_dir (Path | str, optional): Directory for state of unfinished uploads. Defaults to S3_UPLOADS_DIR.
+            upload_kwargs (dict[str, t.Any] | None, optional): Extra arguments for `create_multipart_upload` e.g `ContentType`. Defaults to None.
+
+        client_kwargs: Keyword arguments for `boto3.client` e.g `endpoint_url` of S3-compatible storage
+        """  # noqa: E501
+        assert max_buffered_parts > 0, (
+            f"Value for max_buffered_parts should be atleast 1 not {max_buffered_parts}"
+        )
+        assert max_concurrent_uploads > 0, (
+            f"Value for max_concurrent_uploads should be atleast 1 not {max_concurrent_uploads}"
+        )
+        if client is None:
+            if boto3 is None:
+                raise ImportError(
+                    "Uploading to object storage requires boto3. "
+                    'Install it with pip install "moviebox-api[s3]"'
+                )
+            client = boto3.client("s3", **client_kwargs)
+
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.requested_part_size = part_size
+        self.max_buffered_parts = max_buffered_parts
+        self.max_concurrent_uploads = max_concurrent_uploads
+        self.state_dir = Path(state_dir)
+        self.upload_kwargs = upload_kwargs or {}
+        self.size = 0
+        self.part_size = part_size
+        self.state: S3UploadState | None = None
+        self._buffers: dict[int, _PartBuffer] = {}
+        self._uploading: dict[int, asyncio.Future] = {}
+        self._slots: asyncio.Semaphore | None = None
+        self._error: BaseException | None = None
+
+    def __repr__(self) -> str:
+        return f'<{self.__module__}.{self.__class__.__name__} url="s3://{self.bucket}/{self.key}">'
+
+    @property
+    def parts_count(self) -> int:
+        return max(1, -(-self.size // self.part_size))
+
+    def part_range(self, index: int) -> ByteRange:
+        """Bytes covered by the part at zero-based index"""
+        start = index * self.part_size
+        return ByteRange(start, min(start + self.part_size, self.size))
+
+    async def _list_parts(self, upload_id: str) -> dict[int, str]:
+        parts = {}
+        marker = 0
+        while True:
+            response = await asyncio.to_thread(
+                self.client.list_parts,
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=upload_id,
+                PartNumberMarker=marker,
+            )
+            parts.update({part["PartNumber"]: part["ETag"] for part in response.get("Parts", [])})
+            if not response.get("IsTruncated"):
+                return parts
+            marker = response["NextPartNumberMarker"]
+
+    async def _abort_upload(self, upload_id: str) -> None:
+        with contextlib.suppress(self.client.exceptions.NoSuchUpload):
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload, Bucket=self.bucket, Key=self.key, UploadId=upload_id
+            )
+
+    async def open(self, size: int, resume: bool = False) -> None:
+        self.size = size
+        self.part_size = part_size_for(size, self.requested_part_size)
+        # Keeps connections within the parts being buffered
+        self.window_size = self.part_size * self.max_buffered_parts
+        self._buffers.clear()
+        self._uploading.clear()
+        self._slots = asyncio.Semaphore(self.max_concurrent_uploads)
+        self._error = None
+
+        path = S3UploadState.path_for(self.bucket, self.key, self.state_dir)
+        state = S3UploadState.load(path)
+        if state is not None and resume and (state.size, state.part_size) == (size, self.part_size):
+            try:
+                # Parts in storage are what counts, even those uploaded after the state was last saved
+                state.parts = await self._list_parts(state.upload_id)
+                logger.info(f"Resuming upload to {self!r} with {len(state.parts)}/{self.parts_count} parts")
+            except self.client.exceptions.NoSuchUpload:
+                state = None
+
+        elif state is not None:
+            await self._abort_upload(state.upload_id)
+            state = None
+
+        if state is None:
+            response = await asyncio.to_thread(
+                self.client.create_multipart_upload, Bucket=self.bucket, Key=self.key, **self.upload_kwargs
+            )
+            state = S3UploadState(
+                path=path,
+                bucket=self.bucket,
+                key=self.key,
+                upload_id=response["UploadId"],
+                size=size,
+                part_size=self.part_size,
+            )
+
+        self.state = state
+        self.state.save()
+
+    def remaining(self, size: int) -> list[ByteRange]:
+        remaining: list[ByteRange] = []
+        for index in range(self.parts_count):
+            if index + 1 in self.state.parts:
+                continue
+            part_range = self.part_range(index)
+            if remaining and remaining[-1].end == part_range.start:
+                remaining[-1].end = part_range.end
+            elif part_range.size:
+                remaining.append(part_range)
+        return remaining
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def write(self, offset: int, data: bytes) -> None:
+        self._raise_error()
+        position = 0
+        while position < len(data):
+            index = (offset + position) // self.part_size
+            part_range = self.part_range(index)
+            piece = data[position : part_range.end - offset]
+            position += len(piece)
+
+            # Ranges taken over from another connection may overlap parts already complete
+            if index + 1 in self.state.parts or index in self._uploading:
+                continue
+
+            buffer = self._buffers.get(index)
+            if buffer is None:
+                buffer = self._buffers[index] = _PartBuffer(bytearray(part_range.size))
+
+            buffer.write(offset + position - len(piece) - part_range.start, piece)
+            if buffer.is_complete:
+                await self._start_upload(index)
+
+    async def _start_upload(self, index: int) -> None:
+        # The complete part stays buffered until there is room to upload it, even if cancelled meanwhile
+        await self._slots.acquire()
+        buffer = self._buffers.pop(index, None)
+        if buffer is None:
+            self._slots.release()
+            return
+
+        self._uploading[index] = asyncio.ensure_future(self._upload_part(index, bytes(buffer.data)))
+
+    async def _upload_part(self, index: int, data: bytes) -> None:
+        try:
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.state.upload_id,
+                PartNumber=index + 1,
+                Body=data,
+            )
+            self.state.parts[index + 1] = response["ETag"]
+            self.state.save()
+
+        except Exception as e:
+            # Raised by whichever of write and close comes next
+            self._error = e
+
+        finally:
+            self._uploading.pop(index, None)
+            self._slots.release()
+
+    async def _wait_for_uploads(self) -> None:
+        while self._uploading:
+            await asyncio.wait(list(self._uploading.values()))
+
+    async def close(self) -> None:
+        for index, buffer in list(self._buffers.items()):
+            if buffer.is_complete:
+                await self._start_upload(index)
+
+        if self.size == 0:
+            # Multipart uploads need atleast one part
+            self._buffers[0] = _PartBuffer(bytearray())
+            await self._start_upload(0)
+
+        await self._wait_for_uploads()
+        self._raise_error()
+
+        missing = [number for number in range(1, self.parts_count + 1) if number not in self.state.parts]
+        if missing:
+            raise ValueError(f"Parts {missing} of {self!r} were not fully written")
+
+        await asyncio.to_thread(
+            self.client.complete_multipart_upload,
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.state.upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": number, "ETag": etag} for number, etag in sorted(self.state.parts.items())
+                ]
+            },
+        )
+        self.state.remove()
+        logger.info(f"Uploaded {len(self.state.parts)} parts to s3://{self.bucket}/{self.key}")
+
+    async def abort(self) -> None:
+        # Uploaded parts are kept in storage for resuming while partly filled ones are let go
+        await self._wait_for_uploads()
+        self._buffers.clear()
+
+    async def discard(self) -> None:
+        """Cancels the multipart upload, removing its uploaded parts from storage"""
+        await self._wait_for_uploads()
+        if self.state is not None:
+            await self._abort_upload(self.state.upload_id)
+            self.state.remove()
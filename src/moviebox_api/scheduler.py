@@ -0,0 +1,267 @@
+"""Runs episode downloads concurrently under one global connections budget
+and fetches metadata of upcoming episodes ahead of their turn"""
+
+import asyncio
+import time
+import typing as t
+from dataclasses import dataclass
+
+from moviebox_api import logger
+from moviebox_api.constants import DEFAULT_SIGNED_URL_EXPIRY_MARGIN, DEFAULT_TASKS
+from moviebox_api.models import DownloadableFilesMetadata
+
+if t.TYPE_CHECKING:
+    from moviebox_api.download import BaseDownloadableFilesDetail
+
+__all__ = ["EpisodesDownloadScheduler", "EpisodesMetadataPrefetcher", "PrefetchedEpisode"]
+
+EpisodeResultType = t.TypeVar("EpisodeResultType")
+
+EpisodeWorkerType: t.TypeAlias = t.Callable[[int, int], t.Awaitable[EpisodeResultType]]
+"""Accepts season and episode numbers and returns the episode download result"""
+
+EpisodeAdmissionType: t.TypeAlias = t.Callable[[int, int], t.Awaitable[t.Any]]
+"""Accepts season and episode numbers and returns once the episode may start e.g given disk space"""
+
+
+class EpisodesDownloadScheduler:
+    """Downloads several episodes at once without exceeding a global connections budget.
+
+    Each episode download opens `tasks` connections, so at most `max_connections // tasks`
+    episodes run at a time. Episodes are started in priority order - by season then episode
+    unless `priority` says otherwise, each once `admission` lets it in.
+
+    For instance:
+
+    ```python
+    scheduler = EpisodesDownloadScheduler(max_connections=20, tasks=5)
+    results = await scheduler.run(download_episode, [(1, 1), (1, 2), (2, 1)])
+    # { 1 : { 1 : ..., 2 : ... }, 2 : { 1 : ... } }
+    ```
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        tasks: int = DEFAULT_TASKS,
+        priority: t.Callable[[int, int], t.Any] | None = None,
+        admission: EpisodeAdmissionType | None = None,
+    ):
+        """Constructor for `EpisodesDownloadScheduler`
+
+        Args:
+            max_connections (int | None, optional): Global connections budget (episodes × tasks). Defaults to tasks (one episode at a time).
+            tasks (int, optional): Connections used by each episode download. Defaults to DEFAULT_TASKS.
+            priority (t.Callable[[int, int], t.Any] | None, optional): Sort key accepting season and episode numbers. Defaults to None (season, episode).
+            admission (EpisodeAdmissionType | None, optional): Awaited before starting each episode, raising to fail it. Defaults to None.
+        """  # noqa: E501
+        self.tasks = tasks
+        self.max_connections = tasks if max_connections is None else max_connections
+        assert self.tasks > 0, f"Value for tasks should be atleast 1 not {self.tasks}"
+        assert self.max_connections >= self.tasks, (
+            f"Value for max_connections ({self.max_connections}) should be atleast "
+            f"equal to tasks ({self.tasks})"
+        )
+        self.priority = priority
+        self.admission = admission
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} max_connections={self.max_connections} "
+            f"tasks={self.tasks} concurrent_episodes={self.concurrent_episodes}>"
+        )
+
+    @property
+    def concurrent_episodes(self) -> int:
+        """Number of episodes downloaded at a time"""
+        return self.max_connections // self.tasks
+
+    def order(self, episodes: t.Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Sorts (season, episode) pairs in the order they will be started"""
+        if self.priority is None:
+            return sorted(episodes)
+        return sorted(episodes, key=lambda season_episode: self.priority(*season_episode))
+
+    async def run(
+        self,
+        worker: EpisodeWorkerType,
+        episodes: t.Iterable[tuple[int, int]],
+    ) -> dict[int, dict[int, EpisodeResultType]]:
+        """Downloads the episodes and groups the results by season.
+
+        - Episodes whose worker returns None are left out of the results.
+        - The first worker error cancels the rest of the downloads and is raised.
+
+        Args:
+            worker (EpisodeWorkerType): Downloads an episode given its season and episode numbers.
+            episodes (t.Iterable[tuple[int, int]]): (season, episode) pairs to be downloaded.
+
+        Returns:
+            dict[int, dict[int, EpisodeResultType]]: Results in the shape { season : { episode : result } }
+        """
+        ordered_episodes = self.order(episodes)
+        queue: asyncio.Queue[tuple[int, int]] = asyncio.Queue()
+        for season_episode in ordered_episodes:
+            queue.put_nowait(season_episode)
+
+        results: dict[tuple[int, int], EpisodeResultType] = {}
+
+        async def consume():
+            while not queue.empty():
+                season, episode = queue.get_nowait()
+                if self.admission is not None:
+                    await self.admission(season, episode)
+                logger.debug(f"Starting download of S{season}E{episode}")
+                results[(season, episode)] = await worker(season, episode)
+
+        workers_count = min(self.concurrent_episodes, len(ordered_episodes))
+        logger.info(
+            f"Downloading {len(ordered_episodes)} episodes, {workers_count} at a time "
+            f"({self.tasks} connections each)"
+        )
+
+        consumers = [asyncio.ensure_future(consume()) for _ in range(workers_count)]
+        try:
+            await asyncio.gather(*consumers)
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+
+        grouped_results: dict[int, dict[int, EpisodeResultType]] = {}
+        for season, episode in sorted(results):
+            grouped_results.setdefault(season, {})
+            if results[(season, episode)] is not None:
+                grouped_results[season][episode] = results[(season, episode)]
+
+        return grouped_results
+
+
+EpisodePreparerType: t.TypeAlias = t.Callable[[int, int, DownloadableFilesMetadata], t.Awaitable[t.Any]]
+"""Accepts season number, episode number and its files metadata e.g to download its captions"""
+
+
+@dataclass
+class PrefetchedEpisode:
+    """Episode details resolved ahead of its download"""
+
+    season: int
+    episode: int
+    metadata: DownloadableFilesMetadata
+    """Downloadable files metadata. Refreshed incase its signed urls are about to expire"""
+    prepared: t.Any = None
+    """Whatever the preparer returned for this episode"""
+
+
+class EpisodesMetadataPrefetcher:
+    """Fetches downloadable files metadata of the next episodes while the current one downloads.
+
+    Requesting an episode starts fetching the `lookahead` episodes following it in the
+    background, so that their turn does not wait on the API. Metadata whose signed media
+    urls expire within `expiry_margin` seconds is fetched afresh when handed out.
+
+    For instance:
+
+    ```python
+    async with EpisodesMetadataPrefetcher(downloadable_files, [(1, 1), (1, 2), (1, 3)]) as prefetcher:
+        for season, episode in prefetcher.episodes:
+            prefetched = await prefetcher.get(season, episode)
+            await media_file_downloader.run(prefetched.metadata.best_media_file, ...)
+    ```
+    """
+
+    def __init__(
+        self,
+        downloadable_files: "BaseDownloadableFilesDetail",
+        episodes: t.Iterable[tuple[int, int]],
+        lookahead: int = 2,
+        preparer: EpisodePreparerType | None = None,
+        expiry_margin: float = DEFAULT_SIGNED_URL_EXPIRY_MARGIN,
+    ):
+        """Constructor for `EpisodesMetadataPrefetcher`
+
+        Args:
+            downloadable_files (BaseDownloadableFilesDetail): Fetches downloadable files metadata of the series.
+            episodes (t.Iterable[tuple[int, int]]): (season, episode) pairs in the order they will be requested.
+            lookahead (int, optional): Number of upcoming episodes to fetch ahead. Defaults to 2.
+            preparer (EpisodePreparerType | None, optional): Also run this on each fetched episode e.g to download captions. Defaults to None.
+            expiry_margin (float, optional): Seconds before signed urls expiry for refreshing metadata. Defaults to DEFAULT_SIGNED_URL_EXPIRY_MARGIN.
+        """  # noqa: E501
+        assert lookahead >= 0, f"Value for lookahead should be atleast 0 not {lookahead}"
+        self.downloadable_files = downloadable_files
+        self.episodes: list[tuple[int, int]] = list(episodes)
+        self.lookahead = lookahead
+        self.preparer = preparer
+        self.expiry_margin = expiry_margin
+
+        self._positions = {season_episode: index for index, season_episode in enumerate(self.episodes)}
+        self._tasks: dict[tuple[int, int], asyncio.Task[PrefetchedEpisode]] = {}
+        self._next_index = 0
+        """Position of the first episode not yet being fetched"""
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__module__}.{self.__class__.__name__} episodes={len(self.episodes)} "
+            f"lookahead={self.lookahead} pending={len(self._tasks)}>"
+        )
+
+    async def __aenter__(self) -> "EpisodesMetadataPrefetcher":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Cancels fetches that are still running"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def is_expiring(self, metadata: DownloadableFilesMetadata) -> bool:
+        """Checks whether signed media urls of the metadata expire within `expiry_margin`"""
+        return metadata.expires_at is not None and metadata.expires_at - self.expiry_margin <= time.time()
+
+    async def _fetch(self, season: int, episode: int) -> PrefetchedEpisode:
+        metadata = await self.downloadable_files.get_content_model(season=season, episode=episode)
+        prepared = None if self.preparer is None else await self.preparer(season, episode, metadata)
+        return PrefetchedEpisode(season=season, episode=episode, metadata=metadata, prepared=prepared)
+
+    def _prefetch_until(self, position: int) -> None:
+        while self._next_index <= min(position, len(self.episodes) - 1):
+            season, episode = self.episodes[self._next_index]
+            self._tasks[(season, episode)] = asyncio.ensure_future(self._fetch(season, episode))
+            self._next_index += 1
+
+    async def get(self, season: int, episode: int) -> PrefetchedEpisode:
+        """Hands out episode details and starts fetching the upcoming ones.
+
+        Args:
+            season (int): Season number of the episode.
+            episode (int): Episode number.
+
+        Returns:
+            PrefetchedEpisode: Episode details with metadata valid for atleast `expiry_margin` seconds.
+        """
+        position = self._positions.get((season, episode))
+        if position is None:
+            return await self._fetch(season, episode)
+
+        self._prefetch_until(position + self.lookahead)
+        task = self._tasks.pop((season, episode), None)
+
+        if task is None:
+            # Handed out already
+            prefetched = await self._fetch(season, episode)
+        else:
+            try:
+                prefetched = await task
+            except Exception as e:
+                logger.debug(f"Prefetching S{season}E{episode} failed - {e!r}. Retrying.")
+                prefetched = await self._fetch(season, episode)
+
+        if self.is_expiring(prefetched.metadata):
+            logger.info(f"Refreshing expiring downloadable files metadata of S{season}E{episode}")
+            prefetched.metadata = await self.downloadable_files.get_content_model(
+                season=season, episode=episode
+            )
+
+        return prefetched
@@ -7,7 +7,7 @@ from moviebox_api.helpers import (
     assert_instance,
     get_absolute_url,
 )
-from moviebox_api.models import SearchResultsItem, StreamFilesMetadata
+from moviebox_api.models import SearchResultsItem, StreamFilesMetadata, build_model
 from moviebox_api.requests import Session
 
 
@@ -74,4 +74,4 @@ class StreamFilesDetail(BaseContentProvider):
             StreamFilesMetadata: Modelled stream files details
         """
         contents = await self.get_content(season, episode)
-        return StreamFilesMetadata(**contents)
+        return build_model(StreamFilesMetadata, contents, self.session.trusted_responses)
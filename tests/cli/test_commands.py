@@ -34,6 +34,7 @@ def test_version():
         ["homepage-content --help"],
         ["popular-search --help"],
         ["item-details --help"],
+        ["jobs list --help"],
     ],
 )
 def test_help(command):
@@ -0,0 +1,92 @@
+import httpx
+import pytest
+
+from moviebox_api.core import MovieDetails, TVSeriesDetails
+from moviebox_api.extractor import JsonDetailsExtractor
+from moviebox_api.extractor.helpers import JsonScriptScanner, locate_json_script
+from moviebox_api.requests import Session
+from tests.extractors import content_paths
+
+APP_INFO = {
+    "code": 0,
+    "message": "ok",
+    "data": [
+        {
+            "channelType": "web",
+            "pkgName": "moviebox",
+            "url": "https://example.com/moviebox.apk",
+            "versionCode": "1",
+            "versionName": "1.0",
+        }
+    ],
+}
+
+
+def create_session(page: bytes, chunk_size: int = 4_096) -> tuple[Session, list[int]]:
+    """Session serving `page` in chunks and recording how many bytes were sent"""
+    sent = []
+
+    async def stream_page():
+        for offset in range(0, len(page), chunk_size):
+            chunk = page[offset : offset + chunk_size]
+            sent.append(len(chunk))
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "get-latest-app-pkgs" in request.url.path:
+            return httpx.Response(200, json=APP_INFO)
+        return httpx.Response(
+            200, content=stream_page(), headers={"content-type": "text/html; charset=utf-8"}
+        )
+
+    return Session(transport=httpx.MockTransport(handler)), sent
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    argnames=["content_path", "details_class"],
+    argvalues=(
+        [content_paths[0][0], MovieDetails],
+        [content_paths[1][0], TVSeriesDetails],
+    ),
+)
+async def test_early_stop_json_details(content_path, details_class):
+    page = content_path.read_bytes()
+    session, sent = create_session(page)
+
+    details = details_class("/detail/item-abc?id=12345678901234567890", session, early_stop=True)
+    extractor = await details.get_json_details_extractor()
+
+    assert isinstance(extractor, JsonDetailsExtractor)
+    assert extractor.details == JsonDetailsExtractor.extract(page.decode("utf-8"))
+    assert sum(sent) < len(page)
+
+
+@pytest.mark.asyncio
+async def test_early_stop_falls_back_to_whole_page():
+    page = b"<html><body>No json-formatted data</body></html>"
+    session, sent = create_session(page, chunk_size=8)
+
+    details = MovieDetails("/detail/item-abc?id=12345678901234567890", session, early_stop=True)
+
+    assert await details.get_json_html_content() == page.decode()
+    assert sum(sent) == len(page)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_json_script_scanner_across_chunks(chunk_size):
+    page = (
+        b'<html><script src="a.js"></script>'
+        b'<script id="data" type="application/json">{"a": 1}</script></html>'
+    )
+    scanner = JsonScriptScanner()
+    buffer = bytearray()
+    location = None
+
+    for offset in range(0, len(page), chunk_size):
+        buffer.extend(page[offset : offset + chunk_size])
+        location = scanner.scan(buffer)
+        if location is not None:
+            break
+
+    assert location == locate_json_script(page)
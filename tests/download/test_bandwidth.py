@@ -0,0 +1,143 @@
+import asyncio
+import time
+from datetime import datetime, time as day_time
+
+import httpx
+import pytest
+
+from moviebox_api.bandwidth import (
+    BandwidthGovernor,
+    BandwidthShare,
+    RateWindow,
+    governed_client_kwargs,
+    parse_rate,
+)
+from moviebox_api.download import MediaFileDownloader
+
+CHUNK = 1_000
+
+
+def test_parse_rate_and_schedule():
+    assert parse_rate("500") == 500
+    assert parse_rate("1.5K") == 1_536
+    assert parse_rate("2MB") == 2 * 1_024**2
+    with pytest.raises(ValueError):
+        parse_rate("fast")
+
+    night = RateWindow.parse("22:00-06:00=unlimited")
+    office = RateWindow.parse("09:00-17:00=1M")
+    assert night.rate is None and night.contains(day_time(23)) and night.contains(day_time(5))
+    assert not night.contains(day_time(12))
+
+    governor = BandwidthGovernor(rate=100, schedule=[office, night])
+    assert governor.current_rate(datetime(2025, 1, 1, 10)) == 1_024**2
+    assert governor.current_rate(datetime(2025, 1, 1, 2)) is None
+    assert governor.current_rate(datetime(2025, 1, 1, 19)) == 100
+
+
+async def take(share: BandwidthShare, chunks: int, order: list):
+    for _ in range(chunks):
+        await share.acquire(CHUNK)
+        order.append(share)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit():
+    governor = BandwidthGovernor(rate=20 * CHUNK, burst=CHUNK)
+    share = BandwidthShare(governor=governor)
+    started = time.monotonic()
+    await take(share, 6, [])
+    # Roughly 5 chunks after the first one are waited for
+    assert time.monotonic() - started >= 0.2
+    assert share.consumed == 6 * CHUNK
+
+
+@pytest.mark.asyncio
+async def test_weights_and_priorities():
+    governor = BandwidthGovernor(rate=200 * CHUNK, burst=CHUNK)
+    heavy = BandwidthShare(weight=3, governor=governor)
+    light = BandwidthShare(weight=1, governor=governor)
+    order = []
+    await asyncio.gather(take(heavy, 12, order), take(light, 12, order))
+    # Heavy gets about 3 chunks for each light one while both wait
+    assert 8 <= order[:16].count(heavy) <= 13
+
+    urgent = BandwidthShare(priority=1, governor=governor)
+    order = []
+    await asyncio.gather(take(light, 5, order), take(urgent, 5, order))
+    assert order[-4:] == [light] * 4
+
+
+@pytest.mark.asyncio
+async def test_live_rate_change():
+    governor = BandwidthGovernor(rate=0, burst=CHUNK)
+    share = BandwidthShare(governor=governor)
+    download = asyncio.ensure_future(take(share, 3, []))
+    await asyncio.sleep(0.1)
+    # Paused
+    assert share.consumed == 0 and not download.done()
+
+    governor.rate = None
+    await asyncio.wait_for(download, 1)
+    assert share.consumed == 3 * CHUNK
+
+
+def set_proxy_environment(monkeypatch):
+    """Sets proxies in the environment as commonly done"""
+    for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+    monkeypatch.setenv("HTTPS_PROXY", "http://localhost:8080")
+    monkeypatch.setenv("NO_PROXY", "localhost,127.0.0.1,::1,.example.com")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("given", ["transport", "mounts"])
+async def test_governed_client(given):
+    class ChunksStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for _ in range(10):
+                yield b"x" * CHUNK
+
+    class ChunksTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            # Unlike MockTransport, the body is left unread for the client to stream
+            return httpx.Response(200, stream=ChunksStream())
+
+    governor = BandwidthGovernor(rate=40 * CHUNK, burst=CHUNK)
+    share = BandwidthShare(governor=governor)
+    # Mounted transports are left to the response hook
+    client_kwargs = governed_client_kwargs(
+        dict(transport=ChunksTransport())
+        if given == "transport"
+        else dict(mounts={"all://": ChunksTransport()}),
+        share,
+    )
+    async with httpx.AsyncClient(**client_kwargs) as client:
+        started = time.monotonic()
+        async with client.stream("GET", "https://example.com/movie.mp4") as response:
+            received = sum([len(chunk) async for chunk in response.aiter_raw()])
+
+    assert received == share.consumed == 10 * CHUNK
+    assert time.monotonic() - started >= 0.15
+
+
+def test_governed_client_builds_own_transports(monkeypatch):
+    set_proxy_environment(monkeypatch)
+    limits = httpx.Limits(max_connections=3)
+    client_kwargs = governed_client_kwargs(dict(limits=limits), BandwidthShare())
+    assert "transport" not in client_kwargs and "mounts" not in client_kwargs
+    assert len(client_kwargs["event_hooks"]["response"]) == 1
+
+    downloader = MediaFileDownloader(limits=limits)
+    client = downloader.throttle_buster.client
+    # Proxies of the environment as httpx sets them up
+    assert {
+        str(pattern.pattern): type(transport).__name__ for pattern, transport in client._mounts.items()
+    } == {
+        "https://": "AsyncHTTPTransport",
+        "all://localhost": "NoneType",
+        "all://127.0.0.1": "NoneType",
+        "all://[::1]": "NoneType",
+        "all://*.example.com": "NoneType",
+    }
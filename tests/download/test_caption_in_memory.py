@@ -0,0 +1,129 @@
+import os
+import stat
+
+import httpx
+import pytest
+
+from moviebox_api.constants import DownloadMode, SubjectType
+from moviebox_api.download import CaptionFileDownloader
+from moviebox_api.helpers import write_file_atomically
+from moviebox_api.models import CaptionFileMetadata, SearchResultsItem
+
+captions_content = {
+    "en": b"1\n00:00:01,000 --> 00:00:02,000\nHello\n",
+    "fr": b"1\n00:00:01,000 --> 00:00:02,000\nBonjour\n",
+}
+
+
+def make_caption_file(lan: str, size: int | None = None) -> CaptionFileMetadata:
+    return CaptionFileMetadata(
+        id=lan,
+        lan=lan,
+        lanName=lan.upper(),
+        url=f"https://cacdn.hakunaymatata.com/subtitle/{lan}.srt?sign=x",
+        size=len(captions_content[lan]) if size is None else size,
+        delay=0,
+    )
+
+
+@pytest.fixture
+def requested_urls() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def caption_downloader(tmp_path, requested_urls) -> CaptionFileDownloader:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, content=captions_content[request.url.path.split("/")[-1][:2]])
+
+    return CaptionFileDownloader(dir=tmp_path, transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_run_in_memory(caption_downloader, requested_urls, tmp_path):
+    caption_file = make_caption_file("en")
+    downloaded = await caption_downloader.run_in_memory(caption_file, filename="movie.en.srt")
+    assert downloaded.saved_to == tmp_path / "movie.en.srt"
+    assert downloaded.saved_to.read_bytes() == captions_content["en"]
+    assert downloaded.is_complete
+    assert len(requested_urls) == 1
+
+    # Complete file is reused unless download is started afresh
+    await caption_downloader.run_in_memory(caption_file, filename="movie.en.srt")
+    assert len(requested_urls) == 1
+    await caption_downloader.run_in_memory(caption_file, filename="movie.en.srt", mode=DownloadMode.START)
+    assert len(requested_urls) == 2
+
+    assert [path.name for path in tmp_path.iterdir()] == ["movie.en.srt"]
+
+
+@pytest.mark.asyncio
+async def test_run_many(caption_downloader, requested_urls, tmp_path):
+    movie = SearchResultsItem(
+        subjectId="1",
+        subjectType=SubjectType.MOVIES,
+        title="Avatar",
+        description="",
+        releaseDate="2009-12-16",
+        duration=0,
+        genre="Action",
+        cover={
+            "url": "https://pbcdn.aoneroom.com/image/avatar.jpg",
+            "width": 1,
+            "height": 1,
+            "size": 1,
+            "format": "jpg",
+            "thumbnail": "",
+            "blurHash": "",
+            "avgHueLight": "",
+            "avgHueDark": "",
+            "id": "1",
+        },
+        countryName="",
+        imdbRatingValue=7.9,
+        detailPath="avatar",
+        appointmentCnt=0,
+        appointmentDate="",
+        corner="",
+        subtitles="",
+        ops='{"rid": "3fa85f64-5717-4562-b3fc-2c963f66afa6", "trace_id": ""}',
+        hasResource=True,
+    )
+    downloaded_items = await caption_downloader.run_many(
+        [make_caption_file("fr"), make_caption_file("en")], filename=movie, disable_progress_bar=True
+    )
+    assert len(requested_urls) == 2
+    assert [downloaded.saved_to.name for downloaded in downloaded_items] == [
+        "Avatar (2009).fr.srt",
+        "Avatar (2009).en.srt",
+    ]
+    assert (tmp_path / "Avatar (2009).en.srt").read_bytes() == captions_content["en"]
+
+    with pytest.raises(ValueError, match="checksum"):
+        await caption_downloader.run_many([make_caption_file("en")], filename=movie, checksum=True)
+    assert len(requested_urls) == 2
+
+
+def test_write_file_atomically(tmp_path):
+    path = tmp_path / "file.srt"
+    path.write_bytes(b"old")
+    write_file_atomically(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert [item.name for item in tmp_path.iterdir()] == ["file.srt"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows lacks posix permission bits")
+def test_write_file_atomically_mode(tmp_path):
+    umask = os.umask(0o027)
+    try:
+        new_path = write_file_atomically(tmp_path / "new.srt", b"new")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(new_path.stat().st_mode) == 0o640
+
+    path = tmp_path / "file.srt"
+    path.write_bytes(b"old")
+    path.chmod(0o640)
+    write_file_atomically(path, b"new")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
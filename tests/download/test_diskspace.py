@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from moviebox_api import diskspace
+from moviebox_api.diskspace import DiskSpaceLedger, SpaceNeed
+from moviebox_api.exceptions import InsufficientDiskSpaceError
+from moviebox_api.scheduler import EpisodesDownloadScheduler
+from tests.download.test_ranged import content, make_downloader, media_file, serve_ranges
+
+
+@pytest.fixture
+def free_bytes(monkeypatch):
+    """Pretends filesystems have this many bytes free"""
+    free = {"bytes": 1_000_000}
+    monkeypatch.setattr(diskspace, "free_space", lambda path: free["bytes"])
+    return free
+
+
+def test_space_need_excludes_written_bytes(tmp_path):
+    need = SpaceNeed.for_file(tmp_path / "movie [1].mp4", 100_000)
+    assert need.outstanding() == 100_000
+
+    (tmp_path / "movie [1].mp4").write_bytes(content[:50_000])
+    assert 0 < need.outstanding() <= 50_000
+
+
+def test_reservations(tmp_path, free_bytes):
+    ledger = DiskSpaceLedger(margin=100_000)
+    reservation_id = ledger.reserve([SpaceNeed(tmp_path, 600_000)])
+    assert ledger.available(tmp_path) == 300_000
+
+    with pytest.raises(InsufficientDiskSpaceError) as error:
+        ledger.reserve([SpaceNeed(tmp_path, 200_000), SpaceNeed(tmp_path / "S1", 200_000)])
+    assert error.value.required == 400_000 and error.value.available == 300_000
+
+    ledger.release(reservation_id)
+    ledger.reserve([SpaceNeed(tmp_path, 200_000), SpaceNeed(tmp_path / "S1", 200_000)])
+
+
+@pytest.mark.asyncio
+async def test_wait_for_released_space(tmp_path, free_bytes):
+    ledger = DiskSpaceLedger(margin=0, poll_interval=0.01)
+
+    with pytest.raises(InsufficientDiskSpaceError):
+        # Nothing running could free space up
+        await ledger.wait([SpaceNeed(tmp_path, 2_000_000)])
+
+    reservation_id = ledger.reserve([SpaceNeed(tmp_path, 800_000)])
+    waiting = asyncio.ensure_future(ledger.acquire([SpaceNeed(tmp_path, 500_000)], wait=True))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    ledger.release(reservation_id)
+    await asyncio.wait_for(waiting, 1)
+    assert ledger.available(tmp_path) == 500_000
+
+
+def test_media_file_space_needs(tmp_path):
+    downloader = make_downloader(tmp_path, serve_ranges([]))
+    # Part files and the merged file
+    assert [need.size for need in downloader.space_needs(100, "movie.mp4")] == [100, 100]
+    assert [need.size for need in downloader.space_needs(100, "movie.mp4", merge_free=True)] == [100]
+    # Single part is moved
+    single_task_downloader = make_downloader(tmp_path, serve_ranges([]), tasks=1)
+    assert [need.size for need in single_task_downloader.space_needs(100, "movie.mp4")] == [100]
+
+    (tmp_path / "movie.mp4").write_bytes(b"x" * 100)
+    assert downloader.space_needs(100, "movie.mp4") == []
+
+
+@pytest.mark.asyncio
+async def test_download_fails_early_without_space(tmp_path, free_bytes):
+    free_bytes["bytes"] = len(content)
+    requested_ranges = []
+    downloader = make_downloader(tmp_path, serve_ranges(requested_ranges))
+
+    with pytest.raises(InsufficientDiskSpaceError):
+        await downloader.run(media_file, filename="movie.mp4", merge_free=True, disable_progress_bar=True)
+    assert requested_ranges == []
+
+    downloaded = await downloader.run(
+        media_file, filename="movie.mp4", merge_free=True, check_disk_space=False, disable_progress_bar=True
+    )
+    assert downloaded.saved_to.read_bytes() == content
+
+
+@pytest.mark.asyncio
+async def test_scheduler_admission():
+    admitted, started = [], []
+
+    async def admission(season: int, episode: int):
+        admitted.append((season, episode))
+        if episode == 2:
+            raise InsufficientDiskSpaceError(None, 1, 0)
+
+    async def worker(season: int, episode: int):
+        started.append((season, episode))
+        return episode
+
+    scheduler = EpisodesDownloadScheduler(tasks=1, admission=admission)
+    with pytest.raises(InsufficientDiskSpaceError):
+        await scheduler.run(worker, [(1, 1), (1, 2), (1, 3)])
+    assert admitted == [(1, 1), (1, 2)] and started == [(1, 1)]
@@ -0,0 +1,196 @@
+import asyncio
+
+import httpx
+import pytest
+
+from moviebox_api.bandwidth import BandwidthShare
+from moviebox_api.cli.downloader import Downloader
+from moviebox_api.download import CaptionFileDownloader, MediaFileDownloader
+from moviebox_api.models import CaptionFileMetadata
+from moviebox_api.requests import Session
+from tests.core.test_item_details_stream import APP_INFO
+from tests.download.test_bandwidth import set_proxy_environment
+from tests.download.test_jobs import series
+from tests.download.test_planner import DownloadableFiles
+from tests.download.test_ranged import media_file
+
+caption_file = CaptionFileMetadata(
+    id="en",
+    lan="en",
+    lanName="English",
+    url="https://cacdn.hakunaymatata.com/subtitle/merlin.srt?sign=x",
+    size=40,
+    delay=0,
+)
+
+
+@pytest.mark.asyncio
+async def test_file_downloaders_reused(tmp_path):
+    async with Downloader() as downloader:
+        share = BandwidthShare(weight=2)
+        movie_downloader = await downloader._get_file_downloader(MediaFileDownloader, dir=tmp_path, tasks=2)
+        assert (
+            await downloader._get_file_downloader(MediaFileDownloader, tasks=2, dir=tmp_path)
+            is movie_downloader
+        )
+        assert (
+            await downloader._get_file_downloader(MediaFileDownloader, dir=tmp_path, tasks=4)
+            is not movie_downloader
+        )
+        assert (
+            await downloader._get_file_downloader(
+                MediaFileDownloader, dir=tmp_path, tasks=2, bandwidth_share=share
+            )
+            is not movie_downloader
+        )
+
+        caption_downloader = await downloader._get_file_downloader(
+            CaptionFileDownloader, dir=tmp_path, tasks=2
+        )
+        assert caption_downloader is not movie_downloader
+        # One connection pool beneath the bandwidth shares
+        (transport,) = downloader._transports.values()
+        assert (
+            caption_downloader.throttle_buster.client._transport.transport
+            is movie_downloader.throttle_buster.client._transport.transport
+            is transport
+        )
+
+        limits = httpx.Limits(max_connections=3)
+        proxied_downloader = await downloader._get_file_downloader(
+            MediaFileDownloader, dir=tmp_path, proxy="http://localhost:8080", limits=limits
+        )
+        # Connection options get a pool of their own
+        assert len(downloader._transports) == 2
+        proxy_transport = proxied_downloader.throttle_buster.client._transport.transport
+        assert proxy_transport is not transport and proxy_transport._pool._max_connections == 3
+        proxied_caption_downloader = await downloader._get_file_downloader(
+            CaptionFileDownloader, dir=tmp_path, proxy="http://localhost:8080", limits=limits
+        )
+        assert proxied_caption_downloader.throttle_buster.client._transport.transport is proxy_transport
+
+
+@pytest.mark.asyncio
+async def test_environment_proxies_not_bypassed(tmp_path, monkeypatch):
+    set_proxy_environment(monkeypatch)
+    async with Downloader() as downloader:
+        movie_downloader = await downloader._get_file_downloader(MediaFileDownloader, dir=tmp_path)
+        # The client sets up the proxies itself
+        assert downloader._transports == {}
+        assert movie_downloader.throttle_buster.client._mounts
+
+
+def test_connections_closed_when_loop_changes(tmp_path, monkeypatch):
+    closed = []
+    aclose = httpx.AsyncHTTPTransport.aclose
+
+    async def record_aclose(self):
+        closed.append(self)
+        await aclose(self)
+
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "aclose", record_aclose)
+    downloader = Downloader()
+
+    async def get_transport():
+        await downloader._get_file_downloader(MediaFileDownloader, dir=tmp_path)
+        (transport,) = downloader._transports.values()
+        return transport
+
+    # Loop left open e.g by the sync methods
+    loop = asyncio.new_event_loop()
+    try:
+        first_transport = loop.run_until_complete(get_transport())
+        second_transport = asyncio.run(get_transport())
+    finally:
+        loop.close()
+
+    assert first_transport is not second_transport
+    assert closed == [first_transport]
+
+    # Connections of a closed loop are dropped
+    assert asyncio.run(get_transport()) is not second_transport
+    assert closed == [first_transport]
+
+
+def test_per_call_filename_templates(tmp_path):
+    movie_downloader = MediaFileDownloader(dir=tmp_path)
+    assert movie_downloader.generate_filename(series, media_file, 1, 2)[0] == "Merlin S1E2.mp4"
+    assert (
+        movie_downloader.generate_filename(series, media_file, 1, 2, filename_template="E{episode}.{ext}")[0]
+        == "E2.mp4"
+    )
+
+    caption_downloader = CaptionFileDownloader(dir=tmp_path)
+    filename, _ = caption_downloader.generate_filename(
+        series, caption_file, 1, 2, filename_template="E{episode}.{lan}.{ext}"
+    )
+    assert filename == "E2.en.srt"
+    # Class templates are left as they are
+    assert MediaFileDownloader.series_filename_template == "{title} S{season}E{episode}.{ext}"
+    assert CaptionFileDownloader.series_filename_template == "{title} S{season}E{episode}.{lan}.{ext}"
+
+
+async def metadata_handler(request: httpx.Request) -> httpx.Response:
+    if "get-latest-app-pkgs" in request.url.path:
+        return httpx.Response(200, json=APP_INFO)
+    params = request.url.params
+    metadata = await DownloadableFiles().get_content_model(int(params["se"]), int(params["ep"]))
+    return httpx.Response(200, json=dict(code=0, message="ok", data=metadata.model_dump(mode="json")))
+
+
+@pytest.mark.asyncio
+async def test_caption_failure_spares_media_download(monkeypatch):
+    async def run_many(self, *args, **kwargs):
+        raise httpx.ConnectError("Caption server is down")
+
+    async def run(self, media_file, filename, season=0, episode=0, **run_kwargs):
+        return f"S{season}E{episode}.mp4"
+
+    monkeypatch.setattr(CaptionFileDownloader, "run_many", run_many)
+    monkeypatch.setattr(MediaFileDownloader, "run", run)
+
+    async def search_function(*args, **kwargs):
+        return series
+
+    downloader = Downloader(Session(transport=httpx.MockTransport(metadata_handler)))
+    assert await downloader.download_movie(
+        series.title, search_function=search_function, download_caption=True
+    ) == ("S0E0.mp4", [])
+
+    assert await downloader.download_tv_series(
+        series.title,
+        season=1,
+        episode=1,
+        episodes=[(1, 1)],
+        search_function=search_function,
+        download_caption=True,
+    ) == {1: {1: {"captions": [], "movie": "S1E1.mp4"}}}
+
+
+@pytest.mark.asyncio
+async def test_media_file_options_kept_from_captions(monkeypatch):
+    run_options = {}
+
+    async def run_many(self, caption_files, filename, **run_kwargs):
+        self._reject_unsupported_run_options(run_kwargs)
+        return []
+
+    async def run(self, media_file, filename, **run_kwargs):
+        run_options.update(run_kwargs)
+        return "movie.mp4"
+
+    monkeypatch.setattr(CaptionFileDownloader, "run_many", run_many)
+    monkeypatch.setattr(MediaFileDownloader, "run", run)
+
+    async def search_function(*args, **kwargs):
+        return series
+
+    downloader = Downloader(Session(transport=httpx.MockTransport(metadata_handler)))
+    assert await downloader.download_movie(
+        series.title,
+        search_function=search_function,
+        download_caption=True,
+        checksum=True,
+        check_disk_space=False,
+    ) == ("movie.mp4", [])
+    assert run_options["checksum"] is True and run_options["check_disk_space"] is False
@@ -0,0 +1,91 @@
+import pytest
+
+from moviebox_api.download import BaseDownloadableFilesDetail
+from moviebox_api.exceptions import MediaFileChangedError, ZeroMediaFileError
+from moviebox_api.models import DownloadableFilesMetadata, build_model
+
+downloadable_files_contents = {
+    "downloads": [
+        {
+            "id": str(index),
+            "url": f"https://bcdn.hakunaymatata.com/resource/{index}.mp4",
+            "resolution": resolution,
+            "size": size,
+        }
+        for index, (resolution, size) in enumerate([(720, 500), (360, 100), (1080, 900), (480, 300)])
+    ],
+    "captions": [
+        {
+            "id": str(index),
+            "lan": lan,
+            "lanName": lan_name,
+            "url": f"https://cacdn.hakunaymatata.com/subtitle/{index}.srt",
+            "size": size,
+            "delay": 0,
+        }
+        for index, (lan, lan_name, size) in enumerate([("en", "English", 40), ("fr", "French", 30)])
+    ],
+    "limited": False,
+    "limitedCode": "",
+    "hasResource": True,
+}
+
+
+@pytest.fixture(params=[False, True], ids=["strict", "trusted"])
+def files_metadata(request) -> DownloadableFilesMetadata:
+    return build_model(DownloadableFilesMetadata, downloadable_files_contents, request.param)
+
+
+def test_media_file_indexes(files_metadata):
+    assert files_metadata.best_media_file.resolution == 1080
+    assert files_metadata.worst_media_file.resolution == 360
+    assert [media_file.size for media_file in files_metadata.media_files_by_size] == [100, 300, 500, 900]
+    assert files_metadata.get_media_file_by_resolution(480).id == "3"
+    # Callers get copies of the index
+    files_metadata.get_quality_downloads_map().clear()
+    assert files_metadata.get_quality_downloads_map().keys() == {"360P", "480P", "720P", "1080P"}
+    with pytest.raises(TypeError):
+        files_metadata.resolution_media_file_map[240] = files_metadata.best_media_file
+    assert files_metadata.get_media_file_by_quality("720P").id == "0"
+    assert files_metadata.get_media_file_by_quality("WORST").id == "1"
+
+    with pytest.raises(ValueError):
+        files_metadata.get_media_file_by_resolution(240)
+
+
+def test_caption_indexes(files_metadata):
+    assert [caption.lan for caption in files_metadata.captions_by_size] == ["fr", "en"]
+    assert files_metadata.get_subtitle_by_language("en") is files_metadata.get_subtitle_by_language("english")
+    assert files_metadata.get_subtitle_by_language("de") is None
+
+    files_metadata.get_language_short_subtitle_map().clear()
+    files_metadata.get_language_subtitle_map().clear()
+    assert files_metadata.get_subtitle_by_language("fr").lan == "fr"
+    assert files_metadata.get_subtitle_by_language("English").lan == "en"
+
+
+def test_select_files(files_metadata):
+    selected = files_metadata.select_files("480P", ["French", "en", "fr", "German"])
+    assert selected.media_file.resolution == 480
+    assert [caption.lan for caption in selected.captions] == ["fr", "en"]
+    assert selected.missing_languages == ("German",)
+    assert files_metadata.select_files("240P").media_file is None
+
+
+def test_select_files_without_downloads():
+    files_metadata = DownloadableFilesMetadata(
+        downloads=[], captions=[], limited=False, limitedCode="", hasResource=False
+    )
+    with pytest.raises(ZeroMediaFileError):
+        files_metadata.select_files()
+
+
+def test_match_media_file(files_metadata):
+    media_file = files_metadata.get_media_file_by_resolution(720)
+    fresh = build_model(DownloadableFilesMetadata, downloadable_files_contents)
+    assert BaseDownloadableFilesDetail._match_media_file(fresh, media_file) == fresh.downloads[0]
+
+    with pytest.raises(MediaFileChangedError):
+        BaseDownloadableFilesDetail._match_media_file(
+            fresh, media_file.model_copy(update={"size": media_file.size + 1})
+        )
@@ -0,0 +1,147 @@
+from pathlib import Path
+
+import pytest
+
+from moviebox_api.cli.downloader import Downloader, make_job_options
+from moviebox_api.constants import DownloadMode, SubjectType
+from moviebox_api.jobs import JobStatus, JobStore
+from moviebox_api.models import SearchResultsItem, build_model
+from moviebox_api.ranged import RangeManifest
+
+series = SearchResultsItem(
+    subjectId="2",
+    subjectType=SubjectType.TV_SERIES,
+    title="Merlin",
+    description="",
+    releaseDate="2008-09-20",
+    duration=0,
+    genre="Drama,Fantasy",
+    cover={
+        "url": "https://pbcdn.aoneroom.com/image/merlin.jpg",
+        "width": 1,
+        "height": 1,
+        "size": 1,
+        "format": "jpg",
+        "thumbnail": "",
+        "blurHash": "",
+        "avgHueLight": "",
+        "avgHueDark": "",
+        "id": "2",
+    },
+    countryName="",
+    imdbRatingValue=7.9,
+    detailPath="merlin",
+    appointmentCnt=0,
+    appointmentDate="",
+    corner="",
+    subtitles="en,fr",
+    ops='{"rid": "3fa85f64-5717-4562-b3fc-2c963f66afa6", "trace_id": ""}',
+    hasResource=True,
+)
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    with JobStore(tmp_path / "jobs.sqlite3") as job_store:
+        yield job_store
+
+
+@pytest.fixture
+def job_id(job_store) -> int:
+    return job_store.create_job(
+        SubjectType.TV_SERIES,
+        series.title,
+        series.model_dump(mode="json", by_alias=True),
+        "BEST",
+        {"tasks": 2},
+        [(1, 2), (1, 1), (2, 1)],
+    )
+
+
+def test_job_store(job_store, job_id):
+    job = job_store.get_job(job_id)
+    assert job.subject_type == SubjectType.TV_SERIES and job.status == JobStatus.PENDING
+    assert [(item.season, item.episode) for item in job.items] == [(1, 1), (1, 2), (2, 1)]
+    assert build_model(SearchResultsItem, job.item) == series
+
+    job_store.update_item(job_id, 1, 1, status=JobStatus.COMPLETED, completed_ranges=[[0, 100]])
+    job_store.update_item(job_id, 1, 2, status=JobStatus.FAILED, error="ReadTimeout()")
+    assert job_store.settle_status(job_id) == JobStatus.FAILED
+
+    job = job_store.list_jobs(JobStatus.FAILED)[0]
+    assert job.completed_count == 1 and job.items[0].completed_size == 100
+    assert [(item.season, item.episode) for item in job.unfinished_items] == [(1, 2), (2, 1)]
+
+    assert job_store.cancel(job_id)
+    assert job_store.get_item(job_id, 2, 1).status == JobStatus.CANCELLED
+    assert job_store.settle_status(job_id) == JobStatus.CANCELLED
+
+    job_store.reopen(job_id)
+    assert {item.status for item in job_store.get_job(job_id).unfinished_items} == {JobStatus.PENDING}
+
+    # Another process sees the same jobs
+    with JobStore(job_store.path) as other_job_store:
+        assert other_job_store.get_job(job_id) == job_store.get_job(job_id)
+
+    job_store.delete(job_id)
+    assert job_store.get_job(job_id) is None and job_store.list_jobs() == []
+
+
+def test_make_job_options():
+    options = make_job_options(
+        dict(
+            self=object(),
+            title="Merlin",
+            season=1,
+            dir=Path("/tmp"),
+            language=("English",),
+            search_function=print,
+            run_kwargs=dict(mode=DownloadMode.RESUME, progress_hook=print),
+        )
+    )
+    assert options == dict(dir="/tmp", language=("English",), mode=DownloadMode.RESUME)
+
+
+@pytest.mark.asyncio
+async def test_run_job_item(job_store, job_id, tmp_path):
+    saved_to = tmp_path / "Merlin S1E1.mp4"
+    job_store.update_item(job_id, 1, 1, size=100, saved_to=str(saved_to))
+    job_store.update_item(job_id, 1, 2, size=100, saved_to=str(tmp_path / "Merlin S1E2.mp4"))
+
+    async def download():
+        assert job_store.get_item(job_id, 1, 1).status == JobStatus.RUNNING
+        return "downloaded"
+
+    assert await Downloader._run_job_item(job_store, job_id, 1, 1, download) == "downloaded"
+    assert job_store.get_item(job_id, 1, 1).completed_ranges == [[0, 100]]
+
+    manifest = RangeManifest(path=RangeManifest.path_for(saved_to), size=100)
+    manifest.mark_completed(0, 40)
+    manifest.save()
+
+    async def fail():
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        await Downloader._run_job_item(job_store, job_id, 1, 1, fail)
+
+    job_item = job_store.get_item(job_id, 1, 1)
+    assert job_item.status == JobStatus.FAILED and job_item.completed_ranges == [[0, 40]]
+    assert job_store.get_status(job_id) == JobStatus.FAILED
+
+    job_store.cancel(job_id)
+    assert await Downloader._run_job_item(job_store, job_id, 2, 1, download) is None
+    assert job_store.get_item(job_id, 2, 1).status == JobStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_resume_completed_job(job_store, job_id):
+    for season, episode in [(1, 1), (1, 2), (2, 1)]:
+        job_store.update_item(job_id, season, episode, status=JobStatus.COMPLETED)
+
+    # Nothing is requested
+    assert await Downloader().resume_job(job_id, job_store) is None
+    assert job_store.get_status(job_id) == JobStatus.COMPLETED
+
+    with pytest.raises(ValueError):
+        await Downloader().resume_job(job_id + 1, job_store)
@@ -0,0 +1,173 @@
+import os
+import sqlite3
+
+import httpx
+import pytest
+from throttlebuster import DownloadedFile
+
+from moviebox_api.checksums import FileChecksums
+from moviebox_api.cli.downloader import Downloader
+from moviebox_api.download import CaptionFileDownloader, MediaFileDownloader
+from moviebox_api.library import LibraryIndex
+from moviebox_api.planner import EpisodesDownloadPlanner
+from moviebox_api.quality import QualityPolicy
+from moviebox_api.requests import Session
+from tests.core.test_item_details_stream import APP_INFO
+from tests.download.test_jobs import series
+from tests.download.test_planner import DownloadableFiles
+
+
+@pytest.fixture
+def library(tmp_path):
+    with LibraryIndex(tmp_path / "library.sqlite3") as library:
+        yield library
+
+
+def save_episode(
+    library: LibraryIndex,
+    directory,
+    season: int,
+    episode: int,
+    resolution: int = 720,
+    quality: str | None = "BEST",
+):
+    saved_to = directory / f"Merlin S{season}E{episode}.mp4"
+    saved_to.write_bytes(b"x" * 100)
+    downloaded_file = DownloadedFile(
+        url="https://bcdn.hakunaymatata.com/resource/merlin.mp4",
+        saved_to=saved_to,
+        expected_size=100,
+        size=100,
+        duration=1,
+        merge_duration=0,
+    )
+    return library.add(series.subjectId, downloaded_file, resolution, season, episode, quality)
+
+
+def test_find_present_entries(library, tmp_path):
+    entry = save_episode(library, tmp_path, 1, 1)
+    assert entry.digest is None and entry.path == str(tmp_path / "Merlin S1E1.mp4")
+    assert library.find(series.subjectId, 1, 1) == entry
+    assert library.find(series.subjectId, 1, 1, quality="720P") == entry
+    assert library.find(series.subjectId, 1, 1, quality="1080P") is None
+    assert library.find(series.subjectId, 1, 2) is None
+
+    # Changed files are forgotten
+    with open(entry.path, "ab") as fh:
+        fh.write(b"x")
+    assert library.find(series.subjectId, 1, 1) is None
+    assert library.entries(series.subjectId) == []
+
+
+def test_best_quality_needs_best_download(library, tmp_path):
+    entry = save_episode(library, tmp_path, 1, 1, 360, quality="360P")
+    assert library.find(series.subjectId, 1, 1) is None
+    assert library.find(series.subjectId, 1, 1, quality="WORST") == entry
+    assert library.find(series.subjectId, 1, 1, quality="360P") == entry
+    # Recorded before requested qualities were kept
+    save_episode(library, tmp_path, 1, 2, 1080, quality=None)
+    assert library.find_many(series.subjectId, [(1, 1), (1, 2)]) == {}
+
+
+def test_database_without_quality_column(tmp_path):
+    path = tmp_path / "library.sqlite3"
+    with sqlite3.connect(path) as connection:
+        connection.executescript(LibraryIndex.schema.replace("quality TEXT,", ""))
+    connection.close()
+
+    with LibraryIndex(path) as library:
+        entry = save_episode(library, tmp_path, 1, 1)
+        assert library.find(series.subjectId, 1, 1) == entry
+
+
+def test_digest_from_checksums_sidecar(library, tmp_path):
+    saved_to = tmp_path / "Merlin S1E1.mp4"
+    FileChecksums(
+        FileChecksums.path_for(saved_to), algorithm="sha256", block_size=100, size=100, blocks=["ab" * 32]
+    ).save()
+    entry = save_episode(library, tmp_path, 1, 1)
+    assert entry.algorithm == "sha256" and entry.digest is not None
+
+
+def test_find_many(library, tmp_path):
+    save_episode(library, tmp_path, 1, 1, 480)
+    save_episode(library, tmp_path, 1, 1, 1080)
+    save_episode(library, tmp_path, 1, 2)
+    os.remove(save_episode(library, tmp_path, 2, 1).path)
+
+    found = library.find_many(series.subjectId, [(1, 1), (1, 2), (2, 1), (2, 2)])
+    assert {key: entry.resolution for key, entry in found.items()} == {(1, 1): 1080, (1, 2): 720}
+    assert list(library.find_many(series.subjectId, [(1, 1), (1, 2)], quality="1080P")) == [(1, 1)]
+
+
+@pytest.mark.asyncio
+async def test_skip_present_episodes(library, tmp_path):
+    save_episode(library, tmp_path, 1, 1)
+    save_episode(library, tmp_path, 1, 2)
+
+    downloadable_files = DownloadableFiles()
+    planner = EpisodesDownloadPlanner(downloadable_files, QualityPolicy(), bandwidth=100, library=library)
+    plan = await planner.plan([(1, 1), (1, 2), (1, 3)])
+    assert plan.present_episodes == [(1, 1), (1, 2)]
+    assert plan.target_episodes == [(1, 3)]
+
+    async def search_function(*args, **kwargs):
+        return series
+
+    # Nothing is requested when all episodes are present
+    assert (
+        await Downloader().download_tv_series(
+            series.title,
+            season=1,
+            episode=1,
+            episodes=[(1, 1), (1, 2)],
+            search_function=search_function,
+            library=library,
+        )
+        == {}
+    )
+
+
+@pytest.mark.asyncio
+async def test_captions_of_present_items_downloaded(library, tmp_path, monkeypatch):
+    save_episode(library, tmp_path, 0, 0)
+    save_episode(library, tmp_path, 1, 1)
+    save_episode(library, tmp_path, 1, 2)
+    downloaded_captions = []
+
+    async def run_many(self, caption_files, filename, season=0, episode=0, **run_kwargs):
+        downloaded_captions.append((season, episode, [caption_file.lan for caption_file in caption_files]))
+        return [f"S{season}E{episode}.srt" for _ in caption_files]
+
+    async def run(self, *args, **kwargs):
+        raise AssertionError("Media files present in library should not be downloaded")
+
+    monkeypatch.setattr(CaptionFileDownloader, "run_many", run_many)
+    monkeypatch.setattr(MediaFileDownloader, "run", run)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if "get-latest-app-pkgs" in request.url.path:
+            return httpx.Response(200, json=APP_INFO)
+        params = request.url.params
+        metadata = await DownloadableFiles().get_content_model(int(params["se"]), int(params["ep"]))
+        return httpx.Response(200, json=dict(code=0, message="ok", data=metadata.model_dump(mode="json")))
+
+    async def search_function(*args, **kwargs):
+        return series
+
+    downloader = Downloader(Session(transport=httpx.MockTransport(handler)))
+    assert await downloader.download_movie(
+        series.title, search_function=search_function, library=library, download_caption=True
+    ) == (None, ["S0E0.srt"])
+
+    assert await downloader.download_tv_series(
+        series.title,
+        season=1,
+        episode=1,
+        episodes=[(1, 1), (1, 2)],
+        search_function=search_function,
+        library=library,
+        download_caption=True,
+        ignore_missing_caption=True,
+    ) == {1: {1: {"captions": ["S1E1.srt"], "movie": None}, 2: {"captions": [], "movie": None}}}
+    assert downloaded_captions == [(0, 0, ["en"]), (1, 1, ["en"]), (1, 2, [])]
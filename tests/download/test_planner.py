@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from moviebox_api.models import DownloadableFilesMetadata, build_model
+from moviebox_api.planner import DownloadPlan, EpisodesDownloadPlanner, measured_bandwidth
+from moviebox_api.quality import QualityPolicy
+from moviebox_api.ranged import TunedTasksStore
+from tests.download.test_jobs import series
+
+
+class DownloadableFiles:
+    _item = series
+
+    def __init__(self):
+        self.running = 0
+        self.most_running = 0
+
+    async def get_content_model(self, season: int, episode: int) -> DownloadableFilesMetadata:
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return DownloadableFilesMetadata(
+            downloads=[
+                {
+                    "id": f"{season}{episode}{resolution}",
+                    "url": f"https://bcdn.hakunaymatata.com/resource/{season}{episode}-{resolution}.mp4",
+                    "resolution": resolution,
+                    "size": size,
+                }
+                for resolution, size in [(480, 300), (720, 500), (1080, 900)]
+            ],
+            captions=[
+                {
+                    "id": "en",
+                    "lan": "en",
+                    "lanName": "English",
+                    "url": f"https://cacdn.hakunaymatata.com/subtitle/{season}{episode}.srt",
+                    "size": 40,
+                    "delay": 0,
+                }
+            ]
+            if episode != 2
+            else [],
+            limited=False,
+            limitedCode="",
+            hasResource=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_plan_episodes(tmp_path):
+    downloadable_files = DownloadableFiles()
+    planner = EpisodesDownloadPlanner(
+        downloadable_files, QualityPolicy("720P"), languages=["en"], concurrency=3, bandwidth=100
+    )
+    episodes = [(2, 1), (1, 1), (1, 2), (1, 3), (1, 4), (2, 2)]
+    plan = await planner.plan(episodes)
+
+    assert downloadable_files.most_running == 3
+    assert plan.target_episodes == sorted(episodes)
+    assert plan.season_sizes == {1: 4 * 500, 2: 2 * 500}
+    assert plan.total_size == 3_000 and plan.estimated_duration == 30
+    assert [(planned.season, planned.episode) for planned in plan.episodes if planned.missing_captions] == [
+        (1, 2),
+        (2, 2),
+    ]
+
+    plan.save(tmp_path / "plan.json")
+    loaded_plan = DownloadPlan.load(tmp_path / "plan.json")
+    assert loaded_plan == plan
+    assert loaded_plan.media_files[(2, 1)].resolution == 720
+
+
+@pytest.mark.asyncio
+async def test_plan_within_season_budget():
+    planner = EpisodesDownloadPlanner(DownloadableFiles(), QualityPolicy(season_budget=2_000), bandwidth=100)
+    plan = await planner.plan([(1, episode) for episode in range(1, 4)])
+    assert [planned.media_file.resolution for planned in plan.episodes] == [720, 720, 1080]
+
+
+class TrustedDownloadableFiles(DownloadableFiles):
+    async def get_content_model(self, season: int, episode: int) -> DownloadableFilesMetadata:
+        metadata = await super().get_content_model(season, episode)
+        return build_model(DownloadableFilesMetadata, metadata.model_dump(mode="json"), trusted=True)
+
+
+@pytest.mark.asyncio
+async def test_plan_from_trusted_metadata(tmp_path):
+    plan = await EpisodesDownloadPlanner(TrustedDownloadableFiles(), QualityPolicy("720P")).plan(
+        [(1, 1), (1, 2)]
+    )
+    assert [str(media_file.url) for media_file in plan.media_files.values()] == [
+        "https://bcdn.hakunaymatata.com/resource/11-720.mp4",
+        "https://bcdn.hakunaymatata.com/resource/12-720.mp4",
+    ]
+    plan.save(tmp_path / "plan.json")
+    assert DownloadPlan.load(tmp_path / "plan.json").total_size == 1_000
+
+
+def test_measured_bandwidth(tmp_path):
+    tuned_tasks_store = TunedTasksStore(tmp_path / "tuned_tasks.json")
+    assert measured_bandwidth(["bcdn.hakunaymatata.com"], tuned_tasks_store) is None
+
+    tuned_tasks_store.set("bcdn.hakunaymatata.com", 4, 2_000_000)
+    tuned_tasks_store.set("bcdnw.hakunaymatata.com", 4, 3_000_000)
+    assert measured_bandwidth(["bcdn.hakunaymatata.com"], tuned_tasks_store) == 2_000_000
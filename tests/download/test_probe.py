@@ -0,0 +1,90 @@
+import httpx
+import pytest
+
+from moviebox_api.probe import AvailabilityProber, ProbeTarget, probe_url
+from moviebox_api.quality import QualityPolicy
+from tests.download.test_planner import DownloadableFiles
+
+SIZES = {"480": 300, "720": 500, "1080": 900}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if "/21-" in request.url.path:
+        return httpx.Response(404)
+
+    if request.url.path.endswith(".srt"):
+        size = 40
+    else:
+        size = SIZES[request.url.path.rsplit("-", 1)[1].removesuffix(".mp4")]
+        if "/31-" in request.url.path:
+            # Server is serving a different file
+            size += 1
+
+    assert request.headers["range"] == "bytes=0-0"
+    return httpx.Response(206, headers={"content-range": f"bytes 0-0/{size}"}, content=b"x")
+
+
+@pytest.mark.asyncio
+async def test_probe_url():
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await probe_url(client, "https://bcdn.hakunaymatata.com/resource/11-720.mp4")
+        assert result.reachable and result.size == 500
+
+        result = await probe_url(client, "https://bcdn.hakunaymatata.com/resource/12-1080.mp4")
+        assert result.reachable and result.size == 900
+
+        result = await probe_url(client, "https://bcdn.hakunaymatata.com/resource/21-720.mp4")
+        assert not result.reachable and result.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_probe_episodes():
+    downloadable_files = DownloadableFiles()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        prober = AvailabilityProber(
+            QualityPolicy("720P"), languages=["English"], metadata_concurrency=2, client=client
+        )
+        (availability,) = await prober.probe(
+            [ProbeTarget(downloadable_files, episodes=((1, 1), (1, 2), (2, 1), (3, 1)))]
+        )
+
+    assert downloadable_files.most_running == 2
+    assert availability.available_count == 2
+    assert [episode.to_dict() for episode in availability.episodes] == [
+        dict(
+            season=1,
+            episode=1,
+            available=True,
+            resolution=720,
+            status=206,
+            captions={"English": True},
+            error=None,
+        ),
+        dict(
+            season=1,
+            episode=2,
+            available=True,
+            resolution=720,
+            status=206,
+            captions={"English": False},
+            error=None,
+        ),
+        dict(
+            season=2,
+            episode=1,
+            available=False,
+            resolution=720,
+            status=404,
+            captions={"English": True},
+            error=None,
+        ),
+        dict(
+            season=3,
+            episode=1,
+            available=False,
+            resolution=720,
+            status=206,
+            captions={"English": True},
+            error=None,
+        ),
+    ]
@@ -0,0 +1,75 @@
+import pytest
+
+from moviebox_api.download import resolve_media_file_to_be_downloaded
+from moviebox_api.exceptions import QualityUnavailableError
+from moviebox_api.models import DownloadableFilesMetadata, build_model
+from moviebox_api.quality import QualityPolicy
+
+
+def make_files_metadata(*qualities: tuple[int, int]) -> DownloadableFilesMetadata:
+    return build_model(
+        DownloadableFilesMetadata,
+        {
+            "downloads": [
+                {
+                    "id": str(index),
+                    "url": f"https://bcdn.hakunaymatata.com/resource/{index}.mp4",
+                    "resolution": resolution,
+                    "size": size,
+                }
+                for index, (resolution, size) in enumerate(qualities)
+            ],
+            "captions": [],
+            "limited": False,
+            "limitedCode": "",
+            "hasResource": True,
+        },
+    )
+
+
+files_metadata = make_files_metadata((360, 100), (480, 300), (720, 500), (1080, 900))
+
+
+def test_missing_exact_quality():
+    with pytest.raises(RuntimeError, match=r"\['360P', '480P', '1080P'\]"):
+        resolve_media_file_to_be_downloaded("720P", make_files_metadata((360, 100), (480, 300), (1080, 900)))
+
+    metadata = make_files_metadata((360, 100), (1080, 900))
+    # Equally near qualities favour the lower one
+    assert QualityPolicy("720P").select(metadata).resolution == 360
+    with pytest.raises(QualityUnavailableError):
+        QualityPolicy("720P", fallback=False).select(metadata)
+
+
+def test_per_file_constraints():
+    assert QualityPolicy(max_file_size=600).select(files_metadata).resolution == 720
+    assert QualityPolicy("1080P", max_file_size=400).select(files_metadata).resolution == 480
+    assert QualityPolicy("WORST", max_file_size=50).rank(files_metadata) == []
+
+    # 500 bytes over 10 seconds are 400 bits per second
+    policy = QualityPolicy(max_bitrate=400)
+    assert resolve_media_file_to_be_downloaded(policy, files_metadata, duration=10).resolution == 720
+    # Unknown duration leaves bitrate unchecked
+    assert policy.select(files_metadata).resolution == 1080
+
+    with pytest.raises(QualityUnavailableError, match=r"360P \(100"):
+        QualityPolicy(max_file_size=50).select(files_metadata)
+
+
+def test_season_plan():
+    episodes_metadata = {(1, episode): files_metadata for episode in range(1, 5)}
+
+    plan = QualityPolicy(season_budget=4 * 900).plan(episodes_metadata)
+    assert [media_file.resolution for media_file in plan.values()] == [1080] * 4
+
+    plan = QualityPolicy(season_budget=3_000).plan(episodes_metadata)
+    # Biggest and earliest episodes are lowered first
+    assert [media_file.resolution for media_file in plan.values()] == [720, 720, 1080, 1080]
+    assert sum(media_file.size for media_file in plan.values()) <= 3_000
+    assert plan == QualityPolicy(season_budget=3_000).plan(dict(reversed(episodes_metadata.items())))
+
+    plan = QualityPolicy("720P", season_budget=1_000).plan(episodes_metadata)
+    assert [media_file.resolution for media_file in plan.values()] == [360, 480, 480, 480]
+
+    with pytest.raises(QualityUnavailableError, match="exceeding the budget"):
+        QualityPolicy(season_budget=300).plan(episodes_metadata)
@@ -0,0 +1,518 @@
+import asyncio
+import os
+import threading
+import time
+
+import httpx
+import pytest
+
+from moviebox_api.checksums import BlockHasher, FileChecksums, compute_checksums, verify_checksums
+from moviebox_api.constants import DownloadMode
+from moviebox_api.download import MediaFileDownloader
+from moviebox_api.exceptions import DownloadIntegrityError
+from moviebox_api.models import MediaFileMetadata
+from moviebox_api.ranged import (
+    BaseSink,
+    ByteRange,
+    DownloadSources,
+    OrderedStreamSink,
+    PositionalFileSink,
+    RangedDownloader,
+    RangeManifest,
+    RefreshableUrl,
+    TasksTuner,
+    TunedTasksStore,
+)
+
+content = os.urandom(100_003)
+
+media_file = MediaFileMetadata(
+    id="1",
+    url="https://bcdn.hakunaymatata.com/resource/movie.mp4?sign=x",
+    resolution=720,
+    size=len(content),
+)
+
+
+def serve_ranges(requested_ranges: list[str | None], fail_at: int | None = None):
+    """Handler serving `content` in ranges and closing the response early once at `fail_at`"""
+    state = {"failed": False}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"content-length": str(len(content)), "etag": '"abc"', "accept-ranges": "bytes"}
+        range_header = request.headers.get("range")
+        requested_ranges.append(range_header)
+        if range_header is None:
+            return httpx.Response(200, headers=headers, content=content)
+
+        start, end = (int(value) for value in range_header.removeprefix("bytes=").split("-"))
+        body = content[start : end + 1]
+        if fail_at is not None and start <= fail_at <= end and not state["failed"]:
+            state["failed"] = True
+            body = content[start:fail_at]
+
+        headers["content-length"] = str(len(body))
+        headers["content-range"] = f"bytes {start}-{end}/{len(content)}"
+        return httpx.Response(206, headers=headers, content=body)
+
+    return handler
+
+
+def make_downloader(tmp_path, handler, tasks: int = 4) -> MediaFileDownloader:
+    return MediaFileDownloader(
+        dir=tmp_path, part_dir=tmp_path, tasks=tasks, chunk_size=8, transport=httpx.MockTransport(handler)
+    )
+
+
+def test_byte_range_split():
+    ranges = ByteRange(10, 21).split(3)
+    assert [(byte_range.start, byte_range.end) for byte_range in ranges] == [(10, 14), (14, 18), (18, 21)]
+    assert ranges[0].header == "bytes=10-13"
+    assert len(ByteRange(0, 2).split(5)) == 2
+
+
+def test_manifest_remaining(tmp_path):
+    manifest = RangeManifest(path=tmp_path / "file.ranges.json", size=100)
+    manifest.mark_completed(10, 20)
+    manifest.mark_completed(50, 60)
+    manifest.mark_completed(20, 30)
+    assert manifest.completed == [[10, 30], [50, 60]]
+    assert manifest.completed_size == 30
+    assert [(byte_range.start, byte_range.end) for byte_range in manifest.remaining()] == [
+        (0, 10),
+        (30, 50),
+        (60, 100),
+    ]
+    manifest.save()
+    assert RangeManifest.load(manifest.path) == manifest
+
+    manifest.mark_completed(0, 100)
+    assert manifest.is_complete and manifest.remaining() == []
+
+
+@pytest.mark.asyncio
+async def test_merge_free_download(tmp_path):
+    requested_ranges = []
+    downloader = make_downloader(tmp_path, serve_ranges(requested_ranges, fail_at=60_000))
+    downloaded = await downloader.run(
+        media_file, filename="movie.mp4", merge_free=True, disable_progress_bar=True
+    )
+    assert downloaded.saved_to == tmp_path / "movie.mp4"
+    assert downloaded.saved_to.read_bytes() == content
+    assert downloaded.is_complete and downloaded.merge_duration == 0
+    # No part files nor manifest are left behind
+    assert [path.name for path in tmp_path.iterdir()] == ["movie.mp4"]
+    # Probe, 4 ranges and a retry of the range cut short
+    assert len(requested_ranges) == 6
+
+
+@pytest.mark.asyncio
+async def test_merge_free_download_resumes_from_manifest(tmp_path):
+    saved_to = tmp_path / "movie.mp4"
+    saved_to.write_bytes(content[:40_000] + bytes(len(content) - 40_000))
+    manifest = RangeManifest(path=RangeManifest.path_for(saved_to), size=len(content), etag='"abc"')
+    manifest.mark_completed(0, 40_000)
+    manifest.save()
+
+    requested_ranges = []
+    downloader = make_downloader(tmp_path, serve_ranges(requested_ranges), tasks=2)
+    downloaded = await downloader.run(
+        media_file, filename="movie.mp4", merge_free=True, disable_progress_bar=True
+    )
+    assert downloaded.saved_to.read_bytes() == content
+    assert requested_ranges[1:] == ["bytes=40000-70001", "bytes=70002-100002"]
+    assert not manifest.path.exists()
+
+    # Complete file without manifest is not downloaded again
+    requested_ranges.clear()
+    await downloader.run(media_file, filename="movie.mp4", merge_free=True, disable_progress_bar=True)
+    assert requested_ranges == [None]
+
+    await downloader.run(
+        media_file, filename="movie.mp4", merge_free=True, disable_progress_bar=True, mode=DownloadMode.START
+    )
+    assert len(requested_ranges) == 4
+
+
+class MemorySink(BaseSink):
+    async def open(self, size, resume=False):
+        self.content = bytearray(size)
+
+    async def write(self, offset, data):
+        self.content[offset : offset + len(data)] = data
+
+    async def close(self):
+        pass
+
+
+def serve_slowly(slow_starts: set[int] | None, delay: float, stall_once: bool = False):
+    """Async handler streaming ranges starting at slow_starts in small delayed pieces"""
+    stalled = set()
+
+    async def stream(body: bytes, start: int):
+        for position in range(0, len(body), 1_000):
+            if slow_starts is None or start in slow_starts:
+                if stall_once and start not in stalled:
+                    stalled.add(start)
+                    await asyncio.sleep(60)
+                await asyncio.sleep(delay)
+            yield body[position : position + 1_000]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        start, end = (int(value) for value in request.headers["range"].removeprefix("bytes=").split("-"))
+        return httpx.Response(206, content=stream(content[start : end + 1], start))
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_work_stealing():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(serve_slowly({0}, delay=0.01)))
+    downloader = RangedDownloader(client, tasks=2, chunk_size=1, min_steal_size=2_000, slow_task_ratio=None)
+    sink = MemorySink()
+    await sink.open(len(content))
+    range_tasks = await downloader.download(str(media_file.url), sink, len(content))
+    assert bytes(sink.content) == content
+    # The fast connection took over most of the slow range
+    assert len(range_tasks) > 2
+    assert range_tasks[0].end < len(content) // 4
+    assert all(range_task.remaining == 0 for range_task in range_tasks)
+
+
+@pytest.mark.asyncio
+async def test_slow_task_restarted():
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(serve_slowly({50_002}, delay=0.001, stall_once=True))
+    )
+    downloader = RangedDownloader(
+        client,
+        tasks=2,
+        chunk_size=1,
+        work_stealing=False,
+        min_steal_size=1_000,
+        slow_task_grace=0.05,
+        monitor_interval=0.02,
+    )
+    sink = MemorySink()
+    await sink.open(len(content))
+    range_tasks = await asyncio.wait_for(downloader.download(str(media_file.url), sink, len(content)), 5)
+    assert bytes(sink.content) == content
+    assert range_tasks[1].restarts >= 1
+
+
+def test_tasks_tuner(tmp_path):
+    store = TunedTasksStore(tmp_path / "tuned.json")
+    tuner = TasksTuner("cdn.example.com", store=store, initial_tasks=2, max_tasks=10, step=2)
+    assert tuner.observe(100) == 4
+    assert tuner.observe(190) == 6
+    # Gain below 10% goes back to the best number
+    assert tuner.observe(200) == 4 and tuner.settled
+    assert tuner.observe(1_000) == 4
+    tuner.save()
+    assert store.get("cdn.example.com") == 4
+
+    # Tuning starts from the remembered value and errors fall back to the best one
+    tuner = TasksTuner("cdn.example.com", store=store, max_tasks=10, step=2)
+    assert tuner.tasks == 4
+    assert tuner.observe(200) == 6
+    assert tuner.observe(400, errors=1) == 4 and tuner.settled
+    assert TasksTuner("other.example.com", store=store).tasks == 2
+
+
+@pytest.mark.asyncio
+async def test_download_with_tuner(tmp_path):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(serve_slowly(slow_starts=None, delay=0.005)))
+    downloader = RangedDownloader(client, chunk_size=1, min_steal_size=1_000, monitor_interval=0.01)
+    tuner = TasksTuner(
+        "cdn.example.com", store=TunedTasksStore(tmp_path / "tuned.json"), max_tasks=6, interval=0.03
+    )
+    sink = MemorySink()
+    await sink.open(len(content))
+    range_tasks = await downloader.download(str(media_file.url), sink, len(content), tuner=tuner)
+    assert bytes(sink.content) == content
+    # Connections were added as throughput grew with them
+    assert tuner.best_tasks > 2 and len(range_tasks) > 2
+    assert tuner.store.get("cdn.example.com") == tuner.best_tasks
+
+
+@pytest.mark.asyncio
+async def test_refreshable_url():
+    expired = f"https://bcdn.hakunaymatata.com/resource/movie.mp4?auth_key={int(time.time()) - 1}-0-0-x"
+    fresh = f"https://bcdn.hakunaymatata.com/resource/movie.mp4?auth_key={int(time.time()) + 3_600}-0-0-y"
+    refreshes = []
+
+    async def refresher():
+        refreshes.append(1)
+        return fresh
+
+    url = RefreshableUrl(expired, refresher)
+    assert url.is_expiring
+    assert await url.get() == fresh and not url.is_expiring
+    # Concurrent requests that failed with the same stale url refresh it once
+    assert await asyncio.gather(url.refresh(expired), url.refresh(expired)) == [fresh, fresh]
+    assert len(refreshes) == 1 and url.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_download_continues_with_refreshed_url():
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        start, end = (int(value) for value in request.headers["range"].removeprefix("bytes=").split("-"))
+        requested.append((request.url.params["sign"], start))
+        if request.url.params["sign"] == "old":
+            if start > 0:
+                return httpx.Response(403)
+            # Url expires halfway through the first range
+            return httpx.Response(206, content=content[start:20_000])
+        return httpx.Response(206, content=content[start : end + 1])
+
+    async def refresher():
+        return "https://bcdn.hakunaymatata.com/resource/movie.mp4?sign=new"
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    downloader = RangedDownloader(client, tasks=2, work_stealing=False, timeout_retry_attempts=1)
+    url = RefreshableUrl("https://bcdn.hakunaymatata.com/resource/movie.mp4?sign=old", refresher)
+    sink = MemorySink()
+    await sink.open(len(content))
+    await downloader.download(url, sink, len(content))
+    assert bytes(sink.content) == content
+    assert url.refreshes == 1
+    # Remaining bytes were requested with the fresh url without starting over
+    assert sorted(start for sign, start in requested if sign == "new") == [20_000, 50_002]
+
+
+@pytest.mark.asyncio
+async def test_block_hasher(tmp_path):
+    path = tmp_path / "movie.mp4"
+    path.write_bytes(content)
+    block_hasher = BlockHasher(len(content), "md5", block_size=10_000)
+    # Ranges out of order, written in uneven chunks and split mid-block
+    for start, end in [(60_000, 100_003), (25_000, 60_000), (0, 25_000)]:
+        for offset in range(start, end, 3_001):
+            block_hasher.update(offset, content[offset : min(offset + 3_001, end)])
+
+    # Only the blocks shared by two ranges were not hashed on the fly
+    assert sorted(set(range(block_hasher.blocks_count)) - set(block_hasher.blocks)) == [2]
+
+    read_offsets = []
+
+    async def read_block(offset, size):
+        read_offsets.append(offset)
+        return content[offset : offset + size]
+
+    checksums = await block_hasher.checksums(FileChecksums.path_for(path), read_block)
+    assert read_offsets == [20_000]
+    assert checksums == compute_checksums(path, "md5", block_size=10_000)
+    assert len(checksums.blocks) == 11
+
+
+@pytest.mark.asyncio
+async def test_download_with_checksums(tmp_path):
+    downloader = make_downloader(tmp_path, serve_ranges([], fail_at=60_000))
+    downloaded = await downloader.run(
+        media_file, filename="movie.mp4", checksum="sha1", disable_progress_bar=True
+    )
+    assert downloaded.saved_to.read_bytes() == content
+
+    checksums = verify_checksums(downloaded.saved_to)
+    assert checksums.algorithm == "sha1" and checksums.size == len(content)
+    assert checksums.digest == compute_checksums(downloaded.saved_to, "sha1").digest
+
+    with open(downloaded.saved_to, "r+b") as fh:
+        fh.seek(50_000)
+        fh.write(b"x")
+    with pytest.raises(DownloadIntegrityError):
+        verify_checksums(downloaded.saved_to)
+
+    # Size differing from that of the media file is caught before downloading
+    with pytest.raises(DownloadIntegrityError):
+        await downloader.run(
+            media_file.model_copy(update={"size": len(content) + 1}),
+            filename="other.mp4",
+            checksum="sha1",
+            disable_progress_bar=True,
+        )
+    assert not (tmp_path / "other.mp4").exists()
+
+
+def serve_mirrors(delays: dict[str, float], sizes: dict[str, int] | None = None):
+    """Async handler serving ranges of `content` from several hosts, each at its own pace"""
+
+    async def stream(body: bytes, delay: float):
+        for position in range(0, len(body), 1_000):
+            await asyncio.sleep(delay)
+            yield body[position : position + 1_000]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host not in delays:
+            return httpx.Response(404)
+
+        size = (sizes or {}).get(host, len(content))
+        range_header = request.headers.get("range")
+        if range_header is None:
+            return httpx.Response(200, headers={"content-length": str(size)}, content=content)
+
+        start, end = (int(value) for value in range_header.removeprefix("bytes=").split("-"))
+        return httpx.Response(206, content=stream(content[start : end + 1], delays[host]))
+
+    return handler
+
+
+mirror_urls = [
+    "https://bcdn.hakunaymatata.com/resource/movie.mp4",
+    "https://valiw.hakunaymatata.com/resource/movie.mp4",
+    "https://gone.hakunaymatata.com/resource/movie.mp4",
+]
+
+
+@pytest.mark.asyncio
+async def test_download_from_several_sources():
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            serve_mirrors({"bcdn.hakunaymatata.com": 0.001, "valiw.hakunaymatata.com": 0.004})
+        )
+    )
+    downloader = RangedDownloader(client, tasks=4, chunk_size=1, min_steal_size=1_000, monitor_interval=0.01)
+    sources = DownloadSources(mirror_urls)
+    await downloader.probe_sources(sources)
+    # Source whose probe failed is dropped
+    assert [source.host for source in sources.available] == [
+        "bcdn.hakunaymatata.com",
+        "valiw.hakunaymatata.com",
+    ]
+
+    sink = MemorySink()
+    await sink.open(len(content))
+    await downloader.download(sources, sink, len(content))
+    assert bytes(sink.content) == content
+
+    downloaded = sources.summary()
+    assert sum(downloaded.values()) == len(content)
+    # Ranges went to both sources, most of them to the faster one
+    assert downloaded["bcdn.hakunaymatata.com"] > downloaded["valiw.hakunaymatata.com"] > 0
+
+
+@pytest.mark.asyncio
+async def test_sources_size_mismatch(tmp_path):
+    handler = serve_mirrors(
+        {"bcdn.hakunaymatata.com": 0, "valiw.hakunaymatata.com": 0},
+        sizes={"valiw.hakunaymatata.com": len(content) - 1},
+    )
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(DownloadIntegrityError):
+        await RangedDownloader(client).probe_sources(DownloadSources(mirror_urls[:2]))
+
+    downloader = make_downloader(tmp_path, handler)
+    with pytest.raises(DownloadIntegrityError):
+        await downloader.run(
+            media_file,
+            filename="movie.mp4",
+            mirror_files=[media_file.model_copy(update={"url": mirror_urls[1]})],
+            disable_progress_bar=True,
+        )
+
+
+@pytest.mark.skipif(not hasattr(os, "pwrite"), reason="Writes are seeked without os.pwrite")
+@pytest.mark.asyncio
+async def test_positional_file_sink_off_event_loop(tmp_path, monkeypatch):
+    threads = []
+    pwrite = os.pwrite
+
+    def record_pwrite(fd, data, offset):
+        threads.append(threading.current_thread())
+        return pwrite(fd, data, offset)
+
+    monkeypatch.setattr(os, "pwrite", record_pwrite)
+    sink = PositionalFileSink(tmp_path / "movie.mp4")
+    await sink.open(10)
+    await asyncio.gather(sink.write(5, b"b" * 5), sink.write(0, b"a" * 5))
+    await sink.close()
+
+    assert (tmp_path / "movie.mp4").read_bytes() == b"a" * 5 + b"b" * 5
+    assert threading.main_thread() not in threads
+
+
+@pytest.mark.skipif(not hasattr(os, "pwrite"), reason="Writes are seeked without os.pwrite")
+@pytest.mark.asyncio
+async def test_positional_file_sink_closes_after_writes(tmp_path, monkeypatch):
+    events = []
+    pwrite, close = os.pwrite, os.close
+    writing = threading.Event()
+
+    def slow_pwrite(fd, data, offset):
+        writing.set()
+        time.sleep(0.1)
+        events.append("write")
+        return pwrite(fd, data, offset)
+
+    def record_close(fd):
+        events.append("close")
+        return close(fd)
+
+    monkeypatch.setattr(os, "pwrite", slow_pwrite)
+    sink = PositionalFileSink(tmp_path / "movie.mp4")
+    await sink.open(10)
+    monkeypatch.setattr(os, "close", record_close)
+
+    write = asyncio.ensure_future(sink.write(0, b"a" * 10))
+    await asyncio.to_thread(writing.wait, 1)
+    # As when the download fails and its workers are cancelled
+    write.cancel()
+    await sink.abort()
+
+    assert events == ["write", "close"]
+    assert (tmp_path / "movie.mp4").read_bytes() == b"a" * 10
+
+
+@pytest.mark.asyncio
+async def test_ordered_stream_sink():
+    received = []
+    sink = OrderedStreamSink(received.append, buffer_size=10)
+    await sink.open(30)
+    await sink.write(10, b"b" * 5)
+    await sink.write(20, b"d" * 5)
+
+    # Buffer is full until the earliest bytes arrive
+    blocked = asyncio.ensure_future(sink.write(15, b"c" * 5))
+    await asyncio.sleep(0.01)
+    assert not blocked.done() and received == []
+
+    # Overlaps bytes that were taken over by another range
+    await sink.write(0, b"a" * 12)
+    await asyncio.wait_for(blocked, 1)
+    await sink.write(25, b"e" * 5)
+    await sink.close()
+    assert b"".join(received) == b"a" * 12 + b"b" * 3 + b"c" * 5 + b"d" * 5 + b"e" * 5
+
+    def consume(data):
+        raise BrokenPipeError()
+
+    sink = OrderedStreamSink(consume, buffer_size=10)
+    await sink.open(30)
+    await sink.write(0, b"a" * 10)
+    with pytest.raises(BrokenPipeError):
+        await sink.write(10, b"b" * 10)
+        await sink.write(20, b"c" * 10)
+
+    await sink.abort()
+
+
+@pytest.mark.asyncio
+async def test_stream_download(tmp_path):
+    requested_ranges = []
+    downloader = make_downloader(tmp_path, serve_ranges(requested_ranges))
+    chunks = [
+        chunk
+        async for chunk in downloader.stream(
+            media_file, filename="movie.mp4", buffer_size=20_000, disable_progress_bar=True
+        )
+    ]
+    assert b"".join(chunks) == content
+    assert os.listdir(tmp_path) == []
+
+    # Connections kept within windows of the buffer size
+    for range_header in filter(None, requested_ranges):
+        start, end = (int(value) for value in range_header.removeprefix("bytes=").split("-"))
+        assert start // 20_000 == end // 20_000
@@ -0,0 +1,128 @@
+import os
+
+import httpx
+import pytest
+
+from moviebox_api.download import CaptionFileDownloader, MediaFileDownloader
+from moviebox_api.models import CaptionFileMetadata, MediaFileMetadata
+from moviebox_api.ranged import ByteRange
+from moviebox_api.s3 import S3MultipartSink, S3UploadState, part_size_for
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+PART_SIZE = 5 * 1_024 * 1_024
+
+content = os.urandom(2 * PART_SIZE + 1_003)
+
+media_file = MediaFileMetadata(
+    id="1",
+    url="https://bcdn.hakunaymatata.com/resource/movie.mp4?sign=x",
+    resolution=720,
+    size=len(content),
+)
+
+
+def serve_ranges(requested_ranges: list[ByteRange]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"content-length": str(len(content)), "accept-ranges": "bytes"}
+        range_header = request.headers.get("range")
+        if range_header is None:
+            return httpx.Response(200, headers=headers, content=content)
+
+        start, end = (int(value) for value in range_header.removeprefix("bytes=").split("-"))
+        requested_ranges.append(ByteRange(start, end + 1))
+        headers["content-length"] = str(end + 1 - start)
+        return httpx.Response(206, headers=headers, content=content[start : end + 1])
+
+    return handler
+
+
+@pytest.fixture
+def client():
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="library")
+        yield client
+
+
+def make_sink(client, tmp_path) -> S3MultipartSink:
+    return S3MultipartSink(
+        "library",
+        "movies/movie.mp4",
+        client=client,
+        part_size=PART_SIZE,
+        max_buffered_parts=1,
+        state_dir=tmp_path / "uploads",
+    )
+
+
+def test_part_size_for():
+    assert part_size_for(1_024, part_size=1_024) == PART_SIZE
+    assert part_size_for(100_000 * PART_SIZE) == 10 * PART_SIZE
+
+
+@pytest.mark.asyncio
+async def test_upload_while_downloading(client, tmp_path):
+    requested_ranges = []
+    downloader = MediaFileDownloader(
+        dir=tmp_path, tasks=3, chunk_size=256, transport=httpx.MockTransport(serve_ranges(requested_ranges))
+    )
+    downloaded_file = await downloader.run(
+        media_file, filename="movie.mp4", sink=make_sink(client, tmp_path), disable_progress_bar=True
+    )
+
+    assert downloaded_file.size == len(content)
+    assert client.get_object(Bucket="library", Key="movies/movie.mp4")["Body"].read() == content
+    # Nothing landed on local disk and the upload state is gone
+    assert os.listdir(tmp_path) == ["uploads"] and os.listdir(tmp_path / "uploads") == []
+    # Connections stayed within the part being buffered
+    assert all(
+        byte_range.start // PART_SIZE == (byte_range.end - 1) // PART_SIZE for byte_range in requested_ranges
+    )
+
+
+@pytest.mark.asyncio
+async def test_resume_upload(client, tmp_path):
+    sink = make_sink(client, tmp_path)
+    await sink.open(len(content))
+    await sink.write(0, content[:PART_SIZE])
+    await sink.write(PART_SIZE, content[PART_SIZE : PART_SIZE + 100])
+    await sink.abort()
+
+    state = S3UploadState.load(S3UploadState.path_for("library", "movies/movie.mp4", tmp_path / "uploads"))
+    assert list(state.parts) == [1]
+
+    requested_ranges = []
+    downloader = MediaFileDownloader(
+        dir=tmp_path, tasks=2, chunk_size=256, transport=httpx.MockTransport(serve_ranges(requested_ranges))
+    )
+    await downloader.run(
+        media_file, filename="movie.mp4", sink=make_sink(client, tmp_path), disable_progress_bar=True
+    )
+
+    assert client.get_object(Bucket="library", Key="movies/movie.mp4")["Body"].read() == content
+    # Only the parts missing from the upload were downloaded
+    assert min(byte_range.start for byte_range in requested_ranges) == PART_SIZE
+
+
+@pytest.mark.asyncio
+async def test_upload_caption(client, tmp_path):
+    caption = b"1\n00:00:01,000 --> 00:00:02,000\nHello\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-length": str(len(caption))}, content=caption)
+
+    caption_file = CaptionFileMetadata(
+        id="en",
+        lan="en",
+        lanName="English",
+        url="https://cacdn.hakunaymatata.com/subtitle/en.srt?sign=x",
+        size=len(caption),
+        delay=0,
+    )
+    sink = S3MultipartSink("library", "movies/movie.en.srt", client=client, state_dir=tmp_path)
+    downloader = CaptionFileDownloader(dir=tmp_path, tasks=1, transport=httpx.MockTransport(handler))
+    await downloader.run(caption_file, filename="movie.en.srt", sink=sink, disable_progress_bar=True)
+
+    assert client.get_object(Bucket="library", Key="movies/movie.en.srt")["Body"].read() == caption
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import pytest
+
+from moviebox_api.models import DownloadableFilesMetadata
+from moviebox_api.scheduler import EpisodesDownloadScheduler, EpisodesMetadataPrefetcher
+
+
+class EpisodeWorker:
+    def __init__(self, delays: dict[tuple[int, int], float] = {}):
+        self.delays = delays
+        self.started: list[tuple[int, int]] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, season: int, episode: int):
+        self.started.append((season, episode))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delays.get((season, episode), 0.01))
+        self.running -= 1
+        return f"S{season}E{episode}"
+
+
+@pytest.mark.parametrize(
+    argnames=["max_connections", "tasks", "concurrent_episodes"],
+    argvalues=[
+        [None, 5, 1],
+        [10, 5, 2],
+        [12, 4, 3],
+    ],
+)
+@pytest.mark.asyncio
+async def test_connections_budget(max_connections, tasks, concurrent_episodes):
+    scheduler = EpisodesDownloadScheduler(max_connections=max_connections, tasks=tasks)
+    assert scheduler.concurrent_episodes == concurrent_episodes
+
+    worker = EpisodeWorker()
+    results = await scheduler.run(worker, [(season, episode) for season in (1, 2) for episode in range(1, 5)])
+    assert worker.max_running == concurrent_episodes
+    assert results == {
+        season: {episode: f"S{season}E{episode}" for episode in range(1, 5)} for season in (1, 2)
+    }
+
+
+@pytest.mark.asyncio
+async def test_priority_order_and_results_shape():
+    scheduler = EpisodesDownloadScheduler(max_connections=2, tasks=1)
+    # First episode finishes last
+    worker = EpisodeWorker({(1, 1): 0.05})
+    results = await scheduler.run(worker, [(2, 1), (1, 2), (1, 1)])
+    assert worker.started == [(1, 1), (1, 2), (2, 1)]
+    assert list(results) == [1, 2]
+    assert list(results[1]) == [1, 2]
+
+    latest_first = EpisodesDownloadScheduler(tasks=1, priority=lambda season, episode: (-season, -episode))
+    worker = EpisodeWorker()
+    await latest_first.run(worker, [(1, 1), (2, 1), (1, 2)])
+    assert worker.started == [(2, 1), (1, 2), (1, 1)]
+
+
+@pytest.mark.asyncio
+async def test_skipped_episodes_and_errors():
+    async def worker(season, episode):
+        if episode == 2:
+            raise RuntimeError("Failed")
+        return None
+
+    scheduler = EpisodesDownloadScheduler(max_connections=2, tasks=1)
+    assert await scheduler.run(worker, [(1, 1), (1, 3)]) == {1: {}}
+
+    with pytest.raises(RuntimeError):
+        await scheduler.run(worker, [(1, 1), (1, 2), (1, 3)])
+
+
+def test_budget_smaller_than_tasks():
+    with pytest.raises(AssertionError):
+        EpisodesDownloadScheduler(max_connections=2, tasks=5)
+
+
+class DownloadableFiles:
+    def __init__(self, expires_in: float = 3_600):
+        self.expires_in = expires_in
+        self.requests: list[tuple[int, int]] = []
+
+    async def get_content_model(self, season: int, episode: int) -> DownloadableFilesMetadata:
+        self.requests.append((season, episode))
+        await asyncio.sleep(0.01)
+        expiry = int(time.time() + self.expires_in)
+        return DownloadableFilesMetadata(
+            downloads=[
+                {
+                    "id": f"{season}{episode}",
+                    "url": f"https://bcdn.hakunaymatata.com/resource/{season}{episode}.mp4?auth_key={expiry}-0-0-x",
+                    "resolution": 720,
+                    "size": 1_000,
+                }
+            ],
+            captions=[],
+            limited=False,
+            limitedCode="",
+            hasResource=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_prefetch_upcoming_episodes():
+    downloadable_files = DownloadableFiles()
+    episodes = [(1, episode) for episode in range(1, 6)]
+    prepared = []
+
+    async def preparer(season, episode, metadata):
+        prepared.append((season, episode))
+        return metadata.best_media_file.id
+
+    async with EpisodesMetadataPrefetcher(
+        downloadable_files, episodes, lookahead=2, preparer=preparer
+    ) as prefetcher:
+        prefetched = await prefetcher.get(1, 1)
+        assert prefetched.prepared == "11"
+        await asyncio.sleep(0.02)
+        assert downloadable_files.requests == [(1, 1), (1, 2), (1, 3)]
+        assert prepared == [(1, 1), (1, 2), (1, 3)]
+
+        assert (await prefetcher.get(1, 2)).metadata.best_media_file.id == "12"
+        await asyncio.sleep(0.02)
+        assert downloadable_files.requests[-1] == (1, 4)
+
+    # Nothing fetched twice
+    assert len(set(downloadable_files.requests)) == len(downloadable_files.requests)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_refreshes_expiring_metadata():
+    downloadable_files = DownloadableFiles(expires_in=60)
+    prefetcher = EpisodesMetadataPrefetcher(
+        downloadable_files, [(1, 1), (1, 2)], lookahead=0, expiry_margin=300
+    )
+    await prefetcher.get(1, 1)
+    assert downloadable_files.requests.count((1, 1)) == 2
+
+    downloadable_files.expires_in = 3_600
+    await prefetcher.get(1, 2)
+    assert downloadable_files.requests.count((1, 2)) == 1
+    prefetcher.close()
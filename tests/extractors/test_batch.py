@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import BaseModel
+
+from moviebox_api.extractor import BatchDetailsExtractor, DetailsExtractionError
+from tests.extractors import content_paths, read_content
+
+contents = [read_content(content_path) for (content_path,) in content_paths]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", [False, True])
+async def test_map_preserves_order(model):
+    async with BatchDetailsExtractor(max_workers=2, max_pending=1, model=model) as batch:
+        details_items = await batch.gather(contents * 2)
+
+    assert len(details_items) == len(contents) * 2
+    for details in details_items:
+        assert isinstance(details, BaseModel if model else dict)
+
+    titles = [
+        details.resData.metadata.title if model else details["resData"]["metadata"]["title"]
+        for details in details_items
+    ]
+    assert titles[: len(contents)] == titles[len(contents) :]
+
+
+@pytest.mark.asyncio
+async def test_as_completed():
+    async def stream_contents():
+        for content in contents:
+            yield content
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        batch = BatchDetailsExtractor(executor=executor)
+        indexes = [index async for index, details in batch.as_completed(stream_contents())]
+
+    assert sorted(indexes) == list(range(len(contents)))
+
+
+@pytest.mark.asyncio
+async def test_return_exceptions():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        batch = BatchDetailsExtractor(executor=executor)
+        details_items = await batch.gather(["<html></html>", contents[0]], return_exceptions=True)
+
+        assert isinstance(details_items[0], DetailsExtractionError)
+        assert isinstance(details_items[1], dict)
+
+        with pytest.raises(DetailsExtractionError):
+            await batch.gather(["<html></html>"])
@@ -1,6 +1,7 @@
 import pytest
 
 from moviebox_api.extractor._core import JsonDetailsExtractor
+from moviebox_api.helpers import process_api_response
 from tests.extractors import (
     content_names,
     content_paths,
@@ -21,3 +22,18 @@ def test_extract_whole_data(content_path):
     assert type(extractor.seasons) is list
     assert type(extractor.stars) is list
     assert type(extractor.page_details) is dict
+
+
+@pytest.mark.parametrize(content_names, content_paths)
+def test_extract_from_bytes(content_path):
+    content = read_content(content_path)
+    content_bytes = content.encode("utf-8")
+    details = JsonDetailsExtractor.extract(content)
+    assert JsonDetailsExtractor.extract(content_bytes) == details
+    assert JsonDetailsExtractor.extract(memoryview(content_bytes)) == details
+
+
+def test_process_api_response_from_bytes():
+    body = b'{"code": 0, "message": "ok", "data": {"items": []}}'
+    assert process_api_response(body) == {"items": []}
+    assert process_api_response(memoryview(body)) == {"items": []}
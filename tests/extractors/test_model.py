@@ -5,6 +5,13 @@ from moviebox_api.extractor._core import (
     JsonDetailsExtractorModel,
     TagDetailsExtractorModel,
 )
+from moviebox_api.extractor.models.json import ItemJsonDetailsModel
+from moviebox_api.models import (
+    HotMoviesAndTVSeriesModel,
+    SearchResultsPagerModel,
+    build_model,
+    get_trusted_model,
+)
 from tests.extractors import (
     content_names,
     content_paths,
@@ -39,3 +46,27 @@ def test_tag_details_extractor_model(content_path):
 
     assert isinstance(extractor.extract_reviews()[0], BaseModel)
     assert isinstance(extractor.extract_others(), BaseModel)
+
+
+@pytest.mark.parametrize(content_names, content_paths)
+def test_trusted_json_details_extractor_model(content_path):
+    content = read_content(content_path)
+    strict = JsonDetailsExtractorModel(content)
+    trusted = JsonDetailsExtractorModel(content, trusted=True)
+    assert isinstance(trusted.details, ItemJsonDetailsModel)
+    assert type(trusted.details) is get_trusted_model(ItemJsonDetailsModel)
+    assert isinstance(trusted.subject.cover.url, str)
+    assert trusted.subject.genre == strict.subject.genre
+    assert trusted.subject.releaseDate == strict.subject.releaseDate
+    assert trusted.details.model_dump(mode="json") == strict.details.model_dump(mode="json")
+
+
+def test_trusted_model_keeps_aliases():
+    contents = {"movie": [], "tv": []}
+    model = build_model(HotMoviesAndTVSeriesModel, contents, trusted=True)
+    assert isinstance(model, HotMoviesAndTVSeriesModel)
+    assert model.movies == model.tv_series == []
+
+
+def test_trusted_model_without_urls_is_model_itself():
+    assert get_trusted_model(SearchResultsPagerModel) is SearchResultsPagerModel